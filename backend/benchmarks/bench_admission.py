@@ -0,0 +1,95 @@
+"""
+Admission control benchmark: read latency under a write flood.
+
+One client floods POST /asset with large batches from several concurrent
+connections while another client issues GET /insights in a loop. Reports the
+reader's p50/p99/max latency and the writer's accepted/rejected requests with
+rate limiting disabled and enabled.
+
+Usage: python -m backend.benchmarks.bench_admission [seconds] [batch_size]
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import time
+
+import httpx
+
+from backend.config import RATE_LIMIT_ASSETS_PER_SECOND, RATE_LIMIT_REQUESTS_PER_SECOND
+from backend.loadtest.driver import EndpointStats
+from backend.loadtest.generator import generate_assets
+from backend.main import app
+from backend.src.admission import set_rate_limits
+from backend.src.storage import clear_assets
+
+WRITERS = 4
+
+
+def client_for(address: str) -> httpx.AsyncClient:
+    """In-process client that appears to come from the given address"""
+    transport = httpx.ASGITransport(app=app, client=(address, 1234))
+    return httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+
+async def run(seconds: float, body: bytes) -> tuple[EndpointStats, int, int]:
+    """Reader latencies and the writer's (accepted, rejected) request counts"""
+    clear_assets()
+    reads = EndpointStats()
+    accepted = rejected = 0
+    deadline = time.perf_counter() + seconds
+
+    async def write(writer: httpx.AsyncClient) -> None:
+        nonlocal accepted, rejected
+        while time.perf_counter() < deadline:
+            response = await writer.post(
+                "/asset", content=body, headers={"Content-Type": "application/json"}
+            )
+            if response.status_code == 200:
+                accepted += 1
+            else:
+                rejected += 1
+                await asyncio.sleep(0.01)
+
+    async def read(reader: httpx.AsyncClient) -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await reader.get("/insights")
+            reads.latencies.append(time.perf_counter() - start)
+            reads.errors += response.status_code >= 400
+            await asyncio.sleep(0.005)
+
+    async with client_for("10.0.0.1") as writer, client_for("10.0.0.2") as reader:
+        await asyncio.gather(read(reader), *(write(writer) for _ in range(WRITERS)))
+    return reads, accepted, rejected
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    logging.disable(logging.WARNING)
+    # Encoded once: the writers share the loop with the server and the reader
+    body = json.dumps(list(generate_assets(batch_size, seed=0))).encode()
+    print(f"seconds={seconds:g} batch_size={batch_size} writers={WRITERS}")
+    print(
+        f"{'limits':>7} {'read_p50_ms':>12} {'read_p99_ms':>12} "
+        f"{'read_max_ms':>12} {'writes_ok':>10} {'writes_429':>11}"
+    )
+    for enabled in (False, True):
+        if enabled:
+            set_rate_limits(
+                RATE_LIMIT_REQUESTS_PER_SECOND, RATE_LIMIT_ASSETS_PER_SECOND
+            )
+        else:
+            set_rate_limits(0, 0)
+        reads, accepted, rejected = asyncio.run(run(seconds, body))
+        print(
+            f"{'on' if enabled else 'off':>7} {reads.percentile(50):>12.1f} "
+            f"{reads.percentile(99):>12.1f} {reads.percentile(100):>12.1f} "
+            f"{accepted:>10} {rejected:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
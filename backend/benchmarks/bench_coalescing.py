@@ -0,0 +1,74 @@
+"""
+Request coalescing benchmark.
+
+Fires bursts of identical concurrent GET /asset requests through the ASGI app,
+invalidating the cache before every burst (one write per burst), and reports
+process CPU time per request and the share of requests that were coalesced
+onto another request's computation. CPU per request should fall as
+concurrency rises.
+
+Usage: python -m backend.benchmarks.bench_coalescing [asset_count] [bursts]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+
+import httpx
+
+from backend.benchmarks.bench_sharding import fill_store
+from backend.main import app
+from backend.src.admission import set_rate_limits
+from backend.src.metrics import get_counter, reset_metrics
+from backend.src.models import AssetData
+from backend.src.storage import store_asset
+
+
+async def run(concurrency: int, bursts: int) -> float:
+    """CPU milliseconds per request over all bursts"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        start = time.process_time()
+        for burst in range(bursts):
+            store_asset(
+                "bench-write",
+                AssetData(
+                    id="bench-write",
+                    nominal_value=burst + 1,
+                    due_date="2030-01-01",
+                    interest_rate=0.01,
+                ),
+            )
+            headers = {"Accept-Encoding": "gzip"}
+            responses = await asyncio.gather(
+                *(client.get("/asset", headers=headers) for _ in range(concurrency))
+            )
+            for response in responses:
+                response.raise_for_status()
+        return (time.process_time() - start) / (bursts * concurrency) * 1000
+
+
+def main() -> None:
+    set_rate_limits(0, 0)  # measure the handlers, not the rate limiter
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    bursts = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    logging.disable(logging.INFO)
+    fill_store(count)
+    print(f"assets={count} bursts={bursts}")
+    print(f"{'concurrency':>12} {'cpu_ms_per_request':>19} {'shared':>7}")
+    for concurrency in (1, 4, 16, 64):
+        reset_metrics()
+        cpu_ms = asyncio.run(run(concurrency, bursts))
+        shared = get_counter("response_cache.coalesced") + get_counter(
+            "response_cache.hits"
+        )
+        print(
+            f"{concurrency:>12} {cpu_ms:>19.2f} {shared / (bursts * concurrency):>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+No-op upsert benchmark.
+
+Fills the store, then re-posts the whole book with a given share of rows
+changed. Reports the time to store the batch, the inserted/updated/unchanged
+counts, and the status and time of a conditional GET /asset issued afterwards
+with the ETag from before the re-post. An unchanged re-post leaves the storage
+version alone, so the cached listing stays valid (304) and no change listener
+(live insights) fires; any changed row forces a rebuild of the listing.
+
+Usage: python -m backend.benchmarks.bench_dedup [asset_count]
+"""
+
+import logging
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.benchmarks.bench_sharding import fill_store
+from backend.main import app
+from backend.src.models import AssetInput
+from backend.src.service import store_assets
+from backend.src.storage import get_shard_columns
+
+
+def repost(changed_share: float) -> list[AssetInput]:
+    """The stored book as input rows, with a share of nominal values changed"""
+    batch = [
+        AssetInput(
+            id=asset_id,
+            nominal_value=nominal_value,
+            due_date=due_date,
+            interest_rate=interest_rate,
+        )
+        for columns in get_shard_columns()
+        for asset_id, nominal_value, due_date, interest_rate in zip(
+            columns.ids,
+            columns.nominal_values,
+            columns.due_dates,
+            columns.interest_rates,
+        )
+    ]
+    step = round(1 / changed_share) if changed_share else 0
+    for asset in batch[::step] if step else ():
+        asset.nominal_value += 1
+    return batch
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    logging.disable(logging.INFO)
+    client = TestClient(app)
+    print(f"assets={count}")
+    print(
+        f"{'changed':>8} {'store_ms':>9} {'inserted':>9} {'updated':>8} "
+        f"{'unchanged':>10} {'get_status':>11} {'get_ms':>7}"
+    )
+    for changed_share in (0.0, 0.01, 1.0):
+        fill_store(count)
+        batch = repost(changed_share)
+        etag = client.get("/asset").headers["etag"]
+        start = time.perf_counter()
+        counts = store_assets(batch)
+        store_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        status = client.get("/asset", headers={"If-None-Match": etag}).status_code
+        get_ms = (time.perf_counter() - start) * 1000
+        print(
+            f"{changed_share:>8.0%} {store_ms:>9.1f} {counts['inserted']:>9} "
+            f"{counts['updated']:>8} {counts['unchanged']:>10} {status:>11} "
+            f"{get_ms:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Ingestion throughput benchmark: synchronous vs async write-behind POST /asset.
+
+Posts generated batches through the ASGI app and reports client-observed
+request latency and end-to-end throughput (until all assets are stored).
+
+Usage: python -m backend.benchmarks.bench_ingest [batches] [batch_size]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+from backend.loadtest.generator import generate_batches
+from backend.main import app
+from backend.src.admission import set_rate_limits
+from backend.src.ingest import start_consumer, stop_consumer
+from backend.src.storage import clear_assets
+
+
+async def run(mode: str, batches: list[list[dict]]) -> tuple[float, float]:
+    """Post all batches; returns (median request ms, assets per second)"""
+    clear_assets()
+    start_consumer(maxsize=len(batches))
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        start = time.perf_counter()
+        for batch in batches:
+            request_start = time.perf_counter()
+            response = await client.post(f"/asset?mode={mode}", json=batch)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - request_start)
+        await stop_consumer()  # drains the queue
+        elapsed = time.perf_counter() - start
+    total = sum(len(batch) for batch in batches)
+    return statistics.median(latencies) * 1000, total / elapsed
+
+
+def main() -> None:
+    set_rate_limits(0, 0)  # measure the handlers, not the rate limiter
+    batch_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    batches = list(generate_batches(batch_count * batch_size, batch_size))
+    print(f"batches={batch_count} batch_size={batch_size}")
+    print(f"{'mode':>6} {'request_p50_ms':>15} {'assets_per_s':>13}")
+    for mode in ("sync", "async"):
+        latency_ms, throughput = asyncio.run(run(mode, batches))
+        print(f"{mode:>6} {latency_ms:>15.1f} {throughput:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
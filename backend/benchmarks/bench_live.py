@@ -0,0 +1,95 @@
+"""
+Live insight fan-out benchmark.
+
+Connects many idle in-process subscribers to the insights broadcaster and
+measures the memory held per subscriber and the time from a write to the
+update being handed to every subscriber. Subscribers stand in for WebSocket
+connections (send_text only counts messages), so network costs are not
+included.
+
+Usage: python -m backend.benchmarks.bench_live [subscribers] [updates]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+import tracemalloc
+
+from backend.benchmarks.bench_sharding import fill_store
+from backend.src.live import InsightsBroadcaster
+from backend.src.models import AssetData
+from backend.src.storage import store_asset
+
+
+class IdleSubscriber:
+    """WebSocket stand-in that never sends and records received messages"""
+
+    def __init__(self, received: list):
+        self.received = received
+        self._closed = asyncio.Event()
+
+    async def receive(self) -> dict:
+        await self._closed.wait()
+        return {"type": "websocket.disconnect"}
+
+    async def send_text(self, message: str) -> None:
+        self.received.append(message)
+
+    def close(self) -> None:
+        self._closed.set()
+
+
+async def run(subscribers: int, updates: int) -> None:
+    broadcaster = InsightsBroadcaster(max_pushes_per_second=0)
+    received: list[str] = []
+    clients = [IdleSubscriber(received) for _ in range(subscribers)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [asyncio.create_task(broadcaster.serve(client)) for client in clients]
+    while len(received) < subscribers:
+        await asyncio.sleep(0.01)
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / subscribers
+    tracemalloc.stop()
+
+    latencies = []
+    for i in range(updates):
+        received.clear()
+        start = time.perf_counter()
+        store_asset(
+            f"live-{i}",
+            AssetData(
+                id=f"live-{i}",
+                nominal_value=100,
+                due_date="2030-01-01",
+                interest_rate=0.05,
+            ),
+        )
+        while len(received) < subscribers:
+            await asyncio.sleep(0)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert len({id(message) for message in received}) == 1
+
+    for client in clients:
+        client.close()
+    await asyncio.gather(*tasks)
+    latencies.sort()
+    print(f"subscribers={subscribers} updates={updates}")
+    print(f"memory per idle subscriber: {per_subscriber:.0f} bytes")
+    print(
+        f"write -> all notified: p50 {latencies[len(latencies) // 2]:.1f}ms, "
+        f"max {latencies[-1]:.1f}ms (one encoded message per update)"
+    )
+
+
+def main() -> None:
+    subscribers = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    updates = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    logging.disable(logging.INFO)
+    fill_store(10_000)
+    asyncio.run(run(subscribers, updates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Logging overhead benchmark.
+
+Measures the per-request cost of GET /asset (which logs at INFO) through
+the ASGI app with:
+- no logging (handlers removed)
+- the previous setup: synchronous StreamHandler with the text format
+- the current setup: JSON records behind a queue, optionally sampled
+
+The sink simulates a blocking stderr pipe by sleeping on every write.
+
+Usage: python -m backend.benchmarks.bench_logging [requests] [write_latency_us]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+
+import httpx
+
+from backend.config import LOGGING_CONFIG
+from backend.main import app
+from backend.src.admission import set_rate_limits
+from backend.src.logs import (
+    JsonFormatter,
+    RequestIdFilter,
+    SamplingFilter,
+    enable_queue_logging,
+    stop_queue_logging,
+)
+
+
+class SlowSink:
+    """File-like sink whose writes block for a fixed time"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def write(self, data: str) -> None:
+        time.sleep(self.latency)
+
+    def flush(self) -> None:
+        pass
+
+
+def configure(mode: str, sink: SlowSink) -> None:
+    """Install the logging setup for one benchmark mode"""
+    stop_queue_logging()
+    root = logging.getLogger()
+    root.handlers = []
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if mode == "none":
+        return
+    handler = logging.StreamHandler(sink)
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    if mode == "sync":
+        text_format = LOGGING_CONFIG["formatters"]["text"]["format"]
+        handler.setFormatter(logging.Formatter(text_format))
+        return
+    handler.setFormatter(JsonFormatter())
+    rate = 0.1 if mode == "queue_sampled" else 1.0
+    enable_queue_logging([RequestIdFilter(), SamplingFilter(rate)])
+
+
+async def run(requests: int) -> float:
+    """Average microseconds per GET /asset"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/asset")
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+def main() -> None:
+    set_rate_limits(0, 0)  # measure the handlers, not the rate limiter
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency_us = float(sys.argv[2]) if len(sys.argv) > 2 else 200
+    sink = SlowSink(latency_us / 1e6)
+    print(f"requests={requests} write_latency_us={latency_us:g}")
+    print(f"{'mode':>14} {'us_per_request':>15}")
+    for mode in ("none", "sync", "queue", "queue_sampled"):
+        configure(mode, sink)
+        us = asyncio.run(run(requests))
+        print(f"{mode:>14} {us:>15.1f}")
+    stop_queue_logging()
+
+
+if __name__ == "__main__":
+    main()
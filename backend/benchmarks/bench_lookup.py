@@ -0,0 +1,43 @@
+"""
+Single-asset lookup latency benchmark.
+
+Measures get_asset and batch lookup latency as the book grows to show that
+access by id stays constant time.
+
+Usage: python -m backend.benchmarks.bench_lookup [max_asset_count]
+"""
+
+import random
+import sys
+import time
+
+from backend.benchmarks.bench_sharding import fill_store
+from backend.src.storage import get_asset, get_assets_by_id
+
+
+def main() -> None:
+    max_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+    print(f"{'assets':>10} {'get_asset_us':>13} {'lookup_100_us':>14}")
+    count = 1_000
+    while count <= max_count:
+        fill_store(count)
+        ids = [f"asset-{rng.randrange(count)}" for _ in range(10_000)]
+
+        start = time.perf_counter()
+        for asset_id in ids:
+            get_asset(asset_id)
+        single_us = (time.perf_counter() - start) / len(ids) * 1e6
+
+        batches = [ids[i : i + 100] for i in range(0, len(ids), 100)]
+        start = time.perf_counter()
+        for batch in batches:
+            get_assets_by_id(batch)
+        batch_us = (time.perf_counter() - start) / len(batches) * 1e6
+
+        print(f"{count:>10} {single_us:>13.2f} {batch_us:>14.1f}")
+        count *= 10
+
+
+if __name__ == "__main__":
+    main()
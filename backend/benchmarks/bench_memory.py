@@ -0,0 +1,68 @@
+"""
+Storage memory benchmark.
+
+Compares the memory held by the columnar store (interned ids, compact
+columns) with the previous layout of one AssetData object per id in a dict.
+
+Usage: python -m backend.benchmarks.bench_memory [asset_count]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from backend.loadtest.generator import generate_assets
+from backend.src.models import AssetData
+from backend.src.storage import clear_assets, store_asset
+
+
+def measure(build) -> tuple[int, object]:
+    """Bytes allocated by build() that are still alive afterwards"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    # Records are generated up front so only the stored form is measured
+    records = list(generate_assets(count))
+
+    def parsed(record: dict) -> AssetData:
+        # Fresh strings per record, as they arrive from a parsed request body
+        return AssetData(
+            id=record["id"].encode().decode(),
+            nominal_value=record["nominal_value"],
+            due_date=record["due_date"].encode().decode(),
+            interest_rate=record["interest_rate"],
+        )
+
+    def dict_of_models():
+        store = {}
+        for record in records:
+            asset_data = parsed(record)
+            store[asset_data.id] = asset_data
+        return store
+
+    def columnar():
+        clear_assets()
+        for record in records:
+            asset_data = parsed(record)
+            store_asset(asset_data.id, asset_data)
+
+    before, baseline = measure(dict_of_models)
+    del baseline
+    after, _ = measure(columnar)
+    print(f"assets={count}")
+    print(f"{'layout':>16} {'total_mb':>9} {'bytes_per_asset':>16}")
+    print(f"{'dict[AssetData]':>16} {before / 1e6:>9.1f} {before / count:>16.0f}")
+    print(f"{'columnar':>16} {after / 1e6:>9.1f} {after / count:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Multi-tenant portfolio benchmark.
+
+Fills many small portfolios and reports the memory held per tenant, the
+time to write a batch into one portfolio and to read its insights. Insights
+come from running aggregates, so their cost does not depend on the book
+size; the scan column recomputes them from the rows for comparison.
+
+Usage: python -m backend.benchmarks.bench_portfolios [tenants] [assets_per_tenant]
+"""
+
+import sys
+import time
+
+from backend.benchmarks.bench_memory import measure
+from backend.loadtest.generator import generate_assets
+from backend.src.models import AssetData, AssetInput
+from backend.src.portfolios import clear_portfolios, get_portfolio
+from backend.src.service import (
+    _build_insights,
+    _summarize_shard,
+    portfolio_insights,
+    store_portfolio_assets,
+)
+
+
+def per_call_us(func, calls: int) -> float:
+    """Mean wall time of func in microseconds"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    tenants = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    per_tenant = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    records = list(generate_assets(per_tenant))
+    batch = [AssetInput(**record) for record in records]
+
+    def fill() -> None:
+        for tenant in range(tenants):
+            store_portfolio_assets(f"tenant-{tenant}", batch)
+
+    start = time.perf_counter()
+    size, _ = measure(fill)
+    fill_s = time.perf_counter() - start
+    print(f"tenants={tenants} assets_per_tenant={per_tenant}")
+    print(f"fill: {fill_s:.2f}s, {size / tenants:.0f} bytes per tenant")
+
+    portfolio = get_portfolio("tenant-0")
+    update = [AssetData(**record) for record in records]
+
+    def scan() -> None:
+        columns = portfolio.snapshot()
+        _build_insights(
+            [_summarize_shard(columns.nominal_values, columns.interest_rates)]
+        )
+
+    print(f"{'operation':>22} {'us':>9}")
+    rows = (
+        ("post batch", lambda: store_portfolio_assets("tenant-1", batch)),
+        ("put one asset", lambda: portfolio.put(update[0])),
+        ("insights (aggregates)", lambda: portfolio_insights("tenant-0")),
+        ("insights (scan)", scan),
+    )
+    for name, func in rows:
+        func()  # warm up
+        print(f"{name:>22} {per_call_us(func, 2000):>9.1f}")
+    clear_portfolios()
+
+
+if __name__ == "__main__":
+    main()
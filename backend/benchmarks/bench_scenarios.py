@@ -0,0 +1,85 @@
+"""
+Scenario engine benchmark.
+
+Evaluates a set of what-if scenarios (rate shifts, due date shifts and
+filtered haircuts) over a synthetic book, in one batched call and one call
+per scenario. The batched call only saves the per-call snapshot: evaluation
+cost grows with scenarios times rows either way.
+
+Also reports the longest event loop stall while a batch is evaluated inline
+and, as POST /insights/scenario does, in a worker thread.
+
+Usage: python -m backend.benchmarks.bench_scenarios [asset_count] [scenarios]
+"""
+
+import asyncio
+import sys
+import time
+
+from backend.benchmarks.bench_sharding import fill_store, timed
+from backend.src.models import AssetStatus, Scenario, ScenarioShock
+from backend.src.service import run_scenarios, scenarios_snapshot
+
+
+def make_scenarios(count: int) -> list[Scenario]:
+    """Scenarios cycling through the supported shock types"""
+    shocks = [
+        [ScenarioShock(rate_shift=0.005)],
+        [ScenarioShock(haircut=1.0, due_within_days=30)],
+        [
+            ScenarioShock(due_date_shift_days=-90),
+            ScenarioShock(status=AssetStatus.DEFAULTED, haircut=0.4),
+        ],
+        [],
+    ]
+    return [
+        Scenario(id=f"scenario-{i}", shocks=shocks[i % len(shocks)])
+        for i in range(count)
+    ]
+
+
+async def max_stall_ms(evaluate) -> float:
+    """Longest gap between ticks of a 1ms timer while evaluate() is awaited"""
+    stall = 0.0
+    done = False
+
+    async def tick() -> None:
+        nonlocal stall
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stall = max(stall, time.perf_counter() - start)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0.01)
+    await evaluate()
+    done = True
+    await ticker
+    return stall * 1000
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    scenario_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    fill_store(count)
+    scenarios = make_scenarios(scenario_count)
+    batched_ms = timed(lambda: run_scenarios(scenarios))
+    separate_ms = timed(lambda: [run_scenarios([s]) for s in scenarios])
+    print(f"assets={count} scenarios={scenario_count}")
+    print(f"{'mode':>9} {'total_ms':>9} {'ms_per_scenario':>16}")
+    for mode, ms in (("batched", batched_ms), ("separate", separate_ms)):
+        print(f"{mode:>9} {ms:>9.1f} {ms / scenario_count:>16.1f}")
+
+    async def inline():
+        run_scenarios(scenarios)
+
+    async def threaded():
+        await asyncio.to_thread(scenarios_snapshot(scenarios))
+
+    for mode, evaluate in (("inline", inline), ("thread", threaded)):
+        stall_ms = asyncio.run(max_stall_ms(evaluate))
+        print(f"{mode:>9} max_loop_stall_ms={stall_ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
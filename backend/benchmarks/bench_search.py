@@ -0,0 +1,63 @@
+"""
+Asset id search benchmark.
+
+Fills the store with synthetic ids (asset-0 .. asset-N), times a search
+answered by the fallback scan, builds the trigram index and times top-k searches for fragments of varying selectivity, against
+a linear scan over every id. Also times single writes with the index live.
+
+Usage: python -m backend.benchmarks.bench_search [asset_count] [limit]
+"""
+
+import sys
+import time
+
+from backend.benchmarks.bench_memory import measure
+from backend.benchmarks.bench_portfolios import per_call_us
+from backend.benchmarks.bench_sharding import fill_store
+from backend.src.models import AssetData
+from backend.src.search import IdIndex
+from backend.src.storage import build_id_index, search_ids, shards, store_asset
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    fill_store(count)
+
+    # Before the index exists, searches scan every id
+    scan_first_us = per_call_us(lambda: search_ids("asset-123456", limit), 2)
+    start = time.perf_counter()
+    build_id_index()
+    build_s = time.perf_counter() - start
+    sample = [asset_id for shard in shards for asset_id in shard.ids][:100_000]
+    size, _ = measure(lambda: IdIndex(sample))
+    print(f"assets={count} limit={limit}")
+    print(f"index build: {build_s:.2f}s, {size / len(sample):.0f} bytes per asset")
+    print(f"search while the index is missing (scan): {scan_first_us / 1000:.0f}ms")
+
+    def scan(query: str) -> list[str]:
+        return sorted(
+            asset_id for shard in shards for asset_id in shard.ids if query in asset_id
+        )[:limit]
+
+    print(f"{'query':>10} {'matches':>8} {'index_us':>9} {'scan_us':>9}")
+    for query in ("asset-123456", "99999", "4242", "-77", "as"):
+        matches = sum(1 for shard in shards for i in shard.ids if query in i)
+        index_us = per_call_us(lambda: search_ids(query, limit), 200)
+        scan_us = per_call_us(lambda: scan(query), 2)
+        print(f"{query:>10} {matches:>8} {index_us:>9.1f} {scan_us:>9.0f}")
+
+    asset = AssetData(
+        id="x", nominal_value=1, due_date="2030-01-01", interest_rate=0.01
+    )
+    new_ids = iter(range(count, count * 2))
+
+    def insert() -> None:
+        asset_id = f"asset-{next(new_ids)}"
+        store_asset(asset_id, asset)
+
+    print(f"insert with index: {per_call_us(insert, 10_000):.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Scaling benchmark for sharded scatter-gather aggregations.
+
+Fills the store with synthetic assets and times /insights and filtered
+GET /asset aggregations with 1..N worker processes.
+
+Usage: python -m backend.benchmarks.bench_sharding [asset_count] [max_workers]
+"""
+
+import os
+import sys
+import time
+
+from backend.src.models import AssetData, AssetStatus
+from backend.src.service import calculate_insights, list_assets, set_aggregation_workers
+from backend.src.storage import clear_assets, shards, store_asset
+
+
+def fill_store(count: int) -> None:
+    """Store count synthetic assets"""
+    clear_assets()
+    for i in range(count):
+        store_asset(
+            f"asset-{i}",
+            AssetData(
+                id=f"asset-{i}",
+                nominal_value=100 + i % 1000,
+                due_date=f"20{20 + i % 10}-0{1 + i % 9}-1{i % 10}",
+                interest_rate=(i % 100) / 1000,
+            ),
+        )
+
+
+def timed(func, repeat: int = 3) -> float:
+    """Best wall time in milliseconds over repeat runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+
+    fill_store(count)
+    print(f"assets={count} shards={len(shards)} cpus={os.cpu_count()}")
+    print(f"{'workers':>8} {'insights_ms':>12} {'filtered_get_ms':>16}")
+    for workers in range(1, max_workers + 1):
+        set_aggregation_workers(workers)
+        calculate_insights()  # warm up the pool
+        insights_ms = timed(calculate_insights)
+        filtered_ms = timed(lambda: list_assets(AssetStatus.DEFAULTED))
+        print(f"{workers:>8} {insights_ms:>12.1f} {filtered_ms:>16.1f}")
+    set_aggregation_workers(0)
+
+
+if __name__ == "__main__":
+    main()
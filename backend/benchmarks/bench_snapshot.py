@@ -0,0 +1,70 @@
+"""
+Snapshot file benchmark.
+
+Dumps a synthetic book to a snapshot file and compares how long a process
+takes to get ready to serve it: rebuilding the in-memory store asset by
+asset versus memory-mapping the file. Also times the first reads from the
+mapped store.
+
+Usage: python -m backend.benchmarks.bench_snapshot [asset_count]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from backend.benchmarks.bench_sharding import fill_store
+from backend.src.service import calculate_insights
+from backend.src.snapshot import dump_snapshot
+from backend.src.storage import (
+    get_asset,
+    get_shard_columns,
+    load_snapshot,
+    unload_snapshot,
+)
+
+
+def ms_since(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "assets.snapshot")
+
+        start = time.perf_counter()
+        fill_store(count)
+        rebuild_ms = ms_since(start)
+
+        start = time.perf_counter()
+        size = dump_snapshot(path, get_shard_columns())
+        dump_ms = ms_since(start)
+
+        start = time.perf_counter()
+        load_snapshot(path)
+        map_ms = ms_since(start)
+
+        start = time.perf_counter()
+        calculate_insights()
+        insights_ms = ms_since(start)
+
+        start = time.perf_counter()
+        for i in range(0, count, max(count // 1000, 1)):
+            get_asset(f"asset-{i}")
+        lookup_us = ms_since(start) * 1000 / min(count, 1000)
+        unload_snapshot()
+
+    print(f"assets={count} file_bytes={size} bytes_per_asset={size / count:.1f}")
+    print(f"{'rebuild_store_ms':>17} {rebuild_ms:>10.1f}")
+    print(f"{'dump_ms':>17} {dump_ms:>10.1f}")
+    print(f"{'map_snapshot_ms':>17} {map_ms:>10.2f}")
+    print(f"{'first_insights_ms':>17} {insights_ms:>10.1f}")
+    print(f"{'lookup_us':>17} {lookup_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
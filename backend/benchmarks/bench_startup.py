@@ -0,0 +1,54 @@
+"""
+Cold-start benchmark.
+
+Starts fresh interpreters and measures how long it takes to import the
+FastAPI framework, to import backend.main on top of it, and to finish the
+startup warmup (time until /ready reports ready).
+
+Usage: python -m backend.benchmarks.bench_startup [runs]
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import json, time
+start = time.perf_counter()
+import fastapi
+framework = time.perf_counter()
+import backend.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(backend.main.app) as client:
+    while client.get("/ready").status_code != 200:
+        time.sleep(0.001)
+ready = time.perf_counter()
+print(json.dumps({
+    "framework_ms": (framework - start) * 1000,
+    "app_import_ms": (imported - framework) * 1000,
+    "ready_ms": (ready - imported) * 1000,
+}))
+"""
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"runs={runs} (median ms)")
+    for key in ("framework_ms", "app_import_ms", "ready_ms"):
+        print(f"{key:>14} {statistics.median(s[key] for s in samples):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
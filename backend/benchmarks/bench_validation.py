@@ -0,0 +1,74 @@
+"""
+Validation rules benchmark.
+
+Validates input batches against the base rules and against a tenant rule
+set with a value cap, a maturity range and an id glob, for a clean batch
+and one where every tenth row breaks a rule. The per-row baseline is the
+previous validator, which parsed every row's date and stopped at the first
+error.
+
+Usage: python -m backend.benchmarks.bench_validation [batch_size]
+"""
+
+import sys
+from datetime import UTC, datetime, timedelta
+
+from backend.benchmarks.bench_sharding import timed
+from backend.src.models import AssetInput, RuleSet
+from backend.src.rules import batch_columns, compile_rules
+
+
+def make_batch(size: int, bad_every: int = 0) -> list[AssetInput]:
+    """Batch of valid assets, with an over-cap value every bad_every rows"""
+    today = datetime.now(UTC).date()
+    dates = [(today + timedelta(days=d)).isoformat() for d in range(0, 720, 30)]
+    return [
+        AssetInput(
+            id=f"AS-{i}",
+            nominal_value=(2_000_000 if bad_every and i % bad_every == 0 else 1000 + i),
+            due_date=dates[i % len(dates)],
+            interest_rate=(i % 100) / 1000,
+        )
+        for i in range(size)
+    ]
+
+
+def per_row(assets: list[AssetInput]) -> None:
+    """The previous validator: one pass per row, stopping at the first error"""
+    seen = set()
+    for asset in assets:
+        if asset.nominal_value < 0 or not 0 <= asset.interest_rate <= 1:
+            return
+        if asset.id in seen:
+            return
+        seen.add(asset.id)
+        datetime.strptime(asset.due_date, "%Y-%m-%d")
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    base = compile_rules(RuleSet())
+    tenant = compile_rules(
+        RuleSet(
+            max_nominal_value=1_000_000,
+            min_maturity_days=0,
+            max_maturity_days=3650,
+            id_glob="[A-Z][A-Z]-*",
+        )
+    )
+    print(f"batch_size={size}")
+    print(f"{'batch':>7} {'checker':>18} {'ms':>7} {'violations':>11}")
+    for label, assets in (("clean", make_batch(size)), ("bad", make_batch(size, 10))):
+        runs = (
+            ("per-row (previous)", lambda: per_row(assets), None),
+            ("base rules", lambda: base.check(batch_columns(assets)), base),
+            ("tenant rules", lambda: tenant.check(batch_columns(assets)), tenant),
+        )
+        for name, func, checker in runs:
+            ms = timed(func)
+            found = len(checker.check(batch_columns(assets))) if checker else "-"
+            print(f"{label:>7} {name:>18} {ms:>7.2f} {found:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Wire format benchmark for GET /asset payloads.
+
+Compares payload size (raw and gzip) and encode/decode time of the JSON
+response with columnar MessagePack and, if installed, Arrow IPC. Decode time
+is the time a client needs to parse the body into native structures.
+
+Usage: python -m backend.benchmarks.bench_wire [asset_count]
+"""
+
+import gzip
+import json
+import sys
+
+import msgpack
+
+from backend.benchmarks.bench_sharding import fill_store, timed
+from backend.src import wire
+from backend.src.service import asset_columns, iter_assets_json
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    fill_store(count)
+    print(f"assets={count}")
+    print(
+        f"{'format':>26} {'bytes':>11} {'gzip_bytes':>11} "
+        f"{'encode_ms':>10} {'decode_ms':>10}"
+    )
+
+    body = b"".join(iter_assets_json())
+    encode_ms = timed(lambda: b"".join(iter_assets_json()))
+    decode_ms = timed(lambda: json.loads(body))
+    print(
+        f"{wire.JSON:>26} {len(body):>11} {len(gzip.compress(body)):>11} "
+        f"{encode_ms:>10.1f} {decode_ms:>10.1f}"
+    )
+
+    for fmt in wire.SUPPORTED_FORMATS:
+        if fmt == wire.JSON:
+            continue
+        body = wire.encode_columns(asset_columns(), fmt)
+        encode_ms = timed(lambda: wire.encode_columns(asset_columns(), fmt))
+        if fmt == wire.MSGPACK:
+            decode_ms = timed(lambda: msgpack.unpackb(body))
+        else:
+            import pyarrow as pa
+
+            decode_ms = timed(lambda: pa.ipc.open_stream(body).read_all())
+        print(
+            f"{fmt:>26} {len(body):>11} {len(gzip.compress(body)):>11} "
+            f"{encode_ms:>10.1f} {decode_ms:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,73 @@
 """Application configuration"""
 
 import logging
+import os
 from logging.config import dictConfig
 
+from backend.src.logs import RequestIdFilter, SamplingFilter, enable_queue_logging
+
+# Storage configuration
+# Number of shards the asset store is partitioned into (by id hash)
+STORAGE_SHARDS = int(os.getenv("STORAGE_SHARDS", "8"))
+# Worker processes used for per-shard aggregations; 0 or 1 runs them in-process
+AGGREGATION_WORKERS = int(os.getenv("AGGREGATION_WORKERS", "0"))
+# Snapshot file written by POST /snapshot and mapped by read-only replicas
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "assets.snapshot")
+# Serve reads from the snapshot file at SNAPSHOT_PATH and reject writes
+READ_ONLY = os.getenv("READ_ONLY", "false").lower() in ("1", "true", "yes")
+
+# Validation rules per tenant, as JSON: {"tenant": {"max_nominal_value": 1e6, ...}}
+# Tenants without an entry use the "default" entry, if any
+VALIDATION_RULES = os.getenv("VALIDATION_RULES", "")
+
+# Async ingestion configuration
+# Maximum number of batches waiting in the write-behind queue
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "64"))
+# Number of finished jobs kept for status lookups
+INGEST_JOB_HISTORY = int(os.getenv("INGEST_JOB_HISTORY", "1000"))
+
+# Admission control (per-client token buckets and load shedding, in-process)
+# Requests per second and burst size per client and endpoint
+RATE_LIMIT_REQUESTS_PER_SECOND = float(
+    os.getenv("RATE_LIMIT_REQUESTS_PER_SECOND", "50")
+)
+RATE_LIMIT_REQUEST_BURST = float(os.getenv("RATE_LIMIT_REQUEST_BURST", "100"))
+# Assets per second and burst size per client for POST /asset (cost = batch size)
+RATE_LIMIT_ASSETS_PER_SECOND = float(os.getenv("RATE_LIMIT_ASSETS_PER_SECOND", "20000"))
+RATE_LIMIT_ASSET_BURST = float(os.getenv("RATE_LIMIT_ASSET_BURST", "50000"))
+# Number of client/endpoint buckets kept (least recently used are dropped)
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "10000"))
+# Writes in flight plus batches queued for async ingestion above which writes get 503
+MAX_PENDING_WRITES = int(os.getenv("MAX_PENDING_WRITES", "96"))
+# Requests in flight above which every request gets 503
+MAX_IN_FLIGHT_REQUESTS = int(os.getenv("MAX_IN_FLIGHT_REQUESTS", "256"))
+
+# Live updates (WebSocket /ws/insights)
+# Maximum insight pushes per second; bursts of writes in between are coalesced
+LIVE_MAX_PUSHES_PER_SECOND = float(os.getenv("LIVE_MAX_PUSHES_PER_SECOND", "4"))
+
+# Logging configuration
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# "json" for structured records, "text" for the plain format
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Fraction of INFO records kept (warnings and errors are never sampled)
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
 # Configure logging
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
-        "default": {
+        "text": {
             "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         },
+        "json": {
+            "()": "backend.src.logs.JsonFormatter",
+        },
     },
     "handlers": {
         "default": {
-            "formatter": "default",
+            "formatter": LOG_FORMAT,
             "class": "logging.StreamHandler",
             "stream": "ext://sys.stderr",
         },
@@ -22,12 +75,16 @@ LOGGING_CONFIG = {
     "loggers": {
         "": {
             "handlers": ["default"],
-            "level": "INFO",
+            "level": LOG_LEVEL,
         },
     },
 }
 
 
 def setup_logging():
-    """Setup logging configuration"""
+    """
+    Setup logging configuration.
+    Handlers are moved behind a queue so request handlers never block on writes.
+    """
     dictConfig(LOGGING_CONFIG)
+    enable_queue_logging([RequestIdFilter(), SamplingFilter(LOG_SAMPLE_RATE)])
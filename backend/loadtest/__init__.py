@@ -0,0 +1 @@
+"""Load testing tools: synthetic portfolio generator and HTTP load driver"""
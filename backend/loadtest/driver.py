@@ -0,0 +1,184 @@
+"""
+Async HTTP load driver.
+
+Runs a weighted mix of POST /asset, GET /asset and GET /insights requests at
+a fixed concurrency and reports throughput, p50/p95/p99 latency and error
+rate per endpoint.
+
+Usage:
+    python -m backend.loadtest.driver --url http://localhost:8000 \\
+        --preload 100000 --concurrency 32 --duration 30 \\
+        --mix post_asset=1,get_asset=2,get_insights=7
+    python -m backend.loadtest.driver --in-process ...  # drive the app via ASGI
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from backend.loadtest.generator import generate_batches
+
+ENDPOINTS = {
+    "post_asset": ("POST", "/asset"),
+    "get_asset": ("GET", "/asset"),
+    "get_insights": ("GET", "/insights"),
+}
+
+
+@dataclass
+class EndpointStats:
+    """Latencies and errors collected for one endpoint"""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank latency percentile in milliseconds"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+        return ordered[rank] * 1000
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parse 'post_asset=1,get_asset=2' into endpoint weights"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def preload(client: httpx.AsyncClient, count: int, batch_size: int, seed: int):
+    """Load the initial book before measuring"""
+    for batch in generate_batches(count, batch_size, seed=seed):
+        response = await client.post("/asset", json=batch)
+        while response.status_code in (429, 503):
+            # Rate limited or shed: wait as instructed and retry the batch
+            await asyncio.sleep(float(response.headers.get("retry-after", "1")))
+            response = await client.post("/asset", json=batch)
+        response.raise_for_status()
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: dict[str, float],
+    concurrency: int,
+    duration: float,
+    batch_size: int,
+    seed: int = 0,
+    next_id: int = 0,
+) -> tuple[dict[str, EndpointStats], float]:
+    """
+    Run the request mix with concurrency workers for duration seconds.
+    Returns per-endpoint stats and the elapsed wall time.
+    """
+    stats = {name: EndpointStats() for name in mix}
+    names, weights = list(mix), list(mix.values())
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + duration
+    # POSTs write fresh ids after the preloaded book
+    id_counter = iter(range(next_id, 2**62, batch_size))
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, path = ENDPOINTS[name]
+            body = None
+            if method == "POST":
+                body = next(
+                    generate_batches(
+                        batch_size, batch_size, seed=seed, start=next(id_counter)
+                    )
+                )
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            stats[name].latencies.append(time.perf_counter() - start)
+            stats[name].errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return stats, time.perf_counter() - start
+
+
+def format_report(stats: dict[str, EndpointStats], elapsed: float) -> str:
+    """Render per-endpoint results as a table"""
+    lines = [
+        f"{'endpoint':>14} {'requests':>9} {'req/s':>9} {'p50_ms':>9} "
+        f"{'p95_ms':>9} {'p99_ms':>9} {'errors':>8}"
+    ]
+    for name, endpoint in stats.items():
+        error_rate = endpoint.errors / endpoint.requests if endpoint.requests else 0.0
+        lines.append(
+            f"{name:>14} {endpoint.requests:>9} {endpoint.requests / elapsed:>9.1f} "
+            f"{endpoint.percentile(50):>9.1f} {endpoint.percentile(95):>9.1f} "
+            f"{endpoint.percentile(99):>9.1f} {error_rate:>8.2%}"
+        )
+    return "\n".join(lines)
+
+
+def make_client(url: str, in_process: bool) -> httpx.AsyncClient:
+    """HTTP client for a running server, or for the app in this process"""
+    if in_process:
+        from backend.main import app
+        from backend.src.admission import set_rate_limits
+
+        # Every simulated client shares one address, so per-client limits would
+        # throttle the whole run
+        set_rate_limits(0, 0)
+        transport = httpx.ASGITransport(app=app)
+        return httpx.AsyncClient(transport=transport, base_url="http://loadtest")
+    return httpx.AsyncClient(base_url=url, timeout=60)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    async with make_client(args.url, args.in_process) as client:
+        if args.preload:
+            await preload(client, args.preload, args.batch_size, args.seed)
+        stats, elapsed = await run_load(
+            client,
+            parse_mix(args.mix),
+            args.concurrency,
+            args.duration,
+            args.batch_size,
+            seed=args.seed,
+            next_id=args.preload,
+        )
+    print(
+        f"concurrency={args.concurrency} duration={elapsed:.1f}s "
+        f"preload={args.preload} batch_size={args.batch_size}"
+    )
+    print(format_report(stats, elapsed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Async HTTP load driver")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true")
+    parser.add_argument("--preload", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--mix", default="post_asset=1,get_asset=2,get_insights=7")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Seeded synthetic portfolio generator.
+
+Emits AssetInput-shaped records with realistic distributions:
+- nominal_value: log-normal (median ~25k, long right tail)
+- interest_rate: beta distributed (mean ~6%), capped to the valid 0-1 range
+- due_date: ~10% already past due (defaulted), the rest spread over the next
+  years with short maturities more common than long ones
+
+Usage: python -m backend.loadtest.generator COUNT [--seed N] [--out FILE]
+Writes one JSON record per line (stdout by default).
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+from datetime import UTC, date, datetime, timedelta
+from itertools import islice
+from typing import Iterator
+
+# Share of assets whose due date is already in the past
+DEFAULTED_SHARE = 0.1
+
+
+def generate_assets(
+    count: int, seed: int = 0, start: int = 0, as_of: date | None = None
+) -> Iterator[dict]:
+    """
+    Yield count asset records with ids asset-{start}..asset-{start + count - 1}.
+    The same seed, start and as_of always produce the same records.
+    """
+    rng = random.Random(f"{seed}:{start}")
+    as_of = as_of or datetime.now(UTC).date()
+    for index in range(start, start + count):
+        if rng.random() < DEFAULTED_SHARE:
+            days = -rng.randint(1, 730)
+        else:
+            # Mean maturity ~2 years, capped at 30 years
+            days = min(int(rng.expovariate(1 / 730)) + 1, 30 * 365)
+        yield {
+            "id": f"asset-{index}",
+            "nominal_value": round(rng.lognormvariate(math.log(25_000), 1.2), 2),
+            "due_date": (as_of + timedelta(days=days)).isoformat(),
+            "interest_rate": round(min(rng.betavariate(2, 30), 1.0), 4),
+        }
+
+
+def generate_batches(
+    count: int, batch_size: int, seed: int = 0, start: int = 0
+) -> Iterator[list[dict]]:
+    """Yield the generated records in POST /asset sized batches"""
+    records = generate_assets(count, seed=seed, start=start)
+    while batch := list(islice(records, batch_size)):
+        yield batch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("count", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=argparse.FileType("w"), default=sys.stdout)
+    args = parser.parse_args()
+
+    for record in generate_assets(args.count, seed=args.seed):
+        args.out.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,53 @@
 """FastAPI application entry point"""
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.config import setup_logging
+from backend.config import READ_ONLY, SNAPSHOT_PATH, setup_logging
+from backend.src.admission import AdmissionMiddleware
+from backend.src.ingest import start_consumer, stop_consumer
+from backend.src.logs import RequestIdMiddleware, stop_queue_logging
+from backend.src.models import AssetInput
+from backend.src.readiness import warmup
 from backend.src.routes import router
+from backend.src.service import shutdown_executor, start_search_index_build
+from backend.src.storage import load_snapshot
 
 # Setup logging
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Run warmup in the background so /health answers while /ready waits.
+    Starts the async ingestion consumer and drains it on shutdown, and builds
+    the id search index in a worker thread.
+    In read-only mode the snapshot file is mapped first (this is only a header
+    read, so it does not depend on book size), and the search index is left
+    to the first search so replicas that never search do not decode every id.
+    """
+    if READ_ONLY:
+        load_snapshot(SNAPSHOT_PATH)
+    warmup_task = asyncio.create_task(asyncio.to_thread(warmup, app))
+    start_consumer()
+    if not READ_ONLY:
+        start_search_index_build()
+    yield
+    await stop_consumer()
+    await warmup_task
+    shutdown_executor()
+    stop_queue_logging()
+
+
 # Initialize FastAPI app
-app = FastAPI(title="Insights App", version="1.0.0")
+app = FastAPI(title="Insights App", version="1.0.0", lifespan=lifespan)
+
+# Shed load and rate limit per client before requests reach the routes
+app.add_middleware(AdmissionMiddleware)
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -19,11 +56,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "Retry-After"],
 )
 
+# Tag every request (and its log records) with a request id
+app.add_middleware(RequestIdMiddleware)
+
 # Include routes
 app.include_router(router)
 
+_default_openapi = app.openapi
+
+
+def openapi() -> dict:
+    """
+    Generate the OpenAPI schema on first use.
+    AssetInput is parsed by a dependency rather than a body parameter, so its
+    schema is added to the components here.
+    """
+    if app.openapi_schema is None:
+        schema = _default_openapi()
+        schema.setdefault("components", {}).setdefault("schemas", {})["AssetInput"] = (
+            AssetInput.model_json_schema(ref_template="#/components/schemas/{model}")
+        )
+    return app.openapi_schema
+
+
+app.openapi = openapi
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,207 @@
+"""In-process admission control: per-client rate limits and load shedding
+
+Each client gets a token bucket per endpoint (method and first path segment),
+and POST /asset is additionally charged per asset from a per-client bucket,
+so large batches cost more than small ones. A batch may overdraw the asset
+bucket; the client's next batches are then rejected before their body is read
+until the debt has refilled. When too many writes are pending
+(in flight or queued for async ingestion) further writes are shed with 503,
+and above a hard in-flight limit every request is shed, keeping read latency
+bounded under write floods. Rejections carry a Retry-After header.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+
+from fastapi.responses import JSONResponse
+
+from backend.config import (
+    MAX_IN_FLIGHT_REQUESTS,
+    MAX_PENDING_WRITES,
+    RATE_LIMIT_ASSET_BURST,
+    RATE_LIMIT_ASSETS_PER_SECOND,
+    RATE_LIMIT_MAX_BUCKETS,
+    RATE_LIMIT_REQUEST_BURST,
+    RATE_LIMIT_REQUESTS_PER_SECOND,
+)
+from backend.src.ingest import queue_depth
+from backend.src.metrics import increment
+
+logger = logging.getLogger(__name__)
+
+# Paths that are never limited (probes and monitoring)
+EXEMPT_PATHS = {"/health", "/ready", "/metrics"}
+
+_READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate` tokens per second, up to
+    `capacity`. Requests are admitted while at least one token is left and
+    are charged their full cost, so the balance can go negative.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, cost: float, now: float) -> float:
+        """
+        Charge cost tokens if the bucket is not empty.
+        Returns 0 when admitted, otherwise the seconds until a token refills.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        self.tokens -= cost
+        return 0.0
+
+
+class RateLimiter:
+    """
+    Token buckets per key, keeping only the most recently used ones.
+    A rate of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_buckets: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_buckets = max_buckets
+        self._buckets: OrderedDict[tuple, TokenBucket] = OrderedDict()
+
+    def take(self, key: tuple, cost: float = 1.0) -> float:
+        """Charge a key; returns 0 when admitted, else the seconds to wait"""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.capacity, now)
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take(cost, now)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+request_limiter = RateLimiter(
+    RATE_LIMIT_REQUESTS_PER_SECOND, RATE_LIMIT_REQUEST_BURST, RATE_LIMIT_MAX_BUCKETS
+)
+asset_limiter = RateLimiter(
+    RATE_LIMIT_ASSETS_PER_SECOND, RATE_LIMIT_ASSET_BURST, RATE_LIMIT_MAX_BUCKETS
+)
+
+_in_flight = 0
+_in_flight_writes = 0
+
+
+def client_id(scope) -> str:
+    """Identify the client of a request (its remote address)"""
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def retry_after(wait: float) -> str:
+    """Format a wait time as a Retry-After value (whole seconds, at least 1)"""
+    return str(max(1, math.ceil(wait)))
+
+
+def set_rate_limits(requests_per_second: float, assets_per_second: float) -> None:
+    """Change the per-client rates (0 disables a limit); bursts are unchanged"""
+    request_limiter.rate = requests_per_second
+    asset_limiter.rate = assets_per_second
+    reset_admission()
+
+
+def charge_assets(client: str, count: int) -> float:
+    """Charge a POST /asset batch; returns 0 when admitted, else the seconds to wait"""
+    wait = asset_limiter.take((client,), count)
+    if wait:
+        increment("admission.rate_limited")
+    return wait
+
+
+def in_flight() -> tuple[int, int]:
+    """Get the number of (all, write) requests currently being handled"""
+    return _in_flight, _in_flight_writes
+
+
+def reset_admission() -> None:
+    """Forget all buckets and in-flight counts (useful for testing)"""
+    global _in_flight, _in_flight_writes
+    request_limiter.clear()
+    asset_limiter.clear()
+    _in_flight = _in_flight_writes = 0
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that sheds load and applies per-client, per-endpoint
+    rate limits before a request reaches the application.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _in_flight, _in_flight_writes
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        is_write = method not in _READ_METHODS
+        rejection = self._check(scope, method, is_write)
+        if rejection is not None:
+            await rejection(scope, receive, send)
+            return
+
+        _in_flight += 1
+        _in_flight_writes += is_write
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _in_flight -= 1
+            _in_flight_writes -= is_write
+
+    @staticmethod
+    def _check(scope, method: str, is_write: bool) -> JSONResponse | None:
+        """Get the rejection response for a request, or None to admit it"""
+        if _in_flight >= MAX_IN_FLIGHT_REQUESTS or (
+            is_write and _in_flight_writes + queue_depth() >= MAX_PENDING_WRITES
+        ):
+            increment("admission.shed")
+            logger.warning("Shedding %s %s: server busy", method, scope["path"])
+            return JSONResponse(
+                status_code=503,
+                content={"detail": "Server busy, retry later"},
+                headers={"Retry-After": "1"},
+            )
+
+        client = client_id(scope)
+        endpoint = f"{method} /{scope['path'].strip('/').split('/')[0]}"
+        wait = request_limiter.take((client, endpoint))
+        if not wait and endpoint == "POST /asset":
+            # Reject before the body is read if earlier batches used up the budget
+            wait = asset_limiter.take((client,), 0)
+        if not wait:
+            return None
+
+        increment("admission.rate_limited")
+        logger.warning("Rate limited %s on %s", client, endpoint)
+        return JSONResponse(
+            status_code=429,
+            content={"detail": f"Rate limit exceeded for {endpoint}"},
+            headers={"Retry-After": retry_after(wait)},
+        )
@@ -0,0 +1,273 @@
+"""Response compression and conditional GET support for large payloads
+
+Bodies are identified by the storage tag (epoch and version), so an unchanged
+store yields the same ETag and repeat pulls can be answered with 304 or from
+the cache of pre-compressed bodies. The epoch keeps ETags from a restarted
+process or another snapshot dump from matching.
+
+Concurrent requests for a body that is still being generated are coalesced:
+the first request computes and streams it (off the event loop) and the others
+wait for the finished buffer instead of repeating the work.
+"""
+
+import asyncio
+import logging
+import zlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterator, Callable, Iterable, Iterator
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+
+from backend.src.metrics import increment
+from backend.src.storage import last_modified, storage_tag
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Preferred order when the client accepts several encodings equally
+SUPPORTED_ENCODINGS = [
+    encoding
+    for encoding, available in (
+        ("br", brotli is not None),
+        ("zstd", zstandard is not None),
+        ("gzip", True),
+    )
+    if available
+]
+
+# Compressed bodies for the current storage version, keyed by (etag, encoding)
+_body_cache: dict[tuple[str, str], bytes] = {}
+_cache_version = ""
+
+# Bodies being generated, keyed like the cache; resolve to None on failure
+_inflight: dict[tuple[str, str], asyncio.Future] = {}
+# Running producer tasks (referenced so they are not garbage collected)
+_producers: set[asyncio.Task] = set()
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str:
+    """Pick the best supported content encoding from an Accept-Encoding header"""
+    if not accept_encoding:
+        return "identity"
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = "identity", 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class _Compressor:
+    """Incremental compressor for one response body"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(6, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._obj = brotli.Compressor()
+        elif encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor().compressobj()
+        else:
+            self._obj = None
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self._obj is None:
+            return chunk
+        if self.encoding == "br":
+            return self._obj.process(chunk)
+        return self._obj.compress(chunk)
+
+    def flush(self) -> bytes:
+        if self._obj is None:
+            return b""
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def _compress(
+    chunks: Iterable[bytes], encoding: str, parts: list[bytes]
+) -> Iterator[bytes]:
+    """Compress chunks as they are produced, collecting the output in parts"""
+    compressor = _Compressor(encoding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            parts.append(data)
+            yield data
+    data = compressor.flush()
+    if data:
+        parts.append(data)
+        yield data
+
+
+async def _produce(
+    chunks: Iterable[bytes],
+    encoding: str,
+    cache_key: tuple[str, str],
+    future: asyncio.Future,
+    queue: asyncio.Queue,
+) -> None:
+    """
+    Compress the body in a worker thread, forwarding each piece to the leading
+    response, then cache it and hand it to any coalesced requests. Runs as its
+    own task so it finishes even if the leading client disconnects.
+    """
+    version = _cache_version
+    parts: list[bytes] = []
+    try:
+        async for data in iterate_in_threadpool(_compress(chunks, encoding, parts)):
+            queue.put_nowait(data)
+        body = b"".join(parts)
+        if _cache_version == version:
+            _body_cache[cache_key] = body
+        future.set_result(body)
+    except Exception as e:
+        logger.error("Error generating response body for %s: %s", cache_key[0], e)
+    finally:
+        if not future.done():
+            # Waiters see None and compute their own body
+            future.set_result(None)
+        queue.put_nowait(None)
+        if _inflight.get(cache_key) is future:
+            del _inflight[cache_key]
+
+
+async def _stream(queue: asyncio.Queue, future: asyncio.Future) -> AsyncIterator[bytes]:
+    """Stream body pieces as the producer task makes them available"""
+    while (data := await queue.get()) is not None:
+        yield data
+    if future.result() is None:
+        raise RuntimeError("Response body generation failed")
+
+
+def _opaque_tag(tag: str) -> str:
+    """Strip the weak marker from an entity tag (weak comparison)"""
+    return tag.strip().removeprefix("W/")
+
+
+def _not_modified(request: Request, etag: str, modified: datetime) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against the current version.
+    Entity tags use weak comparison (RFC 9110). HTTP dates only have second
+    resolution and several writes can share a second, so If-Modified-Since only
+    matches when the last write happened before the given second started.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {_opaque_tag(tag) for tag in if_none_match.split(",")}
+        return "*" in tags or _opaque_tag(etag) in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        return modified < since
+    return False
+
+
+def clear_body_cache() -> None:
+    """Drop all cached response bodies"""
+    global _cache_version
+    _body_cache.clear()
+    _inflight.clear()
+    _cache_version = ""
+
+
+async def cached_response(
+    request: Request,
+    key: str,
+    chunks: Callable[[], Iterable[bytes]],
+    media_type: str = "application/json",
+) -> Response:
+    """
+    Serve a body derived from the store with conditional GET support.
+    The body is streamed through the negotiated compressor on the first request
+    for a storage version and served from the cache afterwards. Requests that
+    arrive while it is being generated wait for it instead of recomputing.
+    `chunks` is called on the event loop (snapshot the store there) and
+    iterated in a worker thread.
+    """
+    global _cache_version
+    today = datetime.now(UTC).date()
+    # Asset status depends on the current date, so a new day is a new version
+    version = f"{storage_tag()}-{today.isoformat()}"
+    if version != _cache_version:
+        # Only keep bodies for the latest version
+        _body_cache.clear()
+        _cache_version = version
+    etag = f'W/"{version}-{key}"'
+    midnight = datetime(today.year, today.month, today.day, tzinfo=UTC)
+    modified = max(datetime.fromtimestamp(last_modified(), UTC), midnight)
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(modified, usegmt=True),
+        "Vary": "Accept, Accept-Encoding",
+        "Cache-Control": "no-cache",
+    }
+    if _not_modified(request, etag, modified):
+        return Response(status_code=304, headers=headers)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    cache_key = (etag, encoding)
+    cached = _body_cache.get(cache_key)
+    if cached is not None:
+        increment("response_cache.hits")
+        logger.debug("Serving cached %s body for %s", encoding, etag)
+        return Response(cached, media_type=media_type, headers=headers)
+
+    pending = _inflight.get(cache_key)
+    if pending is not None:
+        # Shielded so a disconnecting waiter does not cancel the shared result
+        body = await asyncio.shield(pending)
+        if body is not None:
+            increment("response_cache.coalesced")
+            logger.debug("Coalesced %s request for %s", encoding, etag)
+            return Response(body, media_type=media_type, headers=headers)
+
+    increment("response_cache.misses")
+    body_chunks = chunks()
+    future = asyncio.get_running_loop().create_future()
+    queue: asyncio.Queue = asyncio.Queue()
+    _inflight[cache_key] = future
+    task = asyncio.create_task(
+        _produce(body_chunks, encoding, cache_key, future, queue)
+    )
+    _producers.add(task)
+    task.add_done_callback(_producers.discard)
+    return StreamingResponse(
+        _stream(queue, future), media_type=media_type, headers=headers
+    )
@@ -0,0 +1,162 @@
+"""Async write-behind ingestion queue
+
+Validated batches are put on a bounded in-process queue and applied in order
+by a single background consumer. When the queue is full, callers get
+IngestQueueFull and should retry later (backpressure).
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator
+
+from backend.config import INGEST_JOB_HISTORY, INGEST_QUEUE_SIZE
+from backend.src.models import AssetInput, IngestJob, JobStatus
+from backend.src.service import store_assets
+
+logger = logging.getLogger(__name__)
+
+# Assets stored between yields to the event loop while applying a batch
+APPLY_CHUNK_SIZE = 1000
+
+_queue: asyncio.Queue | None = None
+# Lock held while a batch is applied, with the loop it was created on
+_lock: tuple[asyncio.AbstractEventLoop, asyncio.Lock] | None = None
+_consumer: asyncio.Task | None = None
+_jobs: OrderedDict[str, IngestJob] = OrderedDict()
+
+
+class IngestQueueFull(Exception):
+    """Raised when the ingestion queue cannot accept more batches"""
+
+
+def get_job(job_id: str) -> IngestJob | None:
+    """Get an ingestion job by id"""
+    return _jobs.get(job_id)
+
+
+def queue_depth() -> int:
+    """Get the number of batches waiting to be applied"""
+    return _queue.qsize() if _queue is not None else 0
+
+
+def _apply_lock() -> asyncio.Lock:
+    """Get the apply lock for the running loop, creating it on first use"""
+    global _lock
+    loop = asyncio.get_running_loop()
+    if _lock is None or _lock[0] is not loop:
+        _lock = (loop, asyncio.Lock())
+    return _lock[1]
+
+
+def _remember(job: IngestJob) -> None:
+    """Track a job, dropping the oldest finished jobs beyond the history limit"""
+    _jobs[job.id] = job
+    while len(_jobs) > INGEST_JOB_HISTORY:
+        oldest_id, oldest = next(iter(_jobs.items()))
+        if oldest.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+            break
+        del _jobs[oldest_id]
+
+
+async def _store_chunks(assets: list[AssetInput]) -> AsyncIterator[dict[str, int]]:
+    """
+    Store a batch in chunks, yielding each chunk's counts and the event loop.
+    Batches are applied one at a time, so concurrent writers queue up instead
+    of each adding a chunk to every turn of the loop.
+    """
+    async with _apply_lock():
+        for start in range(0, len(assets), APPLY_CHUNK_SIZE):
+            yield store_assets(assets[start : start + APPLY_CHUNK_SIZE])
+            await asyncio.sleep(0)
+
+
+async def store_batch(assets: list[AssetInput]) -> dict[str, int]:
+    """
+    Store a synchronous batch in one step, so readers never see part of it.
+    Waits for a batch being applied in chunks to finish first. Returns the
+    number of inserted, updated and unchanged assets.
+    """
+    async with _apply_lock():
+        return store_assets(assets)
+
+
+async def _apply(job: IngestJob, assets: list[AssetInput]) -> None:
+    """Store a batch in chunks, yielding to the event loop between chunks"""
+    job.status = JobStatus.RUNNING
+    try:
+        async for counts in _store_chunks(assets):
+            job.inserted += counts["inserted"]
+            job.updated += counts["updated"]
+            job.unchanged += counts["unchanged"]
+        job.status = JobStatus.COMPLETED
+        logger.info(
+            "Job %s stored %d assets",
+            job.id,
+            job.asset_count,
+            extra={"job_id": job.id, "asset_count": job.asset_count},
+        )
+    except Exception as e:
+        job.status = JobStatus.FAILED
+        job.error = str(e)
+        logger.error("Job %s failed: %s", job.id, e, extra={"job_id": job.id})
+
+
+async def _consume(queue: asyncio.Queue) -> None:
+    """Apply queued batches one at a time, in submission order"""
+    while True:
+        job, assets = await queue.get()
+        try:
+            await _apply(job, assets)
+        finally:
+            queue.task_done()
+
+
+def start_consumer(maxsize: int = INGEST_QUEUE_SIZE) -> None:
+    """Create the queue and start the background consumer on the running loop"""
+    global _queue, _consumer
+    if _consumer is not None and not _consumer.done():
+        return
+    _queue = asyncio.Queue(maxsize=maxsize)
+    _consumer = asyncio.create_task(_consume(_queue))
+    logger.info("Ingestion consumer started (queue size %d)", maxsize)
+
+
+async def stop_consumer() -> None:
+    """Drain queued batches, then stop the consumer"""
+    global _queue, _consumer
+    if _consumer is None:
+        return
+    if not _consumer.done():
+        await _queue.join()
+        _consumer.cancel()
+        try:
+            await _consumer
+        except asyncio.CancelledError:
+            pass
+    _queue, _consumer = None, None
+    logger.info("Ingestion consumer stopped")
+
+
+def enqueue_assets(assets: list[AssetInput]) -> IngestJob:
+    """
+    Queue a validated batch for background storage.
+    Starts the consumer if needed; raises IngestQueueFull when the queue is full.
+    """
+    if _consumer is None or _consumer.done():
+        start_consumer()
+    job = IngestJob(
+        id=uuid.uuid4().hex, status=JobStatus.QUEUED, asset_count=len(assets)
+    )
+    try:
+        _queue.put_nowait((job, assets))
+    except asyncio.QueueFull:
+        raise IngestQueueFull(f"Ingestion queue is full ({_queue.maxsize} batches)")
+    _remember(job)
+    return job
+
+
+def clear_jobs() -> None:
+    """Forget all tracked jobs (useful for testing)"""
+    _jobs.clear()
@@ -0,0 +1,161 @@
+"""Live insight updates for WebSocket subscribers
+
+Storage writes only mark the insights dirty. A single flush task per burst
+waits until the minimum push interval has passed, recomputes the insights
+from one snapshot (in a worker thread) and, if they changed, encodes one
+message that every subscriber sends as is. Subscribers wait on a shared
+future for the next message, so idle connections cost no tasks or timers
+beyond their pending receive, and a subscriber that is slow to send simply
+skips to the latest message.
+
+Messages are JSON objects:
+- {"type": "snapshot", "version": ..., "insights": [...]} on connect
+- {"type": "delta", "version": ..., "insights": [...], "changes": {...}} on
+  updates, where changes maps each insight name to its difference from the
+  previous push (insights hold the absolute values)
+"""
+
+import asyncio
+import json
+import logging
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from backend.config import LIVE_MAX_PUSHES_PER_SECOND
+from backend.src.metrics import increment
+from backend.src.models import Insight
+from backend.src.service import insights_snapshot
+from backend.src.storage import (
+    add_change_listener,
+    remove_change_listener,
+    storage_version,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _values(insights: list[Insight]) -> dict[str, float]:
+    return {insight.name: insight.value for insight in insights}
+
+
+def _encode(message_type: str, version: int, insights: list[Insight], **extra) -> str:
+    return json.dumps(
+        {
+            "type": message_type,
+            "version": version,
+            "insights": [insight.model_dump() for insight in insights],
+            **extra,
+        }
+    )
+
+
+class InsightsBroadcaster:
+    """Debounced insight pushes to any number of WebSocket subscribers"""
+
+    def __init__(self, max_pushes_per_second: float = LIVE_MAX_PUSHES_PER_SECOND):
+        self.interval = 1 / max_pushes_per_second if max_pushes_per_second > 0 else 0
+        self.subscribers = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Resolves to the next encoded update; replaced after every push
+        self._next: asyncio.Future | None = None
+        self._values: dict[str, float] = {}
+        # Encoded snapshot message for new subscribers: (storage version, message)
+        self._snapshot: tuple[int, str] | None = None
+        self._flush_pending = False
+        self._flush_task: asyncio.Task | None = None
+        self._last_push = 0.0
+
+    def _on_change(self) -> None:
+        """Storage listener: schedule one flush per burst of writes"""
+        if self._flush_pending or self._loop is None:
+            return
+        self._flush_pending = True
+        self._loop.call_soon_threadsafe(self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        delay = self._last_push + self.interval - self._loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # Writes from here on schedule the next flush
+        self._flush_pending = False
+        version = storage_version()
+        try:
+            insights = await asyncio.to_thread(insights_snapshot())
+        except Exception as e:
+            logger.error("Error computing live insights: %s", e)
+            return
+        self._last_push = self._loop.time()
+
+        values = _values(insights)
+        if values == self._values:
+            return
+        changes = {
+            name: value - self._values.get(name, 0.0) for name, value in values.items()
+        }
+        changes.update(
+            {name: -value for name, value in self._values.items() if name not in values}
+        )
+        self._values = values
+        message = _encode("delta", version, insights, changes=changes)
+        current, self._next = self._next, self._loop.create_future()
+        current.set_result(message)
+        increment("live.pushes")
+        logger.debug("Pushed insights v%d to %d subscribers", version, self.subscribers)
+
+    def _subscribe(self) -> None:
+        if self.subscribers == 0:
+            self._loop = asyncio.get_running_loop()
+            self._next = self._loop.create_future()
+            add_change_listener(self._on_change)
+        self.subscribers += 1
+
+    def _unsubscribe(self) -> None:
+        self.subscribers -= 1
+        if self.subscribers == 0:
+            remove_change_listener(self._on_change)
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+            self._flush_pending = False
+            self._values = {}
+            self._snapshot = None
+
+    def _snapshot_message(self) -> str:
+        """Encoded current insights, computed once per storage version"""
+        version = storage_version()
+        if self._snapshot is None or self._snapshot[0] != version:
+            insights = insights_snapshot()()
+            if not self._values:
+                self._values = _values(insights)
+            self._snapshot = (version, _encode("snapshot", version, insights))
+        return self._snapshot[1]
+
+    async def serve(self, websocket: WebSocket) -> None:
+        """Send the current insights, then every update until the client leaves"""
+        self._subscribe()
+        receiver = asyncio.ensure_future(websocket.receive())
+        try:
+            update = self._next
+            await websocket.send_text(self._snapshot_message())
+            while True:
+                done, _ = await asyncio.wait(
+                    (receiver, update), return_when=asyncio.FIRST_COMPLETED
+                )
+                if receiver in done:
+                    if receiver.result()["type"] == "websocket.disconnect":
+                        return
+                    # Messages from the client are ignored
+                    receiver = asyncio.ensure_future(websocket.receive())
+                    continue
+                message, update = update.result(), self._next
+                await websocket.send_text(message)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            receiver.cancel()
+            self._unsubscribe()
+
+
+live_insights = InsightsBroadcaster()
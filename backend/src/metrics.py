@@ -0,0 +1,31 @@
+"""In-process counters exposed on GET /metrics"""
+
+from collections import Counter
+
+_counters: Counter[str] = Counter()
+
+
+def increment(name: str, value: int = 1) -> None:
+    """Increase a counter"""
+    _counters[name] += value
+
+
+def get_counter(name: str) -> int:
+    """Get the current value of a counter"""
+    return _counters[name]
+
+
+def ratio(numerator: str, *names: str) -> float:
+    """Share of numerator among the given counters (0 when all are zero)"""
+    total = sum(_counters[name] for name in names)
+    return _counters[numerator] / total if total else 0.0
+
+
+def snapshot() -> dict[str, int]:
+    """Get all counters"""
+    return dict(sorted(_counters.items()))
+
+
+def reset_metrics() -> None:
+    """Reset all counters (useful for testing)"""
+    _counters.clear()
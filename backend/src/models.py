@@ -1,8 +1,13 @@
-"""Pydantic models for asset management and insights"""
+"""Pydantic models for asset management and insights
+
+Models use defer_build so validators and schemas are built on first use
+instead of at import time. Models used directly as FastAPI body parameters
+are built eagerly, since FastAPI does not support deferred body models.
+"""
 
 from enum import Enum
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AssetStatus(str, Enum):
@@ -12,6 +17,15 @@ class AssetStatus(str, Enum):
     DEFAULTED = "defaulted"
 
 
+class JobStatus(str, Enum):
+    """Async ingestion job status enumeration"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class AssetInput(BaseModel):
     """Asset input model for POST requests"""
 
@@ -21,6 +35,7 @@ class AssetInput(BaseModel):
     interest_rate: float
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "id": "id-1",
@@ -28,7 +43,7 @@ class AssetInput(BaseModel):
                 "due_date": "2025-12-04",
                 "interest_rate": 0.03,
             }
-        }
+        },
     )
 
 
@@ -41,6 +56,7 @@ class AssetOutput(BaseModel):
     due_date: str
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "id": "id-1",
@@ -48,7 +64,7 @@ class AssetOutput(BaseModel):
                 "status": "active",
                 "due_date": "2025-12-04",
             }
-        }
+        },
     )
 
 
@@ -61,6 +77,7 @@ class AssetData(BaseModel):
     interest_rate: float
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "id": "id-1",
@@ -68,7 +85,7 @@ class AssetData(BaseModel):
                 "due_date": "2025-12-04",
                 "interest_rate": 0.03,
             }
-        }
+        },
     )
 
 
@@ -80,11 +97,265 @@ class Insight(BaseModel):
     value: float
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "id": "id-1",
                 "name": "average_interest_rate",
                 "value": 0.04,
             }
+        },
+    )
+
+
+class AssetUpdate(BaseModel):
+    """Partial asset update model for PATCH requests"""
+
+    nominal_value: float | None = None
+    due_date: str | None = None  # Format: YYYY-MM-DD
+    interest_rate: float | None = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "nominal_value": 120.0,
+                "interest_rate": 0.04,
+            }
+        }
+    )
+
+
+class AssetLookup(BaseModel):
+    """Batch lookup request model for POST /asset/lookup"""
+
+    ids: list[str]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "ids": ["id-1", "id-2"],
+            }
         }
     )
+
+
+class AssetLookupResult(BaseModel):
+    """Batch lookup response model"""
+
+    assets: list[AssetOutput]
+    missing: list[str]
+
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
+            "example": {
+                "assets": [
+                    {
+                        "id": "id-1",
+                        "nominal_value": 100.0,
+                        "status": "active",
+                        "due_date": "2025-12-04",
+                    }
+                ],
+                "missing": ["id-2"],
+            }
+        },
+    )
+
+
+class IngestJob(BaseModel):
+    """Async ingestion job model for POST /asset?mode=async and GET /jobs/{id}"""
+
+    id: str
+    status: JobStatus
+    asset_count: int
+    # Assets applied so far, by outcome
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    error: str | None = None
+
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
+            "example": {
+                "id": "3f2b9c1e8a7d4e5f9a0b1c2d3e4f5a6b",
+                "status": "completed",
+                "asset_count": 1000,
+                "inserted": 10,
+                "updated": 0,
+                "unchanged": 990,
+                "error": None,
+            }
+        },
+    )
+
+
+class ScenarioShock(BaseModel):
+    """
+    One transform in a what-if scenario, applied to the assets matching its
+    optional filters (status, due within the next N days)
+    """
+
+    rate_shift: float = 0.0  # Added to interest rates (0.005 = +50bp)
+    due_date_shift_days: int = 0
+    haircut: float = 0.0  # Fraction of nominal value written off (0-1)
+    status: AssetStatus | None = None
+    due_within_days: int | None = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "haircut": 1.0,
+                "due_within_days": 30,
+            }
+        }
+    )
+
+
+class Scenario(BaseModel):
+    """Named sequence of shocks, applied in order"""
+
+    id: str
+    shocks: list[ScenarioShock]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "id": "rates-up-50bp",
+                "shocks": [{"rate_shift": 0.005}],
+            }
+        }
+    )
+
+
+class ScenarioRequest(BaseModel):
+    """Batch of scenarios for POST /insights/scenario"""
+
+    scenarios: list[Scenario]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "scenarios": [
+                    {"id": "rates-up-50bp", "shocks": [{"rate_shift": 0.005}]},
+                    {
+                        "id": "short-dated-default",
+                        "shocks": [{"haircut": 1.0, "due_within_days": 30}],
+                    },
+                ]
+            }
+        }
+    )
+
+
+class ScenarioResult(BaseModel):
+    """Insights for one scenario"""
+
+    id: str
+    insights: list[Insight]
+
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
+            "example": {
+                "id": "rates-up-50bp",
+                "insights": [
+                    {
+                        "id": "insight-1",
+                        "name": "total_nominal_value",
+                        "value": 110.0,
+                    },
+                    {
+                        "id": "insight-2",
+                        "name": "average_interest_rate",
+                        "value": 0.07,
+                    },
+                ],
+            }
+        },
+    )
+
+
+class Dashboard(BaseModel):
+    """Dashboard model for GET /dashboard: first page of assets and aggregates"""
+
+    assets: list[AssetOutput]
+    insights: list[Insight]
+    status_counts: dict[AssetStatus, int]
+    total: int
+
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
+            "example": {
+                "assets": [
+                    {
+                        "id": "id-1",
+                        "nominal_value": 100.0,
+                        "status": "active",
+                        "due_date": "2025-12-04",
+                    }
+                ],
+                "insights": [
+                    {
+                        "id": "insight-1",
+                        "name": "total_nominal_value",
+                        "value": 100.0,
+                    },
+                    {
+                        "id": "insight-2",
+                        "name": "average_interest_rate",
+                        "value": 0.03,
+                    },
+                ],
+                "status_counts": {"active": 1, "defaulted": 0},
+                "total": 1,
+            }
+        },
+    )
+
+
+class SnapshotInfo(BaseModel):
+    """Snapshot file model for POST /snapshot"""
+
+    path: str
+    asset_count: int
+    size_bytes: int
+
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
+            "example": {
+                "path": "assets.snapshot",
+                "asset_count": 1000,
+                "size_bytes": 40960,
+            }
+        },
+    )
+
+
+class RuleSet(BaseModel):
+    """
+    Per-tenant validation rules, checked on top of the base rules
+    (non-negative nominal value, 0-1 interest rate, valid date, unique ids)
+    """
+
+    max_nominal_value: float | None = None
+    min_maturity_days: int | None = None  # Days from today; negative allows past
+    max_maturity_days: int | None = None
+    # Glob (*, ?, [seq], [!seq]) the whole id must match, case-sensitively
+    id_glob: str | None = Field(None, max_length=256)
+
+    model_config = ConfigDict(
+        # Unknown keys fail instead of being dropped
+        extra="forbid",
+        json_schema_extra={
+            "example": {
+                "max_nominal_value": 1000000.0,
+                "min_maturity_days": 0,
+                "max_maturity_days": 3650,
+                "id_glob": "[A-Z][A-Z]-*",
+            }
+        },
+    )
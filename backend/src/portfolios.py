@@ -0,0 +1,142 @@
+"""In-memory storage for per-tenant portfolios
+
+Each portfolio is an isolated book with its own columnar store and running
+aggregates (nominal sum, interest rate sum, count), updated on every write so
+insights are read in O(1) instead of scanning the book. Portfolios are meant
+to be small and numerous: each one is a single unsharded columnar shard plus a
+few numbers, and due date strings are shared with the main store.
+
+Adjusting float sums by differences accumulates rounding drift, so the sums
+are recomputed exactly (math.fsum) after as many writes as the book has rows,
+at least RESUM_WRITES: O(1) per write amortized. Taking out a value much
+larger than what remains (CANCEL_RATIO) cancels the sum's significant bits and
+exposes the error at once, so such writes recompute the sums immediately.
+
+Portfolios live alongside the main store (GET /asset) and are not included in
+snapshot files.
+"""
+
+import math
+
+from backend.src.models import AssetData
+from backend.src.storage import PutResult, Shard, ShardColumns
+
+# Minimum number of writes between exact recomputations of the running sums
+RESUM_WRITES = 1024
+# Removing a value this many times larger than the remaining sum recomputes it
+CANCEL_RATIO = 1024
+
+
+def _cancels(removed: float, total: float) -> bool:
+    """Whether taking a value out of a sum lost most of the remainder's bits"""
+    return not math.isfinite(removed) or abs(removed) > CANCEL_RATIO * abs(total)
+
+
+class Portfolio:
+    """One tenant's assets and their running aggregates"""
+
+    __slots__ = ("shard", "nominal_sum", "rate_sum", "_writes")
+
+    def __init__(self):
+        self.shard = Shard()
+        self.nominal_sum = 0.0
+        self.rate_sum = 0.0
+        # Writes since the sums were last recomputed
+        self._writes = 0
+
+    def __len__(self) -> int:
+        return len(self.shard)
+
+    def _touch(self, removed: tuple[float, float] | None = None) -> None:
+        """Count a write that took the (nominal, rate) of `removed` out of the sums"""
+        self._writes += 1
+        if not self.shard:
+            # Drop rounding drift whenever the book empties
+            self.nominal_sum = self.rate_sum = 0.0
+            self._writes = 0
+        elif self._writes >= max(len(self.shard), RESUM_WRITES) or (
+            removed is not None
+            and (
+                _cancels(removed[0], self.nominal_sum)
+                or _cancels(removed[1], self.rate_sum)
+            )
+        ):
+            self._resum()
+
+    def _resum(self) -> None:
+        """Recompute the running sums exactly from the rows"""
+        self.nominal_sum = math.fsum(self.shard.nominal_values)
+        self.rate_sum = math.fsum(self.shard.interest_rates)
+        self._writes = 0
+
+    def put(self, asset_data: AssetData) -> PutResult:
+        """Store or update an asset, adjusting the aggregates by the difference"""
+        shard = self.shard
+        row = shard.index.get(asset_data.id)
+        removed = None
+        if row is not None:
+            removed = shard.nominal_values[row], shard.interest_rates[row]
+        result = shard.put(asset_data)
+        if result is PutResult.UNCHANGED:
+            return result
+        if removed is not None:
+            self.nominal_sum -= removed[0]
+            self.rate_sum -= removed[1]
+        self.nominal_sum += asset_data.nominal_value
+        self.rate_sum += asset_data.interest_rate
+        self._touch(removed)
+        return result
+
+    def get(self, asset_id: str) -> AssetData | None:
+        return self.shard.get(asset_id)
+
+    def remove(self, asset_id: str) -> bool:
+        """Delete an asset; returns False if it did not exist"""
+        shard = self.shard
+        row = shard.index.get(asset_id)
+        if row is None:
+            return False
+        removed = shard.nominal_values[row], shard.interest_rates[row]
+        self.nominal_sum -= removed[0]
+        self.rate_sum -= removed[1]
+        shard.remove(asset_id)
+        self._touch(removed)
+        return True
+
+    def summary(self) -> tuple[float, float, int]:
+        """Current (nominal sum, interest rate sum, count), without a scan"""
+        return self.nominal_sum, self.rate_sum, len(self.shard)
+
+    def snapshot(self) -> ShardColumns:
+        return self.shard.snapshot()
+
+
+_portfolios: dict[str, Portfolio] = {}
+
+
+def get_portfolio(portfolio_id: str) -> Portfolio | None:
+    """Get a portfolio, or None if it has no assets yet"""
+    return _portfolios.get(portfolio_id)
+
+
+def get_or_create_portfolio(portfolio_id: str) -> Portfolio:
+    """Get a portfolio, creating an empty one on first write"""
+    portfolio = _portfolios.get(portfolio_id)
+    if portfolio is None:
+        portfolio = _portfolios[portfolio_id] = Portfolio()
+    return portfolio
+
+
+def delete_portfolio(portfolio_id: str) -> bool:
+    """Delete a portfolio and all its assets; returns False if it did not exist"""
+    return _portfolios.pop(portfolio_id, None) is not None
+
+
+def portfolio_count() -> int:
+    """Get the number of portfolios"""
+    return len(_portfolios)
+
+
+def clear_portfolios() -> None:
+    """Delete every portfolio (useful for testing)"""
+    _portfolios.clear()
@@ -0,0 +1,77 @@
+"""Readiness tracking and startup warmup
+
+/health only reports that the process is up; /ready reports whether the
+startup warmup (validators, schemas, storage) has finished.
+"""
+
+import logging
+import time
+
+from fastapi import FastAPI
+
+from backend.src.models import (
+    AssetData,
+    AssetInput,
+    AssetLookup,
+    AssetLookupResult,
+    AssetOutput,
+    AssetUpdate,
+    Dashboard,
+    IngestJob,
+    Insight,
+    ScenarioResult,
+    SnapshotInfo,
+)
+from backend.src.service import calculate_insights
+
+logger = logging.getLogger(__name__)
+
+_ready = False
+_warmup_seconds: float | None = None
+
+
+def is_ready() -> bool:
+    """Check whether startup warmup has finished"""
+    return _ready
+
+
+def warmup_seconds() -> float | None:
+    """Get the duration of the last warmup, if it finished"""
+    return _warmup_seconds
+
+
+def reset_readiness() -> None:
+    """Mark the app as not ready (useful for testing)"""
+    global _ready, _warmup_seconds
+    _ready = False
+    _warmup_seconds = None
+
+
+def warmup(app: FastAPI) -> None:
+    """
+    Run deferred startup work and mark the app ready.
+    Builds the deferred pydantic validators, the OpenAPI schema and a first
+    aggregation so the first real requests do not pay for it.
+    """
+    global _ready, _warmup_seconds
+    start = time.perf_counter()
+    for model in (
+        AssetData,
+        AssetInput,
+        AssetLookup,
+        AssetLookupResult,
+        AssetOutput,
+        AssetUpdate,
+        Dashboard,
+        IngestJob,
+        Insight,
+        ScenarioResult,
+        SnapshotInfo,
+    ):
+        model.model_rebuild()
+    app.openapi()
+    calculate_insights()
+
+    _warmup_seconds = time.perf_counter() - start
+    _ready = True
+    logger.info("Warmup finished in %.1f ms", _warmup_seconds * 1000)
@@ -1,74 +1,593 @@
 """FastAPI routes and endpoint handlers"""
 
+import asyncio
 import logging
+from functools import cache
+from typing import Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter, ValidationError
 
-from backend.src.models import AssetData, AssetInput, AssetOutput, Insight
+from backend.config import SNAPSHOT_PATH
+from backend.src import wire
+from backend.src.admission import charge_assets, client_id, retry_after
+from backend.src.http_cache import cached_response
+from backend.src.ingest import (
+    IngestQueueFull,
+    enqueue_assets,
+    get_job,
+    store_batch,
+)
+from backend.src.models import (
+    AssetInput,
+    AssetLookup,
+    AssetLookupResult,
+    AssetOutput,
+    AssetStatus,
+    AssetUpdate,
+    Dashboard,
+    IngestJob,
+    Insight,
+    RuleSet,
+    ScenarioRequest,
+    ScenarioResult,
+    SnapshotInfo,
+)
+from backend.src.live import live_insights
+from backend.src.portfolios import delete_portfolio, get_portfolio
+from backend.src.readiness import is_ready
+from backend.src.rules import DEFAULT_TENANT, get_rules, set_rules
+from backend.src.metrics import ratio, snapshot
 from backend.src.service import (
-    calculate_insights,
+    iter_asset_columns,
+    iter_assets_json,
+    iter_dashboard_json,
+    iter_insights_json,
+    list_portfolio_assets,
+    lookup_assets,
+    portfolio_insights,
     prepare_asset_output,
+    scenarios_snapshot,
+    search_assets,
+    start_search_index_build,
+    store_portfolio_assets,
+    update_asset,
     validate_assets_input,
+    validate_scenarios,
+)
+from backend.src.search import MIN_QUERY_LENGTH
+from backend.src.snapshot import dump_snapshot
+from backend.src.storage import (
+    asset_count,
+    delete_asset,
+    get_asset,
+    get_shard_columns,
+    is_read_only,
 )
-from backend.src.storage import get_all_assets, store_asset
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Request body documentation for endpoints that parse the body themselves.
+# AssetInput is registered in the OpenAPI components by backend.main.
+_ASSETS_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            media_type: {
+                "schema": {
+                    "type": "array",
+                    "items": {"$ref": "#/components/schemas/AssetInput"},
+                }
+            }
+            for media_type in wire.SUPPORTED_FORMATS
+        },
+    }
+}
+
+
+@cache
+def _assets_adapter() -> TypeAdapter:
+    """Validator for a list of assets, built on first use"""
+    return TypeAdapter(list[AssetInput])
+
+
+async def read_assets_body(request: Request) -> list[AssetInput]:
+    """
+    Parse a list of assets from the request body.
+    JSON, MessagePack and Arrow IPC (if installed) are selected by Content-Type.
+    """
+    try:
+        fmt = wire.request_format(request.headers.get("content-type"))
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    body = await request.body()
+    try:
+        if fmt == wire.JSON:
+            return _assets_adapter().validate_json(body)
+        return _assets_adapter().validate_python(wire.decode_rows(body, fmt))
+    except ValidationError as e:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def tenant_id(tenant: str = Header(DEFAULT_TENANT, alias="X-Tenant-ID")) -> str:
+    """Tenant whose validation rules apply to a write (X-Tenant-ID header)"""
+    return tenant
+
+
+def require_writable() -> None:
+    """Reject writes while serving a read-only snapshot"""
+    if is_read_only():
+        raise HTTPException(status_code=403, detail="Store is read-only")
 
-@router.post("/asset")
-async def create_assets(assets: list[AssetInput]):
+
+async def admit_assets(
+    request: Request, assets: list[AssetInput] = Depends(read_assets_body)
+) -> list[AssetInput]:
+    """Charge the client's asset rate limit by batch size (429 when exhausted)"""
+    wait = charge_assets(client_id(request.scope), len(assets))
+    if wait:
+        logger.warning("Rate limited batch of %d assets", len(assets))
+        raise HTTPException(
+            status_code=429,
+            detail="Asset rate limit exceeded",
+            headers={"Retry-After": retry_after(wait)},
+        )
+    return assets
+
+
+@router.post(
+    "/asset",
+    openapi_extra=_ASSETS_BODY,
+    dependencies=[Depends(require_writable)],
+)
+async def create_assets(
+    assets: list[AssetInput] = Depends(admit_assets),
+    mode: Literal["sync", "async"] = "sync",
+    tenant: str = Depends(tenant_id),
+):
     """
     Create or update assets.
     Accepts a list of assets and stores them in memory.
+    The body can be JSON, MessagePack or Arrow IPC (rows or columns).
+    The batch is checked against the rules of the X-Tenant-ID tenant and
+    every violation is reported in the 400 detail.
+    The response counts inserted, updated and unchanged assets; assets
+    identical to the stored ones are not written.
+    A synchronous batch is applied in one step, so reads see all of it or
+    none of it. With mode=async the validated batch is queued and 202 is
+    returned with a job id; poll GET /jobs/{job_id} for completion. Queued
+    batches are applied in chunks, so reads can see part of one.
     """
     try:
-        validate_assets_input(assets)
+        validate_assets_input(assets, tenant)
 
-        for asset in assets:
-            asset_data = AssetData(**asset.model_dump())
-            store_asset(asset.id, asset_data)
+        if mode == "async":
+            job = enqueue_assets(assets)
+            logger.info(
+                "Queued %d assets as job %s",
+                len(assets),
+                job.id,
+                extra={"job_id": job.id, "asset_count": len(assets)},
+            )
+            return JSONResponse(
+                status_code=202,
+                content=job.model_dump(mode="json"),
+                headers={"Location": f"/jobs/{job.id}"},
+            )
 
-        logger.info(f"Successfully created/updated {len(assets)} assets")
-        return {"message": f"Successfully created/updated {len(assets)} assets"}
+        # Applied in one step; mode=async applies in chunks instead
+        counts = await store_batch(assets)
+
+        logger.info(
+            "Successfully created/updated %d assets (%d unchanged)",
+            len(assets),
+            counts["unchanged"],
+            extra={"asset_count": len(assets)},
+        )
+        return {
+            "message": f"Successfully created/updated {len(assets)} assets",
+            **counts,
+        }
     except ValueError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
+    except IngestQueueFull as e:
+        logger.warning("Rejected batch: %s", e)
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "1"}
+        )
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/asset")
-async def get_assets() -> list[AssetOutput]:
+@router.get("/asset", response_model=list[AssetOutput])
+async def get_assets(request: Request, status: AssetStatus | None = None) -> Response:
     """
     Retrieve all assets with their current status.
     Status is determined based on due date compared to today (UTC).
+    Optionally filtered by status.
+    Supports gzip/br/zstd compression and conditional GET (ETag/Last-Modified).
+    Columnar MessagePack or Arrow IPC is returned when requested via Accept.
+    """
+    try:
+        fmt = wire.negotiate_format(request.headers.get("accept"))
+        key = f"asset:{status.value if status else 'all'}:{fmt}"
+        if fmt == wire.JSON:
+            response = await cached_response(
+                request, key, lambda: iter_assets_json(status)
+            )
+        else:
+            response = await cached_response(
+                request,
+                key,
+                lambda: (
+                    wire.encode_columns(columns, fmt)
+                    for columns in iter_asset_columns(status)
+                ),
+                media_type=fmt,
+            )
+        logger.info("Retrieved assets (status code %d)", response.status_code)
+        return response
+    except Exception as e:
+        logger.error("Error retrieving assets: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/asset/lookup")
+async def lookup_assets_batch(lookup: AssetLookup) -> AssetLookupResult:
+    """
+    Retrieve many assets by id in one request.
+    Ids that do not exist are reported in `missing`.
     """
     try:
-        result = [prepare_asset_output(asset_data) for asset_data in get_all_assets()]
-        logger.info(f"Retrieved {len(result)} assets")
+        result = lookup_assets(lookup.ids)
+        logger.info(
+            "Looked up %d assets, %d missing", len(lookup.ids), len(result.missing)
+        )
         return result
+    except ValueError as e:
+        logger.error("Validation error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Error looking up assets: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/asset/search")
+async def search_assets_by_id(q: str, limit: int = 20) -> list[AssetOutput]:
+    """
+    Find assets whose id contains `q` (at least 2 characters; 2-character
+    queries match id prefixes). Returns up to `limit` assets: prefix matches
+    first, then other matches, shorter ids first within each.
+    Served by a trigram index built in the background; until it is ready
+    (after startup, a clear or a snapshot load) every id is scanned.
+    """
+    if len(q) < MIN_QUERY_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"q must be at least {MIN_QUERY_LENGTH} characters",
+        )
+    if limit < 1 or limit > 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+    try:
+        start_search_index_build()
+        return search_assets(q, limit)
+    except Exception as e:
+        logger.error("Error searching assets: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/asset/{asset_id}")
+async def get_asset_by_id(asset_id: str) -> AssetOutput:
+    """Retrieve a single asset with its current status"""
+    try:
+        asset_data = get_asset(asset_id)
+    except Exception as e:
+        logger.error("Error retrieving asset %s: %s", asset_id, e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+    if asset_data is None:
+        raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
+    return prepare_asset_output(asset_data)
+
+
+@router.patch("/asset/{asset_id}", dependencies=[Depends(require_writable)])
+async def patch_asset(
+    asset_id: str, update: AssetUpdate, tenant: str = Depends(tenant_id)
+) -> AssetOutput:
+    """
+    Partially update a single asset.
+    Only the provided fields are changed; the result is validated like POST /asset.
+    """
+    try:
+        asset_data = update_asset(asset_id, update, tenant)
+    except ValueError as e:
+        logger.error("Validation error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Error updating asset %s: %s", asset_id, e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+    if asset_data is None:
+        raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
+    logger.info("Updated asset %s", asset_id)
+    return prepare_asset_output(asset_data)
+
+
+@router.delete("/asset/{asset_id}", dependencies=[Depends(require_writable)])
+async def remove_asset(asset_id: str):
+    """Delete a single asset"""
+    try:
+        deleted = delete_asset(asset_id)
     except Exception as e:
-        logger.error(f"Error retrieving assets: {e}")
+        logger.error("Error deleting asset %s: %s", asset_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
+    logger.info("Deleted asset %s", asset_id)
+    return {"message": f"Successfully deleted asset {asset_id}"}
 
 
-@router.get("/insights")
-async def get_insights() -> list[Insight]:
+@router.post(
+    "/portfolios/{portfolio_id}/asset",
+    openapi_extra=_ASSETS_BODY,
+    dependencies=[Depends(require_writable)],
+)
+async def create_portfolio_assets(
+    portfolio_id: str, assets: list[AssetInput] = Depends(admit_assets)
+):
+    """
+    Create or update assets in a portfolio, creating the portfolio on first use.
+    The batch is validated with the portfolio's rules (the portfolio id is the
+    tenant for GET/PUT /rules/{tenant}).
+    """
+    try:
+        validate_assets_input(assets, portfolio_id)
+        counts = store_portfolio_assets(portfolio_id, assets)
+    except ValueError as e:
+        logger.error("Validation error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Unexpected error: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+    logger.info(
+        "Successfully created/updated %d assets in portfolio %s (%d unchanged)",
+        len(assets),
+        portfolio_id,
+        counts["unchanged"],
+        extra={"asset_count": len(assets)},
+    )
+    return {
+        "message": f"Successfully created/updated {len(assets)} assets",
+        **counts,
+    }
+
+
+@router.get("/portfolios/{portfolio_id}/asset")
+async def get_portfolio_assets(
+    portfolio_id: str, status: AssetStatus | None = None
+) -> list[AssetOutput]:
+    """Retrieve a portfolio's assets with their current status"""
+    assets = list_portfolio_assets(portfolio_id, status)
+    if assets is None:
+        raise HTTPException(
+            status_code=404, detail=f"Portfolio {portfolio_id} not found"
+        )
+    return assets
+
+
+@router.get("/portfolios/{portfolio_id}/asset/{asset_id}")
+async def get_portfolio_asset(portfolio_id: str, asset_id: str) -> AssetOutput:
+    """Retrieve a single asset of a portfolio"""
+    portfolio = get_portfolio(portfolio_id)
+    asset_data = portfolio.get(asset_id) if portfolio is not None else None
+    if asset_data is None:
+        raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
+    return prepare_asset_output(asset_data)
+
+
+@router.delete(
+    "/portfolios/{portfolio_id}/asset/{asset_id}",
+    dependencies=[Depends(require_writable)],
+)
+async def remove_portfolio_asset(portfolio_id: str, asset_id: str):
+    """Delete a single asset of a portfolio"""
+    portfolio = get_portfolio(portfolio_id)
+    if portfolio is None or not portfolio.remove(asset_id):
+        raise HTTPException(status_code=404, detail=f"Asset {asset_id} not found")
+    logger.info("Deleted asset %s from portfolio %s", asset_id, portfolio_id)
+    return {"message": f"Successfully deleted asset {asset_id}"}
+
+
+@router.get("/portfolios/{portfolio_id}/insights")
+async def get_portfolio_insights(portfolio_id: str) -> list[Insight]:
+    """
+    Insights for one portfolio.
+    Served from aggregates maintained on every write, so the cost does not
+    depend on the portfolio's size.
+    """
+    insights = portfolio_insights(portfolio_id)
+    if insights is None:
+        raise HTTPException(
+            status_code=404, detail=f"Portfolio {portfolio_id} not found"
+        )
+    return insights
+
+
+@router.delete("/portfolios/{portfolio_id}", dependencies=[Depends(require_writable)])
+async def remove_portfolio(portfolio_id: str):
+    """Delete a portfolio and all its assets"""
+    if not delete_portfolio(portfolio_id):
+        raise HTTPException(
+            status_code=404, detail=f"Portfolio {portfolio_id} not found"
+        )
+    logger.info("Deleted portfolio %s", portfolio_id)
+    return {"message": f"Successfully deleted portfolio {portfolio_id}"}
+
+
+@router.get("/rules/{tenant}")
+async def get_validation_rules(tenant: str) -> RuleSet:
+    """Get the validation rules applied to a tenant's writes"""
+    return get_rules(tenant)
+
+
+@router.put("/rules/{tenant}")
+async def put_validation_rules(tenant: str, rules: RuleSet) -> RuleSet:
+    """
+    Replace a tenant's validation rules (value cap, allowed maturity range in
+    days from today, id pattern). The "default" tenant's rules apply to
+    tenants without their own.
+    """
+    try:
+        set_rules(tenant, rules)
+    except ValueError as e:
+        logger.error("Validation error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    return rules
+
+
+@router.get("/jobs/{job_id}")
+async def get_ingest_job(job_id: str) -> IngestJob:
+    """Get the status of an async ingestion job"""
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.get("/insights", response_model=list[Insight])
+async def get_insights(request: Request) -> Response:
     """
     Generate insights from the current asset portfolio.
     Calculates metrics like average interest rate and total nominal value.
+    Cached per storage version like GET /asset.
     """
     try:
-        return calculate_insights()
+        return await cached_response(request, "insights", iter_insights_json)
     except Exception as e:
-        logger.error(f"Error generating insights: {e}")
+        logger.error("Error generating insights: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.websocket("/ws/insights")
+async def insights_updates(websocket: WebSocket):
+    """
+    Push the insights on connect and again whenever writes change them, at
+    most LIVE_MAX_PUSHES_PER_SECOND times per second.
+    """
+    await websocket.accept()
+    await live_insights.serve(websocket)
+
+
+@router.get("/dashboard", response_model=Dashboard)
+async def get_dashboard(request: Request, limit: int = 50) -> Response:
+    """
+    Retrieve the data for the dashboard page in one request: the first `limit`
+    assets (by id), the insights and the number of assets per status, all from
+    the same storage snapshot. Cached per storage version like GET /asset.
+    """
+    if limit < 1 or limit > 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+    try:
+        return await cached_response(
+            request, f"dashboard:{limit}", lambda: iter_dashboard_json(limit)
+        )
+    except Exception as e:
+        logger.error("Error building dashboard: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/insights/scenario")
+async def get_scenario_insights(request: ScenarioRequest) -> list[ScenarioResult]:
+    """
+    Calculate insights under what-if scenarios without changing stored assets.
+    Each scenario applies its shocks in order: interest rate shifts, due date
+    shifts and nominal value haircuts, optionally limited to assets with a
+    given status or due within the next N days.
+    The store is snapshotted on the event loop and the scenarios are evaluated
+    in a worker thread (on the aggregation process pool when enabled).
+    """
+    try:
+        validate_scenarios(request.scenarios)
+        evaluate = scenarios_snapshot(request.scenarios)
+        return await asyncio.to_thread(evaluate)
+    except ValueError as e:
+        logger.error("Validation error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Error evaluating scenarios: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/snapshot", dependencies=[Depends(require_writable)])
+async def create_snapshot() -> SnapshotInfo:
+    """
+    Dump the current store to the columnar snapshot file at SNAPSHOT_PATH.
+    Read-only replicas (READ_ONLY=true) map this file at startup.
+    """
+    try:
+        columns = get_shard_columns()
+        count = asset_count()
+        size = await asyncio.to_thread(dump_snapshot, SNAPSHOT_PATH, columns)
+    except Exception as e:
+        logger.error("Error writing snapshot: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+    logger.info("Wrote snapshot of %d assets to %s", count, SNAPSHOT_PATH)
+    return SnapshotInfo(path=SNAPSHOT_PATH, asset_count=count, size_bytes=size)
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """In-process counters, including response cache hit and coalescing rates"""
+    return {
+        "counters": snapshot(),
+        "response_cache_hit_rate": ratio(
+            "response_cache.hits",
+            "response_cache.hits",
+            "response_cache.coalesced",
+            "response_cache.misses",
+        ),
+        "response_cache_coalesced_rate": ratio(
+            "response_cache.coalesced",
+            "response_cache.hits",
+            "response_cache.coalesced",
+            "response_cache.misses",
+        ),
+    }
+
+
 @router.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (liveness)"""
     return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness_check(response: Response):
+    """
+    Readiness endpoint.
+    Returns 503 until the startup warmup has finished.
+    """
+    if not is_ready():
+        response.status_code = 503
+        return {"status": "starting"}
+    return {"status": "ready"}
@@ -0,0 +1,226 @@
+"""Validation rules engine
+
+Rule sets are compiled into a list of column checks. Each check scans one
+column of a batch and yields (row, message) for every failing row, so a batch
+reports all of its violations in one pass instead of stopping at the first.
+The base checks (non-negative nominal value, 0-1 interest rate, date format,
+unique ids) always apply; tenants can add value caps, allowed maturities and
+an id glob. Compiled checkers are cached per tenant until its rules change.
+
+Id rules are globs rather than regular expressions: rules are set over HTTP
+and run on the event loop, and fnmatch compiles globs to patterns that match
+in linear time, so no rule can make validation backtrack catastrophically.
+"""
+
+import fnmatch
+import json
+import logging
+import re
+from datetime import UTC, datetime
+from typing import Callable, Iterator, NamedTuple
+
+from backend.config import VALIDATION_RULES
+from backend.src.models import AssetInput, RuleSet
+
+logger = logging.getLogger(__name__)
+
+# Rules for tenants without their own rule set
+DEFAULT_TENANT = "default"
+
+
+class BatchColumns(NamedTuple):
+    """Columns of an input batch; due_ordinals is None for invalid dates"""
+
+    ids: list[str]
+    nominal_values: list[float]
+    due_dates: list[str]
+    interest_rates: list[float]
+    due_ordinals: list[int | None]
+
+
+Check = Callable[[BatchColumns, int], Iterator[tuple[int, str]]]
+
+
+def _parse_dates(due_dates: list[str]) -> list[int | None]:
+    """Day ordinals for a column of dates, parsing each distinct date once"""
+    parsed: dict[str, int | None] = {}
+    for due_date in due_dates:
+        if due_date not in parsed:
+            try:
+                ordinal = datetime.strptime(due_date, "%Y-%m-%d").toordinal()
+            except ValueError:
+                ordinal = None
+            parsed[due_date] = ordinal
+    return [parsed[due_date] for due_date in due_dates]
+
+
+def batch_columns(assets: list[AssetInput]) -> BatchColumns:
+    """Split input assets into columns"""
+    due_dates = [asset.due_date for asset in assets]
+    return BatchColumns(
+        [asset.id for asset in assets],
+        [asset.nominal_value for asset in assets],
+        due_dates,
+        [asset.interest_rate for asset in assets],
+        _parse_dates(due_dates),
+    )
+
+
+def _check_nominal_value(columns: BatchColumns, today: int):
+    for row, value in enumerate(columns.nominal_values):
+        if value < 0:
+            yield row, f"Asset {columns.ids[row]} has negative nominal_value"
+
+
+def _check_interest_rate(columns: BatchColumns, today: int):
+    for row, value in enumerate(columns.interest_rates):
+        if not 0 <= value <= 1:
+            asset_id = columns.ids[row]
+            yield row, f"Asset {asset_id} has invalid interest_rate (must be 0-1)"
+
+
+def _check_due_date(columns: BatchColumns, today: int):
+    for row, ordinal in enumerate(columns.due_ordinals):
+        if ordinal is None:
+            due_date = columns.due_dates[row]
+            yield row, f"Invalid date format: {due_date}. Use YYYY-MM-DD."
+
+
+def _check_unique_ids(columns: BatchColumns, today: int):
+    ids = columns.ids
+    if len(set(ids)) == len(ids):
+        return
+    seen = set()
+    for row, asset_id in enumerate(ids):
+        if asset_id in seen:
+            yield row, f"Duplicate asset id: {asset_id}"
+        seen.add(asset_id)
+
+
+BASE_CHECKS: list[Check] = [
+    _check_nominal_value,
+    _check_interest_rate,
+    _check_unique_ids,
+    _check_due_date,
+]
+
+
+def _max_nominal_value(cap: float) -> Check:
+    def check(columns: BatchColumns, today: int):
+        for row, value in enumerate(columns.nominal_values):
+            if value > cap:
+                yield row, f"Asset {columns.ids[row]} nominal_value exceeds {cap:g}"
+
+    return check
+
+
+def _maturity(min_days: int | None, max_days: int | None) -> Check:
+    allowed = f"{min_days if min_days is not None else '-'}.."
+    allowed += f"{max_days if max_days is not None else ''} days"
+
+    def check(columns: BatchColumns, today: int):
+        low = -float("inf") if min_days is None else today + min_days
+        high = float("inf") if max_days is None else today + max_days
+        for row, ordinal in enumerate(columns.due_ordinals):
+            # Invalid dates are reported by the base date check
+            if ordinal is not None and not low <= ordinal <= high:
+                yield row, (
+                    f"Asset {columns.ids[row]} maturity outside allowed range "
+                    f"({allowed})"
+                )
+
+    return check
+
+
+def _id_glob(pattern: str) -> Check:
+    match = re.compile(fnmatch.translate(pattern)).match
+
+    def check(columns: BatchColumns, today: int):
+        for row, asset_id in enumerate(columns.ids):
+            if match(asset_id) is None:
+                yield row, f"Asset {asset_id} id does not match {pattern}"
+
+    return check
+
+
+class RuleChecker:
+    """Compiled rule set: the base checks followed by the tenant's checks"""
+
+    def __init__(self, checks: list[Check]):
+        self.checks = checks
+
+    def check(self, columns: BatchColumns) -> list[str]:
+        """
+        Run every check over the batch.
+        Returns all violation messages ordered by row, then by check.
+        """
+        today = datetime.now(UTC).date().toordinal()
+        violations = [
+            (row, position, message)
+            for position, check in enumerate(self.checks)
+            for row, message in check(columns, today)
+        ]
+        violations.sort(key=lambda violation: violation[:2])
+        return [message for _, _, message in violations]
+
+
+def compile_rules(rules: RuleSet) -> RuleChecker:
+    """Compile a rule set; raises ValueError for invalid rules"""
+    if (
+        rules.min_maturity_days is not None
+        and rules.max_maturity_days is not None
+        and rules.min_maturity_days > rules.max_maturity_days
+    ):
+        raise ValueError("min_maturity_days must not exceed max_maturity_days")
+    checks = list(BASE_CHECKS)
+    if rules.max_nominal_value is not None:
+        checks.append(_max_nominal_value(rules.max_nominal_value))
+    if rules.min_maturity_days is not None or rules.max_maturity_days is not None:
+        checks.append(_maturity(rules.min_maturity_days, rules.max_maturity_days))
+    if rules.id_glob is not None:
+        checks.append(_id_glob(rules.id_glob))
+    return RuleChecker(checks)
+
+
+def _load_rules(config: str) -> dict[str, RuleSet]:
+    """Parse the VALIDATION_RULES setting: a JSON object of tenant -> rule set"""
+    if not config:
+        return {}
+    return {
+        tenant: RuleSet.model_validate(rules)
+        for tenant, rules in json.loads(config).items()
+    }
+
+
+_rules: dict[str, RuleSet] = _load_rules(VALIDATION_RULES)
+_checkers: dict[str, RuleChecker] = {}
+
+
+def get_rules(tenant: str = DEFAULT_TENANT) -> RuleSet:
+    """Get the rule set applied to a tenant's batches"""
+    return _rules.get(tenant) or _rules.get(DEFAULT_TENANT) or RuleSet()
+
+
+def set_rules(tenant: str, rules: RuleSet) -> None:
+    """Replace a tenant's rule set; raises ValueError if it does not compile"""
+    checker = compile_rules(rules)
+    _rules[tenant] = rules
+    _checkers[tenant] = checker
+    logger.info("Updated validation rules for tenant %s", tenant)
+
+
+def get_checker(tenant: str = DEFAULT_TENANT) -> RuleChecker:
+    """Get the compiled checker for a tenant, compiling it on first use"""
+    # Cached per rule set owner, so arbitrary tenant ids do not grow the cache
+    owner = tenant if tenant in _rules else DEFAULT_TENANT
+    checker = _checkers.get(owner)
+    if checker is None:
+        checker = _checkers[owner] = compile_rules(get_rules(owner))
+    return checker
+
+
+def reset_rules() -> None:
+    """Restore the configured rule sets (useful for testing)"""
+    global _rules
+    _rules = _load_rules(VALIDATION_RULES)
+    _checkers.clear()
@@ -0,0 +1,130 @@
+"""Trigram index for searching asset ids by fragment
+
+Every id is numbered and each of its 3-character substrings (trigrams) maps
+to a posting list of id numbers. A query intersects the posting lists of its
+rarest trigrams and checks the remaining candidates for the full fragment, so
+the cost depends on how selective the query is rather than on the book size.
+
+Broad fragments (matching more than MAX_RANKED_MATCHES ids) are ranked among
+the first matches found only, which keeps their cost bounded.
+
+Ids also get one trigram anchored at their start ("\\0" plus the first two
+characters), so 2-character queries can be answered as prefix searches.
+Deleted ids leave stale numbers in the posting lists until the index is
+compacted.
+
+scan_ids answers the same queries without an index, ranked the same way,
+for use while an index is being built.
+"""
+
+import heapq
+from array import array
+from itertools import islice
+from typing import Iterable
+
+MIN_QUERY_LENGTH = 2
+# Matches ranked per query; broad fragments are ranked among the first ones only
+MAX_RANKED_MATCHES = 1000
+
+# Marks the start of an id in anchored trigrams
+_START = "\0"
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _rank(query: str):
+    """Sort key: prefix matches first, then shorter ids, then by id"""
+
+    def key(asset_id: str) -> tuple:
+        return not asset_id.startswith(query), len(asset_id), asset_id
+
+    return key
+
+
+def _best(ids: Iterable[str | None], query: str, limit: int) -> list[str]:
+    """Rank the first MAX_RANKED_MATCHES ids matching query and keep limit"""
+    # Queries shorter than 3 characters only match id prefixes
+    matches = str.startswith if len(query) < 3 else str.__contains__
+    found = (
+        asset_id
+        for asset_id in ids
+        if asset_id is not None and matches(asset_id, query)
+    )
+    return heapq.nsmallest(limit, islice(found, MAX_RANKED_MATCHES), key=_rank(query))
+
+
+def scan_ids(ids: Iterable[str], query: str, limit: int) -> list[str]:
+    """Search ids without an index (checks every id); see IdIndex.search"""
+    if len(query) < MIN_QUERY_LENGTH:
+        return []
+    return _best(ids, query, limit)
+
+
+class IdIndex:
+    """Trigram index over a set of ids"""
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self._ids: list[str | None] = []
+        self._numbers: dict[str, int] = {}
+        self._postings: dict[str, array] = {}
+        for asset_id in ids:
+            self.add(asset_id)
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __contains__(self, asset_id: str) -> bool:
+        return asset_id in self._numbers
+
+    def add(self, asset_id: str) -> None:
+        """Index an id (no-op if it is already indexed)"""
+        if asset_id in self._numbers:
+            return
+        number = self._numbers[asset_id] = len(self._ids)
+        self._ids.append(asset_id)
+        postings = self._postings
+        for gram in _trigrams(_START + asset_id):
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array("i")
+            posting.append(number)
+
+    def remove(self, asset_id: str) -> None:
+        """Forget an id; the index is rebuilt once most numbers are stale"""
+        number = self._numbers.pop(asset_id, None)
+        if number is None:
+            return
+        self._ids[number] = None
+        if len(self._ids) > 1024 and len(self._ids) > 2 * len(self._numbers):
+            self.__init__(asset_id for asset_id in self._ids if asset_id is not None)
+
+    def search(self, query: str, limit: int) -> list[str]:
+        """
+        Get up to limit ids containing query, best matches first.
+        Queries shorter than 3 characters only match id prefixes.
+        """
+        if len(query) < MIN_QUERY_LENGTH:
+            return []
+        grams = {_START + query} if len(query) < 3 else _trigrams(query)
+
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        numbers: Iterable[int] = postings[0]
+        if len(postings) > 1:
+            # Intersecting (in C) is cheaper than checking candidates one by
+            # one, unless the other posting list is much longer
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if len(posting) > 10 * len(candidates):
+                    break
+                candidates.intersection_update(posting)
+            numbers = candidates
+
+        return _best(map(self._ids.__getitem__, numbers), query, limit)
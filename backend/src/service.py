@@ -1,13 +1,200 @@
 """Business logic for asset management and insights calculation"""
 
+import asyncio
+import heapq
+import json
 import logging
+import time
+from array import array
 from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Sequence
 
-from backend.src.models import AssetData, AssetInput, AssetOutput, AssetStatus, Insight
-from backend.src.storage import get_all_assets
+from backend.config import AGGREGATION_WORKERS
+from backend.src.models import (
+    AssetData,
+    AssetInput,
+    AssetLookupResult,
+    AssetOutput,
+    AssetStatus,
+    AssetUpdate,
+    Insight,
+    Scenario,
+    ScenarioResult,
+    ScenarioShock,
+)
+from backend.src.portfolios import get_or_create_portfolio, get_portfolio
+from backend.src.rules import DEFAULT_TENANT, batch_columns, get_checker
+from backend.src.search import IdIndex
+from backend.src.storage import (
+    PutResult,
+    ShardColumns,
+    begin_id_index_build,
+    finish_id_index_build,
+    get_asset,
+    get_assets_by_id,
+    get_numeric_columns,
+    get_shard_columns,
+    search_ids,
+    store_asset,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Process pool for per-shard aggregations, created lazily
+_executor: "ProcessPoolExecutor | None" = None
+_workers = AGGREGATION_WORKERS
+
+# Running search index builds (referenced so they are not garbage collected)
+_index_builds: set[asyncio.Task] = set()
+
+
+def set_aggregation_workers(workers: int) -> None:
+    """Change the number of aggregation worker processes (0 or 1 disables the pool)"""
+    global _workers
+    shutdown_executor()
+    _workers = workers
+
+
+def shutdown_executor() -> None:
+    """Shut down the aggregation process pool if it is running"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def _imap_shards(func: Callable, args: list) -> Iterator:
+    """
+    Run func once per shard and yield the partial results in shard order.
+    Uses the process pool when more than one worker is configured.
+    """
+    global _executor
+    if _workers <= 1:
+        return (func(*arg) for arg in args)
+    if _executor is None:
+        # Imported lazily: multiprocessing is only needed when the pool is enabled
+        from concurrent.futures import ProcessPoolExecutor
+
+        _executor = ProcessPoolExecutor(max_workers=_workers)
+    return _executor.map(func, *zip(*args))
+
+
+def _map_shards(func: Callable, args: list) -> list:
+    """Run func once per shard and collect the partial results"""
+    return list(_imap_shards(func, args))
+
+
+def _summarize_shard(
+    nominal_values: Sequence[float], interest_rates: Sequence[float]
+) -> tuple[float, float, int]:
+    """Partial aggregate for one shard: (nominal sum, interest rate sum, count)"""
+    return sum(nominal_values), sum(interest_rates), len(interest_rates)
+
+
+def _prepare_shard(
+    columns: ShardColumns, status: AssetStatus | None, today: int
+) -> list[tuple[str, float, str, str]]:
+    """
+    Compute status for one shard's columns and apply the optional status filter.
+    Due dates are compared as day ordinals against today's ordinal.
+    """
+    active, defaulted = AssetStatus.ACTIVE.value, AssetStatus.DEFAULTED.value
+    result = []
+    for asset_id, nominal_value, due_date, due_ordinal in zip(
+        columns.ids, columns.nominal_values, columns.due_dates, columns.due_ordinals
+    ):
+        row_status = defaulted if due_ordinal < today else active
+        if status is None or row_status == status:
+            result.append((asset_id, nominal_value, row_status, due_date))
+    return result
+
+
+def _dashboard_shard(
+    columns: ShardColumns, limit: int, today: int
+) -> tuple[float, float, int, int, list[tuple[str, float, str, str]]]:
+    """
+    Partial dashboard for one shard: (nominal sum, interest rate sum, count,
+    defaulted count, first `limit` rows by id)
+    """
+    nominal_sum, rate_sum, count = _summarize_shard(
+        columns.nominal_values, columns.interest_rates
+    )
+    defaulted = sum(1 for ordinal in columns.due_ordinals if ordinal < today)
+    first = heapq.nsmallest(limit, range(count), key=columns.ids.__getitem__)
+    rows = [
+        (
+            columns.ids[row],
+            columns.nominal_values[row],
+            (
+                AssetStatus.DEFAULTED.value
+                if columns.due_ordinals[row] < today
+                else AssetStatus.ACTIVE.value
+            ),
+            columns.due_dates[row],
+        )
+        for row in first
+    ]
+    return nominal_sum, rate_sum, count, defaulted, rows
+
+
+def _select_rows(
+    due_ordinals: Sequence[int], shock: ScenarioShock, today: int
+) -> list[bool] | None:
+    """Rows matched by a shock's filters, or None when it applies to every row"""
+    if shock.status is None and shock.due_within_days is None:
+        return None
+    last = today + (shock.due_within_days or 0)
+    defaulted = shock.status == AssetStatus.DEFAULTED
+    return [
+        (shock.status is None or (ordinal < today) == defaulted)
+        and (shock.due_within_days is None or today <= ordinal <= last)
+        for ordinal in due_ordinals
+    ]
+
+
+def _transformed(column: array, func: Callable, selected: list[bool] | None) -> array:
+    """New column with func applied to the selected rows"""
+    if selected is None:
+        return array(column.typecode, map(func, column))
+    return array(
+        column.typecode,
+        [func(value) if keep else value for value, keep in zip(column, selected)],
+    )
+
+
+def _scenario_shard(
+    nominal_values: array,
+    interest_rates: array,
+    due_ordinals: array,
+    scenarios: list[list[ScenarioShock]],
+    today: int,
+) -> list[tuple[float, float, int]]:
+    """
+    Partial aggregates of one shard for every scenario.
+    Scenarios start from the same columns; a column is only copied when a
+    shock changes it (copy-on-write), and each shock is applied to the whole
+    column at once. Filters see the result of the previous shocks.
+    """
+    results = []
+    for shocks in scenarios:
+        nominals, rates, ordinals = nominal_values, interest_rates, due_ordinals
+        for shock in shocks:
+            selected = _select_rows(ordinals, shock, today)
+            if shock.due_date_shift_days:
+                days = shock.due_date_shift_days
+                ordinals = _transformed(ordinals, lambda v: v + days, selected)
+            if shock.rate_shift:
+                shift = shock.rate_shift
+                rates = _transformed(rates, lambda v: v + shift, selected)
+            if shock.haircut:
+                factor = 1 - shock.haircut
+                nominals = _transformed(nominals, lambda v: v * factor, selected)
+        results.append(_summarize_shard(nominals, rates))
+    return results
+
 
 def determine_asset_status(due_date_str: str) -> AssetStatus:
     """
@@ -19,30 +206,44 @@ def determine_asset_status(due_date_str: str) -> AssetStatus:
         today = datetime.now(UTC).date()
         return AssetStatus.DEFAULTED if due_date < today else AssetStatus.ACTIVE
     except ValueError as e:
-        logger.error(f"Invalid date format: {due_date_str}. Error: {e}")
+        logger.error("Invalid date format: %s. Error: %s", due_date_str, e)
         raise ValueError(f"Invalid date format: {due_date_str}. Use YYYY-MM-DD.")
 
 
-def validate_assets_input(assets: list[AssetInput]) -> None:
-    """Validate input assets"""
+def validate_assets_input(
+    assets: list[AssetInput], tenant: str = DEFAULT_TENANT
+) -> None:
+    """
+    Validate input assets against the tenant's rules.
+    Every violation in the batch is reported, joined with "; ".
+    """
     if not assets:
         raise ValueError("Assets list cannot be empty")
     if len(assets) > 10000:
         raise ValueError("Assets list too large (max 10000)")
 
-    seen_ids = set()
-    for asset in assets:
-        if asset.nominal_value < 0:
-            raise ValueError(f"Asset {asset.id} has negative nominal_value")
-        if asset.interest_rate < 0 or asset.interest_rate > 1:
-            raise ValueError(
-                f"Asset {asset.id} has invalid interest_rate (must be 0-1)"
-            )
-        if asset.id in seen_ids:
-            raise ValueError(f"Duplicate asset id: {asset.id}")
-        seen_ids.add(asset.id)
-        # Validate date format
-        determine_asset_status(asset.due_date)
+    violations = get_checker(tenant).check(batch_columns(assets))
+    if violations:
+        raise ValueError("; ".join(violations))
+
+
+def _count_results(results: Iterable[PutResult]) -> dict[str, int]:
+    """Number of inserted, updated and unchanged assets"""
+    counts = {result.value: 0 for result in PutResult}
+    for result in results:
+        counts[result.value] += 1
+    return counts
+
+
+def store_assets(assets: list[AssetInput]) -> dict[str, int]:
+    """
+    Store validated input assets.
+    Returns the number of inserted, updated and unchanged assets; unchanged
+    assets are not written.
+    """
+    return _count_results(
+        store_asset(asset.id, AssetData(**asset.model_dump())) for asset in assets
+    )
 
 
 def prepare_asset_output(asset_data: AssetData) -> AssetOutput:
@@ -56,22 +257,176 @@ def prepare_asset_output(asset_data: AssetData) -> AssetOutput:
     )
 
 
-def calculate_insights() -> list[Insight]:
+def update_asset(
+    asset_id: str, update: AssetUpdate, tenant: str = DEFAULT_TENANT
+) -> AssetData | None:
     """
-    Generate insights from the current asset portfolio.
-    Calculates metrics like average interest rate and total nominal value.
+    Apply a partial update to a stored asset.
+    Returns None if the asset does not exist; the merged asset is validated
+    with the tenant's rules, like POST /asset.
     """
-    assets = get_all_assets()
+    current = get_asset(asset_id)
+    if current is None:
+        return None
+    merged = AssetInput(
+        **{**current.model_dump(), **update.model_dump(exclude_none=True)}
+    )
+    validate_assets_input([merged], tenant)
+    asset_data = AssetData(**merged.model_dump())
+    store_asset(asset_id, asset_data)
+    return asset_data
 
-    if not assets:
-        logger.info("No assets in portfolio")
-        return []
 
-    # Calculate insights
-    total_nominal_value = sum(asset.nominal_value for asset in assets)
-    average_interest_rate = sum(asset.interest_rate for asset in assets) / len(assets)
+def lookup_assets(asset_ids: list[str]) -> AssetLookupResult:
+    """Look up many assets by id, reporting the ids that were not found"""
+    if len(asset_ids) > 10000:
+        raise ValueError("Lookup list too large (max 10000)")
+    assets, missing = [], []
+    for asset_id, asset_data in zip(asset_ids, get_assets_by_id(asset_ids)):
+        if asset_data is None:
+            missing.append(asset_id)
+        else:
+            assets.append(prepare_asset_output(asset_data))
+    return AssetLookupResult(assets=assets, missing=missing)
+
+
+def start_search_index_build() -> asyncio.Task | None:
+    """
+    Build the search index in a worker thread if it is missing and no build is
+    running; searches scan every id until it is installed. Call on the event
+    loop. Returns the build task, if one was started.
+    """
+    build = begin_id_index_build()
+    if build is None:
+        return None
+    generation, ids = build
+
+    async def run() -> None:
+        start = time.perf_counter()
+        index = None
+        try:
+            index = await asyncio.to_thread(IdIndex, ids)
+        except Exception as e:
+            logger.error("Error building search index: %s", e)
+        finally:
+            # Also on cancellation, so a later search can start a new build
+            finish_id_index_build(generation, index)
+        if index is not None:
+            logger.info(
+                "Built search index of %d ids in %.1f s",
+                len(index),
+                time.perf_counter() - start,
+            )
+
+    task = asyncio.create_task(run())
+    _index_builds.add(task)
+    task.add_done_callback(_index_builds.discard)
+    return task
+
+
+def search_assets(query: str, limit: int = 20) -> list[AssetOutput]:
+    """Find up to limit assets whose id contains query, best matches first"""
+    return [
+        prepare_asset_output(asset_data)
+        for asset_data in get_assets_by_id(search_ids(query, limit))
+        if asset_data is not None
+    ]
+
+
+def iter_asset_rows(
+    status: AssetStatus | None = None,
+) -> Iterator[list[tuple[str, float, str, str]]]:
+    """
+    Yield per-shard lists of (id, nominal_value, status, due_date) rows.
+    The store is snapshotted when this is called; shards are prepared lazily.
+    """
+    today = datetime.now(UTC).date().toordinal()
+    args = [(columns, status, today) for columns in get_shard_columns()]
+    return _imap_shards(_prepare_shard, args)
+
+
+def iter_assets_json(status: AssetStatus | None = None) -> Iterator[bytes]:
+    """
+    Encode the asset list as a JSON array, one chunk per shard.
+    The store is snapshotted when this is called.
+    """
+    partials = iter_asset_rows(status)
+
+    def chunks() -> Iterator[bytes]:
+        yield b"["
+        first = True
+        for partial in partials:
+            if not partial:
+                continue
+            body = json.dumps(
+                [
+                    {"id": i, "nominal_value": n, "status": s, "due_date": d}
+                    for i, n, s, d in partial
+                ]
+            )[1:-1]
+            yield (body if first else "," + body).encode()
+            first = False
+        yield b"]"
+
+    return chunks()
 
-    insights = [
+
+def iter_asset_columns(status: AssetStatus | None = None) -> Iterator[dict[str, list]]:
+    """
+    Yield the asset list as one columnar table (one list per output field).
+    The store is snapshotted when this is called; the table is built lazily.
+    """
+    partials = iter_asset_rows(status)
+
+    def tables() -> Iterator[dict[str, list]]:
+        ids, nominal_values, statuses, due_dates = [], [], [], []
+        for partial in partials:
+            for asset_id, nominal, row_status, due in partial:
+                ids.append(asset_id)
+                nominal_values.append(nominal)
+                statuses.append(row_status)
+                due_dates.append(due)
+        yield {
+            "id": ids,
+            "nominal_value": nominal_values,
+            "status": statuses,
+            "due_date": due_dates,
+        }
+
+    return tables()
+
+
+def asset_columns(status: AssetStatus | None = None) -> dict[str, list]:
+    """Collect the asset list as columns (one list per output field)"""
+    return next(iter_asset_columns(status))
+
+
+def list_assets(status: AssetStatus | None = None) -> list[AssetOutput]:
+    """
+    List stored assets with their calculated status, optionally filtered by status.
+    Each shard is prepared independently and the partial results are concatenated.
+    """
+    return [
+        AssetOutput(id=asset_id, nominal_value=nominal, status=row_status, due_date=due)
+        for partial in iter_asset_rows(status)
+        for asset_id, nominal, row_status, due in partial
+    ]
+
+
+def _insight_args() -> list[tuple]:
+    """Snapshot the columns needed for insights, one argument tuple per shard"""
+    return [(nominals, rates) for nominals, rates, _ in get_numeric_columns()]
+
+
+def _build_insights(partials: list[tuple[float, float, int]]) -> list[Insight]:
+    """Merge per-shard (nominal sum, interest rate sum, count) into insights"""
+    count = sum(partial[2] for partial in partials)
+    if not count:
+        return []
+
+    total_nominal_value = sum(partial[0] for partial in partials)
+    average_interest_rate = sum(partial[1] for partial in partials) / count
+    return [
         Insight(id="insight-1", name="total_nominal_value", value=total_nominal_value),
         Insight(
             id="insight-2",
@@ -80,5 +435,176 @@ def calculate_insights() -> list[Insight]:
         ),
     ]
 
-    logger.info(f"Generated {len(insights)} insights")
+
+def _insights_from(args: list[tuple]) -> list[Insight]:
+    """Summarize each shard and merge the partial aggregates into insights"""
+    insights = _build_insights(_map_shards(_summarize_shard, args))
+    if not insights:
+        logger.info("No assets in portfolio")
+        return []
+
+    logger.info("Generated %d insights", len(insights))
     return insights
+
+
+def calculate_insights() -> list[Insight]:
+    """
+    Generate insights from the current asset portfolio.
+    Calculates metrics like average interest rate and total nominal value.
+    Sums and counts are computed per shard and merged.
+    """
+    return _insights_from(_insight_args())
+
+
+def insights_snapshot() -> Callable[[], list[Insight]]:
+    """
+    Snapshot the columns needed for insights and get a function computing
+    them, which can run later or in a worker thread.
+    """
+    args = _insight_args()
+    return lambda: _insights_from(args)
+
+
+def iter_insights_json() -> Iterator[bytes]:
+    """
+    Encode the insights as a JSON array.
+    The store is snapshotted when this is called; aggregation runs lazily.
+    """
+    args = _insight_args()
+
+    def chunks() -> Iterator[bytes]:
+        insights = _insights_from(args)
+        yield json.dumps([insight.model_dump() for insight in insights]).encode()
+
+    return chunks()
+
+
+def store_portfolio_assets(
+    portfolio_id: str, assets: list[AssetInput]
+) -> dict[str, int]:
+    """
+    Store validated input assets in a portfolio, creating it if needed.
+    Returns the number of inserted, updated and unchanged assets.
+    """
+    portfolio = get_or_create_portfolio(portfolio_id)
+    return _count_results(
+        portfolio.put(AssetData(**asset.model_dump())) for asset in assets
+    )
+
+
+def list_portfolio_assets(
+    portfolio_id: str, status: AssetStatus | None = None
+) -> list[AssetOutput] | None:
+    """List a portfolio's assets with their status; None if it does not exist"""
+    portfolio = get_portfolio(portfolio_id)
+    if portfolio is None:
+        return None
+    today = datetime.now(UTC).date().toordinal()
+    return [
+        AssetOutput(id=asset_id, nominal_value=nominal, status=row_status, due_date=due)
+        for asset_id, nominal, row_status, due in _prepare_shard(
+            portfolio.snapshot(), status, today
+        )
+    ]
+
+
+def portfolio_insights(portfolio_id: str) -> list[Insight] | None:
+    """
+    Insights for one portfolio, from its running aggregates (no scan).
+    Returns None if the portfolio does not exist.
+    """
+    portfolio = get_portfolio(portfolio_id)
+    if portfolio is None:
+        return None
+    return _build_insights([portfolio.summary()])
+
+
+def iter_dashboard_json(limit: int) -> Iterator[bytes]:
+    """
+    Encode the dashboard (first page of assets by id, insights and status
+    counts) as JSON. Everything is derived from one snapshot of the store,
+    taken when this is called.
+    """
+    today = datetime.now(UTC).date().toordinal()
+    args = [(columns, limit, today) for columns in get_shard_columns()]
+
+    def chunks() -> Iterator[bytes]:
+        partials = _map_shards(_dashboard_shard, args)
+        total = sum(partial[2] for partial in partials)
+        defaulted = sum(partial[3] for partial in partials)
+        rows = heapq.nsmallest(limit, (row for p in partials for row in p[4]))
+        insights = _build_insights([partial[:3] for partial in partials])
+        yield json.dumps(
+            {
+                "assets": [
+                    {"id": i, "nominal_value": n, "status": s, "due_date": d}
+                    for i, n, s, d in rows
+                ],
+                "insights": [insight.model_dump() for insight in insights],
+                "status_counts": {
+                    AssetStatus.ACTIVE.value: total - defaulted,
+                    AssetStatus.DEFAULTED.value: defaulted,
+                },
+                "total": total,
+            }
+        ).encode()
+
+    return chunks()
+
+
+def validate_scenarios(scenarios: list[Scenario]) -> None:
+    """Validate a batch of what-if scenarios"""
+    if not scenarios:
+        raise ValueError("Scenarios list cannot be empty")
+    if len(scenarios) > 100:
+        raise ValueError("Scenarios list too large (max 100)")
+
+    seen_ids = set()
+    for scenario in scenarios:
+        if scenario.id in seen_ids:
+            raise ValueError(f"Duplicate scenario id: {scenario.id}")
+        seen_ids.add(scenario.id)
+        for shock in scenario.shocks:
+            if shock.haircut < 0 or shock.haircut > 1:
+                raise ValueError(
+                    f"Scenario {scenario.id} has invalid haircut (must be 0-1)"
+                )
+            if shock.due_within_days is not None and shock.due_within_days < 0:
+                raise ValueError(f"Scenario {scenario.id} has negative due_within_days")
+
+
+def scenarios_snapshot(
+    scenarios: list[Scenario],
+) -> Callable[[], list[ScenarioResult]]:
+    """
+    Snapshot the columns scenarios need and get a function evaluating them,
+    which can run later or in a worker thread.
+    """
+    today = datetime.now(UTC).date().toordinal()
+    shocks = [scenario.shocks for scenario in scenarios]
+    args = [
+        (nominals, rates, ordinals, shocks, today)
+        for nominals, rates, ordinals in get_numeric_columns()
+    ]
+
+    def evaluate() -> list[ScenarioResult]:
+        partials = _map_shards(_scenario_shard, args)
+        results = [
+            ScenarioResult(
+                id=scenario.id,
+                insights=_build_insights([partial[index] for partial in partials]),
+            )
+            for index, scenario in enumerate(scenarios)
+        ]
+        logger.info("Evaluated %d scenarios", len(scenarios))
+        return results
+
+    return evaluate
+
+
+def run_scenarios(scenarios: list[Scenario]) -> list[ScenarioResult]:
+    """
+    Calculate insights under each what-if scenario without changing the store.
+    Every scenario is evaluated against the same snapshot of the store.
+    """
+    return scenarios_snapshot(scenarios)()
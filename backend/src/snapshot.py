@@ -0,0 +1,231 @@
+"""Columnar snapshot files for read-only replicas
+
+The store can be dumped to a single file holding every shard's columns, and
+a read-only process can memory-map that file and serve reads from it. Opening
+only parses a small header, so startup time does not depend on book size, and
+processes mapping the same file share its pages through the OS page cache.
+
+Layout (native little-endian, sections 8-byte aligned):
+- header: magic, format version, shard count, date count
+- shard table: (row count, section offset) per shard
+- date table: uint32 offsets[date count + 1], then the UTF-8 date strings
+- per shard section, rows sorted by id:
+  float64 nominal_values[n], float64 interest_rates[n], int32 due_ordinals[n],
+  uint32 date_index[n], uint32 id_offsets[n + 1], then the UTF-8 ids
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Iterator
+
+from backend.src.models import AssetData
+from backend.src.storage import ReadOnlyStoreError, ShardColumns
+
+MAGIC = b"ASSETSNP"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sIII")
+_SHARD_ENTRY = struct.Struct("<IQ")
+
+# Dumps run in worker threads; one at a time avoids competing full writes
+_dump_lock = threading.Lock()
+
+
+def _pad(size: int) -> int:
+    """Bytes needed to reach the next 8-byte boundary"""
+    return -size % 8
+
+
+def _string_table(strings: list[bytes]) -> tuple[array, bytes]:
+    """Offsets (n + 1 entries) and concatenated bytes for a list of strings"""
+    offsets = array("I", [0])
+    for value in strings:
+        offsets.append(offsets[-1] + len(value))
+    return offsets, b"".join(strings)
+
+
+def dump_snapshot(path: str, shard_columns: list[ShardColumns]) -> int:
+    """
+    Write shard columns to a snapshot file; returns its size in bytes.
+    The file is written to a unique temporary file next to the target and
+    renamed into place, so readers never see a partial file and processes
+    mapping the old file keep it. Concurrent dumps are serialised.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Snapshot files can only be written on little-endian hosts")
+
+    dates: dict[str, int] = {}
+    sections = []
+    for columns in shard_columns:
+        encoded = [asset_id.encode() for asset_id in columns.ids]
+        # UTF-8 byte order matches code point order, so readers can bisect bytes
+        order = sorted(range(len(encoded)), key=encoded.__getitem__)
+        id_offsets, id_blob = _string_table([encoded[row] for row in order])
+        date_index = array(
+            "I", [dates.setdefault(columns.due_dates[row], len(dates)) for row in order]
+        )
+        parts = [
+            array("d", [columns.nominal_values[row] for row in order]).tobytes(),
+            array("d", [columns.interest_rates[row] for row in order]).tobytes(),
+            array("i", [columns.due_ordinals[row] for row in order]).tobytes(),
+            date_index.tobytes(),
+            id_offsets.tobytes(),
+            id_blob,
+        ]
+        sections.append((len(order), parts))
+
+    date_offsets, date_blob = _string_table([date.encode() for date in dates])
+    position = _HEADER.size + _SHARD_ENTRY.size * len(sections)
+    date_table = date_offsets.tobytes() + date_blob
+    position += len(date_table)
+
+    entries = []
+    for rows, parts in sections:
+        position += _pad(position)
+        entries.append(_SHARD_ENTRY.pack(rows, position))
+        position += sum(len(part) for part in parts)
+
+    with _dump_lock:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path) or ".", prefix=".snapshot-"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), len(dates)))
+                f.writelines(entries)
+                f.write(date_table)
+                for _, parts in sections:
+                    f.write(b"\0" * _pad(f.tell()))
+                    f.writelines(parts)
+                size = f.tell()
+            # mkstemp makes the file owner-only; replicas may run as another user
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    return size
+
+
+class MappedShard:
+    """Read-only shard whose columns are views into a mapped snapshot file"""
+
+    def __init__(self, buffer: mmap.mmap, offset: int, rows: int, dates: list[str]):
+        view = memoryview(buffer)
+        self._buffer = buffer
+        self._dates = dates
+        self.nominal_values = view[offset : offset + 8 * rows].cast("d")
+        offset += 8 * rows
+        self.interest_rates = view[offset : offset + 8 * rows].cast("d")
+        offset += 8 * rows
+        self.due_ordinals = view[offset : offset + 4 * rows].cast("i")
+        offset += 4 * rows
+        self._date_index = view[offset : offset + 4 * rows].cast("I")
+        offset += 4 * rows
+        self._id_offsets = view[offset : offset + 4 * (rows + 1)].cast("I")
+        self._id_base = offset + 4 * (rows + 1)
+        # Decoded on first use only (full listings, id searches); prefix scans
+        # decode only the rows they visit
+        self._ids: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self.nominal_values)
+
+    def __contains__(self, asset_id: str) -> bool:
+        return self._find(asset_id) is not None
+
+    def _id_bytes(self, row: int) -> bytes:
+        start = self._id_base + self._id_offsets[row]
+        return self._buffer[start : self._id_base + self._id_offsets[row + 1]]
+
+    def _find(self, asset_id: str) -> int | None:
+        """Binary search the sorted ids for a row"""
+        key = asset_id.encode()
+        row = bisect_left(range(len(self)), key, key=self._id_bytes)
+        if row < len(self) and self._id_bytes(row) == key:
+            return row
+        return None
+
+    def ids_from(self, prefix: str) -> Iterator[str]:
+        """Iterate over the ids not before prefix, in sorted order"""
+        start = bisect_left(range(len(self)), prefix.encode(), key=self._id_bytes)
+        return (self._id_bytes(row).decode() for row in range(start, len(self)))
+
+    @property
+    def ids(self) -> list[str]:
+        if self._ids is None:
+            self._ids = [self._id_bytes(row).decode() for row in range(len(self))]
+        return self._ids
+
+    @property
+    def due_dates(self) -> list[str]:
+        return [self._dates[index] for index in self._date_index]
+
+    def get(self, asset_id: str) -> AssetData | None:
+        row = self._find(asset_id)
+        if row is None:
+            return None
+        return self.row(row)
+
+    def row(self, row: int) -> AssetData:
+        return AssetData.model_construct(
+            id=self._id_bytes(row).decode(),
+            nominal_value=self.nominal_values[row],
+            due_date=self._dates[self._date_index[row]],
+            interest_rate=self.interest_rates[row],
+        )
+
+    def snapshot(self) -> ShardColumns:
+        return ShardColumns(
+            self.ids,
+            array("d", self.nominal_values),
+            self.due_dates,
+            array("i", self.due_ordinals),
+            array("d", self.interest_rates),
+        )
+
+    def put(self, asset_data: AssetData) -> None:
+        raise ReadOnlyStoreError("Store is read-only")
+
+    def remove(self, asset_id: str) -> bool:
+        raise ReadOnlyStoreError("Store is read-only")
+
+    def clear(self) -> None:
+        raise ReadOnlyStoreError("Store is read-only")
+
+
+def open_snapshot(path: str) -> list[MappedShard]:
+    """Memory-map a snapshot file and get its shards"""
+    if sys.byteorder != "little":
+        raise ValueError("Snapshot files can only be read on little-endian hosts")
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(buffer) < _HEADER.size:
+        raise ValueError(f"Not a snapshot file: {path}")
+    magic, version, shard_count, date_count = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a snapshot file: {path}")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version: {version}")
+
+    position = _HEADER.size
+    entries = [
+        _SHARD_ENTRY.unpack_from(buffer, position + _SHARD_ENTRY.size * shard)
+        for shard in range(shard_count)
+    ]
+    position += _SHARD_ENTRY.size * shard_count
+    date_offsets = memoryview(buffer)[position : position + 4 * (date_count + 1)]
+    date_offsets = date_offsets.cast("I")
+    base = position + 4 * (date_count + 1)
+    dates = [
+        buffer[base + date_offsets[i] : base + date_offsets[i + 1]].decode()
+        for i in range(date_count)
+    ]
+    return [MappedShard(buffer, offset, rows, dates) for rows, offset in entries]
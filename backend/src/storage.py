@@ -1,31 +1,485 @@
-"""In-memory storage for assets"""
+"""In-memory storage for assets
 
+Assets are partitioned into shards by a stable hash of their id. Writes only
+touch their own shard and readers can aggregate shards independently.
+
+Each shard is columnar: an id -> row index plus one compact array per field.
+The id string is stored once (the index key and the ids column share the same
+object) and AssetData objects are only materialized on read.
+
+Prefix range scans merge per-shard sorted id lists lazily. A shard sorts its
+ids on the first scan, then records ids added and removed by later writes and
+merges them in on the next scan (linear, not a full re-sort).
+
+A read-only process can instead serve a memory-mapped snapshot file (see
+backend.src.snapshot); writes then raise ReadOnlyStoreError.
+"""
+
+import os
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from enum import Enum
+from heapq import merge
+from itertools import chain, islice, takewhile
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+from backend.config import STORAGE_SHARDS
 from backend.src.models import AssetData
+from backend.src.search import IdIndex, scan_ids
+
+
+class ReadOnlyStoreError(Exception):
+    """Raised on writes while the store serves a read-only snapshot"""
+
+
+class PutResult(str, Enum):
+    """Outcome of storing an asset"""
+
+    INSERTED = "inserted"
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+
+
+class ShardColumns(NamedTuple):
+    """Point-in-time copy of one shard's columns"""
+
+    ids: list[str]
+    nominal_values: array
+    due_dates: list[str]
+    due_ordinals: array
+    interest_rates: array
+
+
+class Shard:
+    """
+    Columnar storage for one shard; rows are kept dense (swap-remove on delete).
+    Also used on its own as a small unsharded book (see portfolios).
+    """
+
+    __slots__ = (
+        "index",
+        "ids",
+        "nominal_values",
+        "due_dates",
+        "due_ordinals",
+        "interest_rates",
+        "_sorted_ids",
+        "_added",
+        "_removed",
+    )
+
+    def __init__(self):
+        self.index: dict[str, int] = {}
+        self.ids: list[str] = []
+        self.nominal_values = array("d")
+        # Date strings are shared between rows; ordinals are used for comparisons
+        self.due_dates: list[str] = []
+        self.due_ordinals = array("i")
+        self.interest_rates = array("d")
+        # Sorted ids for prefix scans, built on the first scan; ids added and
+        # removed since are merged in on the next one
+        self._sorted_ids: list[str] | None = None
+        self._added: set[str] = set()
+        self._removed: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _sorted_change(self, asset_id: str, added: bool) -> None:
+        """Record an id added or removed since the sorted ids were merged"""
+        if added and asset_id in self._removed:
+            self._removed.discard(asset_id)
+        elif not added and asset_id in self._added:
+            self._added.discard(asset_id)
+        else:
+            (self._added if added else self._removed).add(asset_id)
+        if len(self._added) + len(self._removed) > len(self.ids):
+            # Cheaper to sort again than to keep a log longer than the shard
+            self._sorted_ids = None
+            self._added.clear()
+            self._removed.clear()
+
+    def sorted_ids(self) -> list[str]:
+        """Get the ids in sorted order, merging in writes since the last call"""
+        if self._sorted_ids is None:
+            self._sorted_ids = sorted(self.ids)
+        elif self._added or self._removed:
+            removed = self._removed
+            ids = [asset_id for asset_id in self._sorted_ids if asset_id not in removed]
+            # Two sorted runs: timsort merges them in linear time
+            ids += sorted(self._added)
+            ids.sort()
+            self._sorted_ids = ids
+            self._added.clear()
+            self._removed.clear()
+        return self._sorted_ids
+
+    def ids_from(self, prefix: str) -> Iterator[str]:
+        """Iterate over the ids not before prefix, in sorted order"""
+        ids = self.sorted_ids()
+        return islice(ids, bisect_left(ids, prefix), None)
+
+    def __contains__(self, asset_id: str) -> bool:
+        return asset_id in self.index
+
+    def put(self, asset_data: AssetData) -> PutResult:
+        """
+        Store or update a row.
+        A row whose stored values already match is left untouched (UNCHANGED).
+        """
+        due_date, due_ordinal = _intern_date(asset_data.due_date)
+        row = self.index.get(asset_data.id)
+        if row is None:
+            self.index[asset_data.id] = len(self.ids)
+            self.ids.append(asset_data.id)
+            self.nominal_values.append(asset_data.nominal_value)
+            self.due_dates.append(due_date)
+            self.due_ordinals.append(due_ordinal)
+            self.interest_rates.append(asset_data.interest_rate)
+            if self._sorted_ids is not None:
+                self._sorted_change(asset_data.id, True)
+            return PutResult.INSERTED
+        if (
+            self.nominal_values[row] == asset_data.nominal_value
+            and self.interest_rates[row] == asset_data.interest_rate
+            and self.due_dates[row] == due_date
+        ):
+            return PutResult.UNCHANGED
+        self.nominal_values[row] = asset_data.nominal_value
+        self.due_dates[row] = due_date
+        self.due_ordinals[row] = due_ordinal
+        self.interest_rates[row] = asset_data.interest_rate
+        return PutResult.UPDATED
+
+    def get(self, asset_id: str) -> AssetData | None:
+        row = self.index.get(asset_id)
+        if row is None:
+            return None
+        return self.row(row)
+
+    def row(self, row: int) -> AssetData:
+        return AssetData.model_construct(
+            id=self.ids[row],
+            nominal_value=self.nominal_values[row],
+            due_date=self.due_dates[row],
+            interest_rate=self.interest_rates[row],
+        )
+
+    def remove(self, asset_id: str) -> bool:
+        row = self.index.pop(asset_id, None)
+        if row is None:
+            return False
+        last = len(self.ids) - 1
+        if row != last:
+            # Move the last row into the gap to keep columns dense
+            moved_id = self.ids[last]
+            self.ids[row] = moved_id
+            self.nominal_values[row] = self.nominal_values[last]
+            self.due_dates[row] = self.due_dates[last]
+            self.due_ordinals[row] = self.due_ordinals[last]
+            self.interest_rates[row] = self.interest_rates[last]
+            self.index[moved_id] = row
+        self.ids.pop()
+        self.nominal_values.pop()
+        self.due_dates.pop()
+        self.due_ordinals.pop()
+        self.interest_rates.pop()
+        if self._sorted_ids is not None:
+            self._sorted_change(asset_id, False)
+        return True
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def snapshot(self) -> ShardColumns:
+        return ShardColumns(
+            list(self.ids),
+            array("d", self.nominal_values),
+            list(self.due_dates),
+            array("i", self.due_ordinals),
+            array("d", self.interest_rates),
+        )
+
+
+# Global in-memory storage for assets (mapped read-only shards in snapshot mode)
+shards: list[Shard] = [Shard() for _ in range(max(STORAGE_SHARDS, 1))]
+_read_only = False
+
+# Canonical date string and ordinal per distinct due date
+_dates: dict[str, tuple[str, int]] = {}
+
+# Trigram index for search_ids, built off the event loop (see
+# begin_id_index_build) and then kept current by writes
+_id_index: IdIndex | None = None
+# While a build runs: ids added (True) or removed (False) since its snapshot,
+# replayed when the index is installed
+_id_index_log: list[tuple[str, bool]] | None = None
+# Incremented whenever a build starts or the index is dropped, so a build
+# that finishes after the store was cleared or reloaded is discarded
+_id_index_generation = 0
+
+# Incremented on every write; lets readers cache derived data per version
+_version = 0
+_last_modified = time.time()
+# Version numbers restart in every process, so ETags pair them with an epoch:
+# random per process, or derived from the snapshot file served. Versions in
+# tags count from the start of the epoch.
+_epoch = os.urandom(4).hex()
+_epoch_start = 0
+
+# Called after every write (keep them cheap: they run inside the write)
+_change_listeners: list[Callable[[], None]] = []
+
+
+def _intern_date(due_date: str) -> tuple[str, int]:
+    """Get the shared string and day ordinal for a YYYY-MM-DD date"""
+    cached = _dates.get(due_date)
+    if cached is None:
+        try:
+            ordinal = datetime.strptime(due_date, "%Y-%m-%d").toordinal()
+        except ValueError:
+            raise ValueError(f"Invalid date format: {due_date}. Use YYYY-MM-DD.")
+        cached = _dates[due_date] = (due_date, ordinal)
+    return cached
+
+
+def _touch() -> None:
+    """Record a write to the store"""
+    global _version, _last_modified
+    _version += 1
+    _last_modified = time.time()
+    for listener in _change_listeners:
+        listener()
+
 
-# Global in-memory storage for assets
-assets_store: dict[str, AssetData] = {}
+def add_change_listener(listener: Callable[[], None]) -> None:
+    """Call listener after every write to the store"""
+    _change_listeners.append(listener)
 
 
-def store_asset(asset_id: str, asset_data: AssetData) -> None:
-    """Store or update an asset"""
-    assets_store[asset_id] = asset_data
+def remove_change_listener(listener: Callable[[], None]) -> None:
+    """Stop calling a listener added with add_change_listener"""
+    if listener in _change_listeners:
+        _change_listeners.remove(listener)
+
+
+def _drop_id_index() -> None:
+    """Forget the search index and abandon any running build"""
+    global _id_index, _id_index_log, _id_index_generation
+    _id_index = None
+    _id_index_log = None
+    _id_index_generation += 1
+
+
+def _index_change(asset_id: str, added: bool) -> None:
+    """Keep the search index (or the running build's log) in step with a write"""
+    if _id_index is not None:
+        if added:
+            _id_index.add(asset_id)
+        else:
+            _id_index.remove(asset_id)
+    elif _id_index_log is not None:
+        _id_index_log.append((asset_id, added))
+
+
+def is_read_only() -> bool:
+    """Check whether the store serves a read-only snapshot"""
+    return _read_only
+
+
+def load_snapshot(path: str) -> None:
+    """Serve reads from a memory-mapped snapshot file; writes are rejected"""
+    global _read_only, _last_modified, _epoch, _epoch_start
+    # Imported lazily: the snapshot module depends on this one
+    from backend.src.snapshot import open_snapshot
+
+    shards[:] = open_snapshot(path)
+    _read_only = True
+    _drop_id_index()
+    _touch()
+    stat = os.stat(path)
+    _last_modified = stat.st_mtime
+    # Replicas serving the same dump agree; a new dump gets a new epoch
+    identity = f"{stat.st_mtime_ns}-{stat.st_size}".encode()
+    _epoch = f"{zlib.crc32(identity):08x}"
+    _epoch_start = _version
+
+
+def unload_snapshot() -> None:
+    """Go back to an empty writable store"""
+    global _read_only, _epoch, _epoch_start
+    shards[:] = [Shard() for _ in range(max(STORAGE_SHARDS, 1))]
+    _read_only = False
+    _drop_id_index()
+    _touch()
+    _epoch = os.urandom(4).hex()
+    _epoch_start = _version
+
+
+def storage_version() -> int:
+    """Get the current storage version"""
+    return _version
+
+
+def storage_tag() -> str:
+    """
+    Get a tag for the store's contents that stays distinct across processes,
+    unlike storage_version()
+    """
+    return f"{_epoch}-{_version - _epoch_start}"
+
+
+def last_modified() -> float:
+    """Get the time (epoch seconds) of the last write"""
+    return _last_modified
+
+
+def shard_index(asset_id: str) -> int:
+    """Get the shard an asset id belongs to (stable across processes)"""
+    return zlib.crc32(asset_id.encode()) % len(shards)
+
+
+def store_asset(asset_id: str, asset_data: AssetData) -> PutResult:
+    """
+    Store or update an asset.
+    Re-storing identical values is a no-op: the storage version, search index
+    and change listeners are only touched when something changed.
+    """
+    if asset_data.id != asset_id:
+        asset_data = asset_data.model_copy(update={"id": asset_id})
+    result = shards[shard_index(asset_id)].put(asset_data)
+    if result is PutResult.UNCHANGED:
+        return result
+    if result is PutResult.INSERTED:
+        _index_change(asset_id, True)
+    _touch()
+    return result
 
 
 def get_all_assets() -> list[AssetData]:
     """Get all stored assets"""
-    return list(assets_store.values())
+    return [shard.row(row) for shard in shards for row in range(len(shard))]
+
+
+def get_shard_columns() -> list[ShardColumns]:
+    """Get a snapshot of every shard's columns"""
+    return [shard.snapshot() for shard in shards]
+
+
+def get_numeric_columns() -> list[tuple[array, array, array]]:
+    """
+    Get a snapshot of every shard's (nominal_values, interest_rates,
+    due_ordinals) columns, for aggregations that do not need ids or dates
+    """
+    return [
+        (
+            array("d", shard.nominal_values),
+            array("d", shard.interest_rates),
+            array("i", shard.due_ordinals),
+        )
+        for shard in shards
+    ]
 
 
 def get_asset(asset_id: str) -> AssetData | None:
     """Get a specific asset by ID"""
-    return assets_store.get(asset_id)
+    return shards[shard_index(asset_id)].get(asset_id)
+
+
+def get_assets_by_id(asset_ids: list[str]) -> list[AssetData | None]:
+    """Get several assets by ID; missing ids map to None"""
+    return [shards[shard_index(asset_id)].get(asset_id) for asset_id in asset_ids]
+
+
+def begin_id_index_build() -> tuple[int, Iterable[str]] | None:
+    """
+    Start building the search index, unless it exists or a build is running.
+    Returns (generation, ids): build an IdIndex from the ids in a worker
+    thread and pass it to finish_id_index_build. Writes made meanwhile are
+    logged and replayed then. Call on the thread that writes to the store.
+    """
+    global _id_index_log, _id_index_generation
+    if _id_index is not None or _id_index_log is not None:
+        return None
+    _id_index_generation += 1
+    _id_index_log = []
+    if _read_only:
+        # Mapped shards never change; their ids are decoded by the builder
+        ids = (asset_id for shard in list(shards) for asset_id in shard.ids)
+    else:
+        ids = chain.from_iterable([list(shard.ids) for shard in shards])
+    return _id_index_generation, ids
+
+
+def finish_id_index_build(generation: int, index: IdIndex | None) -> None:
+    """
+    Install an index built from begin_id_index_build's ids, replaying the
+    writes made since. Pass None if the build failed, so it can be retried.
+    Builds abandoned by clear_assets or a snapshot load are discarded.
+    """
+    global _id_index, _id_index_log
+    if generation != _id_index_generation:
+        return
+    if index is not None:
+        for asset_id, added in _id_index_log:
+            if added:
+                index.add(asset_id)
+            else:
+                index.remove(asset_id)
+        _id_index = index
+    _id_index_log = None
+
+
+def build_id_index() -> None:
+    """Build the search index in the calling thread (blocks until done)"""
+    build = begin_id_index_build()
+    if build is not None:
+        generation, ids = build
+        finish_id_index_build(generation, IdIndex(ids))
+
+
+def scan_prefix(prefix: str, limit: int | None = None) -> list[str]:
+    """
+    Get stored ids starting with prefix, in sorted order.
+    Merges the shards' sorted ids lazily, so only matching ids are visited.
+    """
+    merged = merge(*(shard.ids_from(prefix) for shard in shards))
+    matches = takewhile(lambda asset_id: asset_id.startswith(prefix), merged)
+    return list(islice(matches, limit))
+
+
+def search_ids(query: str, limit: int) -> list[str]:
+    """
+    Get up to limit stored ids containing query, prefix matches first.
+    Uses the trigram index once it is built and scans every id until then.
+    """
+    if _id_index is None:
+        return scan_ids(
+            (asset_id for shard in shards for asset_id in shard.ids), query, limit
+        )
+    return _id_index.search(query, limit)
+
+
+def delete_asset(asset_id: str) -> bool:
+    """Delete an asset; returns False if it did not exist"""
+    if not shards[shard_index(asset_id)].remove(asset_id):
+        return False
+    _index_change(asset_id, False)
+    _touch()
+    return True
 
 
 def clear_assets() -> None:
     """Clear all assets (useful for testing)"""
-    assets_store.clear()
+    for shard in shards:
+        shard.clear()
+    _drop_id_index()
+    _touch()
 
 
 def asset_count() -> int:
     """Get the number of stored assets"""
-    return len(assets_store)
+    return sum(len(shard) for shard in shards)
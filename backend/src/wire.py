@@ -0,0 +1,106 @@
+"""Wire formats for bulk asset transfer
+
+Besides JSON, assets can be exchanged as MessagePack or, when pyarrow is
+installed, as an Apache Arrow IPC stream. Binary bodies are columnar: one
+array per field instead of repeating field names on every row.
+"""
+
+from importlib.util import find_spec
+from typing import Any
+
+import msgpack
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+# pyarrow is optional and slow to import, so only check that it is installed
+SUPPORTED_FORMATS = [JSON, MSGPACK] + ([ARROW] if find_spec("pyarrow") else [])
+
+# Accepted aliases for the MessagePack media type
+_ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK}
+
+
+def _media_type(value: str) -> str:
+    """Normalize a media type, dropping parameters"""
+    media_type = value.split(";")[0].strip().lower()
+    return _ALIASES.get(media_type, media_type)
+
+
+def negotiate_format(accept: str | None) -> str:
+    """Pick the response format from an Accept header, defaulting to JSON"""
+    if not accept:
+        return JSON
+
+    best, best_weight = JSON, 0.0
+    for part in accept.split(","):
+        media_type = _media_type(part)
+        weight = 1.0
+        for param in part.split(";")[1:]:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if media_type in SUPPORTED_FORMATS and weight > best_weight:
+            best, best_weight = media_type, weight
+    return best
+
+
+def request_format(content_type: str | None) -> str:
+    """Get the wire format of a request body from its Content-Type"""
+    if not content_type:
+        return JSON
+    media_type = _media_type(content_type)
+    if media_type not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported content type: {media_type}")
+    return media_type
+
+
+def encode_columns(columns: dict[str, list], fmt: str) -> bytes:
+    """Encode a columnar table in a binary format"""
+    if fmt == MSGPACK:
+        return msgpack.packb(columns)
+    if fmt == ARROW:
+        import pyarrow as pa
+
+        table = pa.table(columns)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    raise ValueError(f"Unsupported binary format: {fmt}")
+
+
+def decode_rows(body: bytes, fmt: str) -> list[dict[str, Any]]:
+    """
+    Decode a binary request body into a list of row dicts.
+    The body may be columnar (map of arrays) or a list of row maps.
+    """
+    if fmt == MSGPACK:
+        try:
+            data = msgpack.unpackb(body)
+        except (ValueError, msgpack.UnpackException) as e:
+            raise ValueError(f"Invalid MessagePack body: {e}")
+    elif fmt == ARROW:
+        import pyarrow as pa
+
+        try:
+            data = pa.ipc.open_stream(body).read_all().to_pydict()
+        except pa.ArrowInvalid as e:
+            raise ValueError(f"Invalid Arrow IPC body: {e}")
+    else:
+        raise ValueError(f"Unsupported binary format: {fmt}")
+
+    if isinstance(data, dict):
+        if not all(isinstance(column, list) for column in data.values()):
+            raise ValueError("Columnar body values must be arrays")
+        names = list(data)
+        lengths = {len(column) for column in data.values()}
+        if len(lengths) > 1:
+            raise ValueError("Columns must have equal length")
+        return [dict(zip(names, row)) for row in zip(*data.values())]
+    if isinstance(data, list):
+        return data
+    raise ValueError("Body must be a list of assets or a map of columns")
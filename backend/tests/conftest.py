@@ -5,12 +5,32 @@ from pathlib import Path
 
 import pytest
 
+from backend.src.admission import reset_admission
+from backend.src.portfolios import clear_portfolios
+from backend.src.rules import reset_rules
 from backend.src.storage import clear_assets
 
 
 @pytest.fixture(autouse=True)
 def clear_assets_store():
-    """Clear assets store before each test"""
+    """Clear assets store and portfolios before each test"""
     clear_assets()
+    clear_portfolios()
     yield
     clear_assets()
+    clear_portfolios()
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Start each test with full rate limit buckets"""
+    reset_admission()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_validation_rules():
+    """Start each test with the configured validation rules"""
+    reset_rules()
+    yield
+    reset_rules()
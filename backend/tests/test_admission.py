@@ -0,0 +1,152 @@
+"""Tests for rate limiting and load shedding"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.src import admission
+from backend.src.admission import RateLimiter, TokenBucket, retry_after
+from backend.src.metrics import get_counter, reset_metrics
+
+client = TestClient(app)
+
+PAYLOAD = [
+    {
+        "id": "id-1",
+        "nominal_value": 100,
+        "due_date": "2025-12-04",
+        "interest_rate": 0.03,
+    },
+    {
+        "id": "id-2",
+        "nominal_value": 10,
+        "due_date": "2026-01-04",
+        "interest_rate": 0.1,
+    },
+]
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Set tiny buckets that effectively do not refill during a test"""
+
+    def apply(requests: float = 100, assets: float = 1000):
+        monkeypatch.setattr(admission.request_limiter, "rate", 0.001)
+        monkeypatch.setattr(admission.request_limiter, "capacity", requests)
+        monkeypatch.setattr(admission.asset_limiter, "rate", 0.001)
+        monkeypatch.setattr(admission.asset_limiter, "capacity", assets)
+
+    reset_metrics()
+    yield apply
+    reset_metrics()
+
+
+class TestTokenBucket:
+    """Test token bucket accounting"""
+
+    def test_admits_up_to_capacity(self):
+        """Test requests are admitted until the bucket is empty"""
+        bucket = TokenBucket(rate=1, capacity=2, now=0)
+        assert bucket.take(1, now=0) == 0
+        assert bucket.take(1, now=0) == 0
+        assert bucket.take(1, now=0) == pytest.approx(1.0)
+
+    def test_refills_over_time(self):
+        """Test tokens refill at the configured rate"""
+        bucket = TokenBucket(rate=2, capacity=1, now=0)
+        bucket.take(1, now=0)
+        assert bucket.take(1, now=0.25) == pytest.approx(0.25)
+        assert bucket.take(1, now=0.5) == 0
+
+    def test_large_cost_overdraws(self):
+        """Test a cost above the balance is admitted and must be repaid"""
+        bucket = TokenBucket(rate=10, capacity=5, now=0)
+        assert bucket.take(25, now=0) == 0
+        assert bucket.take(1, now=0) == pytest.approx(2.1)
+
+    def test_retry_after_rounds_up(self):
+        """Test Retry-After is whole seconds and at least 1"""
+        assert retry_after(0.01) == "1"
+        assert retry_after(2.1) == "3"
+
+
+class TestRateLimiter:
+    """Test keyed buckets"""
+
+    def test_keys_are_independent(self):
+        """Test one key's usage does not affect another"""
+        limiter = RateLimiter(rate=0.001, capacity=1, max_buckets=10)
+        assert limiter.take(("a",)) == 0
+        assert limiter.take(("a",)) > 0
+        assert limiter.take(("b",)) == 0
+
+    def test_least_recently_used_bucket_dropped(self):
+        """Test the number of buckets is bounded"""
+        limiter = RateLimiter(rate=0.001, capacity=1, max_buckets=2)
+        for key in ("a", "b", "c"):
+            limiter.take((key,))
+        assert list(limiter._buckets) == [("b",), ("c",)]
+
+    def test_zero_rate_disables(self):
+        """Test a rate of 0 admits everything"""
+        limiter = RateLimiter(rate=0, capacity=1, max_buckets=10)
+        assert all(limiter.take(("a",)) == 0 for _ in range(5))
+
+
+class TestRateLimitedRoutes:
+    """Test 429 responses from the HTTP layer"""
+
+    def test_request_rate_limit(self, limits):
+        """Test requests beyond the bucket get 429 with Retry-After"""
+        limits(requests=2)
+        assert client.get("/insights").status_code == 200
+        assert client.get("/insights").status_code == 200
+        response = client.get("/insights")
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) >= 1
+        assert get_counter("admission.rate_limited") == 1
+
+    def test_limits_are_per_endpoint(self, limits):
+        """Test exhausting one endpoint leaves others available"""
+        limits(requests=1)
+        client.get("/insights")
+        assert client.get("/insights").status_code == 429
+        assert client.get("/asset").status_code == 200
+
+    def test_probes_are_exempt(self, limits):
+        """Test health and readiness are never limited"""
+        limits(requests=1)
+        for _ in range(3):
+            assert client.get("/health").status_code == 200
+
+    def test_post_charged_by_batch_size(self, limits):
+        """Test a large batch uses up the asset budget for the next posts"""
+        limits(assets=1)
+        assert client.post("/asset", json=PAYLOAD).status_code == 200
+        response = client.post("/asset", json=PAYLOAD[:1])
+        assert response.status_code == 429
+        assert "retry-after" in response.headers
+
+
+class TestLoadShedding:
+    """Test 503 responses when the server is busy"""
+
+    def test_writes_shed_when_too_many_pending(self, monkeypatch):
+        """Test writes are shed first while reads are still served"""
+        monkeypatch.setattr(admission, "MAX_PENDING_WRITES", 0)
+        response = client.post("/asset", json=PAYLOAD)
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert client.get("/asset").status_code == 200
+
+    def test_all_requests_shed_above_in_flight_limit(self, monkeypatch):
+        """Test every request is shed above the hard in-flight limit"""
+        monkeypatch.setattr(admission, "MAX_IN_FLIGHT_REQUESTS", 0)
+        assert client.get("/asset").status_code == 503
+        assert client.get("/health").status_code == 200
+
+    def test_in_flight_released(self):
+        """Test in-flight counts return to zero after requests finish"""
+        client.post("/asset", json=PAYLOAD)
+        client.get("/asset")
+        assert admission.in_flight() == (0, 0)
@@ -0,0 +1,235 @@
+"""Tests for response compression and conditional GET"""
+
+import asyncio
+import gzip
+import json
+import time
+from datetime import timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.src import http_cache, storage
+from backend.src.http_cache import _body_cache, negotiate_encoding
+from backend.src.metrics import get_counter, reset_metrics
+
+client = TestClient(app)
+
+PAYLOAD = [
+    {
+        "id": "id-1",
+        "nominal_value": 100,
+        "due_date": "2025-12-04",
+        "interest_rate": 0.03,
+    },
+    {
+        "id": "id-2",
+        "nominal_value": 10,
+        "due_date": "2026-01-04",
+        "interest_rate": 0.1,
+    },
+]
+
+
+class TestNegotiateEncoding:
+    """Test Accept-Encoding negotiation"""
+
+    def test_no_header(self):
+        """Test identity is used without Accept-Encoding"""
+        assert negotiate_encoding(None) == "identity"
+
+    def test_gzip(self):
+        """Test gzip is selected when accepted"""
+        assert negotiate_encoding("gzip, deflate") == "gzip"
+
+    def test_q_zero_excludes(self):
+        """Test q=0 disables an encoding"""
+        assert negotiate_encoding("gzip;q=0") == "identity"
+
+    def test_unsupported_only(self):
+        """Test unsupported encodings fall back to identity"""
+        assert negotiate_encoding("compress") == "identity"
+
+
+class TestCompressedAssets:
+    """Test compressed GET /asset responses"""
+
+    def test_gzip_response(self):
+        """Test body is gzip encoded and decodes to the asset list"""
+        client.post("/asset", json=PAYLOAD)
+        response = client.get("/asset", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert len(response.json()) == 2
+
+    def test_identity_response(self):
+        """Test body is not encoded when no encoding is accepted"""
+        client.post("/asset", json=PAYLOAD)
+        response = client.get("/asset", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert {asset["id"] for asset in json.loads(response.content)} == {
+            "id-1",
+            "id-2",
+        }
+
+    def test_repeat_pull_served_from_cache(self):
+        """Test the compressed body is cached for the current version"""
+        client.post("/asset", json=PAYLOAD)
+        first = client.get("/asset", headers={"Accept-Encoding": "gzip"})
+        assert any(encoding == "gzip" for _, encoding in _body_cache)
+        second = client.get("/asset", headers={"Accept-Encoding": "gzip"})
+        assert second.json() == first.json()
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_cached_body_is_valid_gzip(self):
+        """Test the cached body decompresses to the JSON payload"""
+        client.post("/asset", json=PAYLOAD)
+        client.get("/asset", headers={"Accept-Encoding": "gzip"})
+        body = next(body for (_, enc), body in _body_cache.items() if enc == "gzip")
+        assert len(json.loads(gzip.decompress(body))) == 2
+
+
+class TestConditionalGet:
+    """Test ETag / Last-Modified handling"""
+
+    def test_etag_not_modified(self):
+        """Test unchanged store returns 304 for matching ETag"""
+        client.post("/asset", json=PAYLOAD)
+        etag = client.get("/asset").headers["etag"]
+        response = client.get("/asset", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_etag_changes_after_write(self):
+        """Test a write invalidates the ETag"""
+        client.post("/asset", json=PAYLOAD)
+        etag = client.get("/asset").headers["etag"]
+        client.post("/asset", json=[{**PAYLOAD[0], "nominal_value": 200}])
+        response = client.get("/asset", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_etag_kept_after_unchanged_repost(self):
+        """Test re-posting identical assets does not invalidate the ETag"""
+        client.post("/asset", json=PAYLOAD)
+        etag = client.get("/asset").headers["etag"]
+        client.post("/asset", json=PAYLOAD)
+        response = client.get("/asset", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_etag_differs_across_processes(self, monkeypatch):
+        """Test a restarted process at the same version does not match old ETags"""
+        client.post("/asset", json=PAYLOAD)
+        etag = client.get("/asset").headers["etag"]
+        monkeypatch.setattr(storage, "_epoch", "restarted")
+        response = client.get("/asset", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+    def test_etag_differs_per_filter(self):
+        """Test filtered and unfiltered lists have different ETags"""
+        client.post("/asset", json=PAYLOAD)
+        all_etag = client.get("/asset").headers["etag"]
+        filtered_etag = client.get("/asset?status=active").headers["etag"]
+        assert all_etag != filtered_etag
+
+    def test_etag_weak_comparison(self):
+        """Test a tag matches with or without the weak marker"""
+        client.post("/asset", json=PAYLOAD)
+        etag = client.get("/asset").headers["etag"]
+        assert etag.startswith("W/")
+        strong = etag.removeprefix("W/")
+        for header in (strong, f'"other", {strong}'):
+            response = client.get("/asset", headers={"If-None-Match": header})
+            assert response.status_code == 304
+
+    def test_if_modified_since(self, monkeypatch):
+        """Test If-Modified-Since only matches seconds after the last write"""
+        client.post("/asset", json=PAYLOAD)
+        monkeypatch.setattr(storage, "_last_modified", int(time.time()) - 4.5)
+        last_modified = client.get("/asset").headers["last-modified"]
+        # A later write in the same second would share this date
+        response = client.get("/asset", headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 200
+        later = format_datetime(
+            parsedate_to_datetime(last_modified) + timedelta(seconds=1), usegmt=True
+        )
+        response = client.get("/asset", headers={"If-Modified-Since": later})
+        assert response.status_code == 304
+
+
+class TestCoalescing:
+    """Test concurrent identical requests share one computation"""
+
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        reset_metrics()
+        yield
+        reset_metrics()
+
+    @staticmethod
+    def _get_concurrently(path: str, count: int) -> list[httpx.Response]:
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as async_client:
+                return await asyncio.gather(
+                    *(async_client.get(path) for _ in range(count))
+                )
+
+        return asyncio.run(run())
+
+    def test_concurrent_requests_computed_once(self, mocker):
+        """Test only the first of many concurrent requests builds the body"""
+        client.post("/asset", json=PAYLOAD)
+        spy = mocker.spy(http_cache, "_compress")
+        responses = self._get_concurrently("/asset", 10)
+        assert all(response.status_code == 200 for response in responses)
+        assert all(len(response.json()) == 2 for response in responses)
+        assert spy.call_count == 1
+        assert get_counter("response_cache.misses") == 1
+        assert (
+            get_counter("response_cache.coalesced") + get_counter("response_cache.hits")
+            == 9
+        )
+        assert not http_cache._inflight
+
+    def test_insights_are_coalesced(self):
+        """Test GET /insights goes through the shared cache"""
+        client.post("/asset", json=PAYLOAD)
+        responses = self._get_concurrently("/insights", 5)
+        assert {len(response.json()) for response in responses} == {2}
+        assert get_counter("response_cache.misses") == 1
+
+    def test_failed_generation_is_not_cached(self, mocker):
+        """Test a failing body is not cached and the next request recomputes"""
+
+        def failing():
+            raise ValueError("boom")
+            yield b""
+
+        client.post("/asset", json=PAYLOAD)
+        mocker.patch(
+            "backend.src.routes.iter_insights_json",
+            side_effect=[failing(), iter([b"[]"])],
+        )
+        with pytest.raises(RuntimeError):
+            client.get("/insights")
+        assert not _body_cache
+        assert not http_cache._inflight
+        assert client.get("/insights").json() == []
+        assert get_counter("response_cache.misses") == 2
+
+    def test_metrics_endpoint(self):
+        """Test cache counters and hit rate are exposed"""
+        client.post("/asset", json=PAYLOAD)
+        client.get("/asset")
+        client.get("/asset")
+        data = client.get("/metrics").json()
+        assert data["counters"]["response_cache.misses"] == 1
+        assert data["counters"]["response_cache.hits"] == 1
+        assert data["response_cache_hit_rate"] == 0.5
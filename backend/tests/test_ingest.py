@@ -0,0 +1,201 @@
+"""Tests for the async write-behind ingestion queue"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.src import ingest
+from backend.src.ingest import (
+    IngestQueueFull,
+    clear_jobs,
+    enqueue_assets,
+    get_job,
+    start_consumer,
+    stop_consumer,
+    store_batch,
+)
+from backend.src.models import AssetInput, IngestJob, JobStatus
+from backend.src.storage import asset_count, get_asset
+
+
+def _assets(count, prefix="id"):
+    return [
+        AssetInput(
+            id=f"{prefix}-{i}",
+            nominal_value=100,
+            due_date="2025-12-04",
+            interest_rate=0.05,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def reset_jobs():
+    """Forget jobs between tests"""
+    clear_jobs()
+    yield
+    clear_jobs()
+
+
+class TestQueue:
+    """Test queueing and the background consumer"""
+
+    def test_batches_applied_in_order(self):
+        """Test queued batches are applied in submission order"""
+
+        async def run():
+            start_consumer()
+            first = enqueue_assets(_assets(3))
+            second = enqueue_assets(
+                [
+                    AssetInput(
+                        id="id-0",
+                        nominal_value=7,
+                        due_date="2025-12-04",
+                        interest_rate=0.1,
+                    )
+                ]
+            )
+            await stop_consumer()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first.status == JobStatus.COMPLETED
+        assert second.status == JobStatus.COMPLETED
+        assert asset_count() == 3
+        assert get_asset("id-0").nominal_value == 7
+
+    def test_queue_full(self):
+        """Test backpressure when the queue is full"""
+
+        async def run():
+            start_consumer(maxsize=1)
+            enqueue_assets(_assets(1))
+            with pytest.raises(IngestQueueFull):
+                enqueue_assets(_assets(1, prefix="other"))
+            await stop_consumer()
+
+        asyncio.run(run())
+
+    def test_job_history_is_bounded(self, monkeypatch):
+        """Test finished jobs beyond the history limit are dropped"""
+        monkeypatch.setattr(ingest, "INGEST_JOB_HISTORY", 2)
+
+        async def run():
+            start_consumer()
+            jobs = []
+            for i in range(3):
+                jobs.append(enqueue_assets(_assets(1, prefix=f"batch{i}")))
+                await ingest._queue.join()
+            await stop_consumer()
+            return jobs
+
+        jobs = asyncio.run(run())
+        assert get_job(jobs[0].id) is None
+        assert get_job(jobs[2].id) is not None
+
+
+class TestChunkedApply:
+    """Test applying batches in chunks that yield to the event loop"""
+
+    def test_counts_summed_over_chunks(self, monkeypatch):
+        """Test job counts cover every chunk of the batch"""
+        monkeypatch.setattr(ingest, "APPLY_CHUNK_SIZE", 2)
+        job = IngestJob(id="job", status=JobStatus.QUEUED, asset_count=5)
+        asyncio.run(store_batch(_assets(3)))
+        asyncio.run(ingest._apply(job, _assets(5)))
+        assert job.status is JobStatus.COMPLETED
+        assert (job.inserted, job.updated, job.unchanged) == (2, 0, 3)
+        assert asset_count() == 5
+
+    def test_batches_do_not_interleave(self, monkeypatch):
+        """Test a sync batch waits for a batch being applied in chunks"""
+        monkeypatch.setattr(ingest, "APPLY_CHUNK_SIZE", 1)
+        applied = []
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        monkeypatch.setattr(
+            ingest,
+            "store_assets",
+            lambda assets: applied.extend(asset.id for asset in assets) or counts,
+        )
+        job = IngestJob(id="job", status=JobStatus.QUEUED, asset_count=3)
+
+        async def run():
+            await asyncio.gather(
+                ingest._apply(job, _assets(3, prefix="a")),
+                store_batch(_assets(3, prefix="b")),
+            )
+
+        asyncio.run(run())
+        assert applied == ["a-0", "a-1", "a-2", "b-0", "b-1", "b-2"]
+
+    def test_sync_batch_applied_in_one_step(self, monkeypatch):
+        """Test readers on the loop never see part of a sync batch"""
+        monkeypatch.setattr(ingest, "APPLY_CHUNK_SIZE", 1)
+        seen = []
+
+        async def watch():
+            for _ in range(5):
+                seen.append(asset_count())
+                await asyncio.sleep(0)
+
+        async def run():
+            await asyncio.gather(watch(), store_batch(_assets(3)))
+
+        asyncio.run(run())
+        assert set(seen) <= {0, 3}
+
+
+class TestAsyncEndpoint:
+    """Test POST /asset?mode=async and GET /jobs/{id}"""
+
+    PAYLOAD = [
+        {
+            "id": "id-1",
+            "nominal_value": 100,
+            "due_date": "2025-12-04",
+            "interest_rate": 0.03,
+        }
+    ]
+
+    def test_async_post_returns_job(self):
+        """Test async mode returns 202 and the job completes"""
+        with TestClient(app) as client:
+            response = client.post("/asset?mode=async", json=self.PAYLOAD)
+            assert response.status_code == 202
+            job = response.json()
+            assert response.headers["location"] == f"/jobs/{job['id']}"
+            assert job["asset_count"] == 1
+
+            deadline = time.monotonic() + 5
+            while client.get(f"/jobs/{job['id']}").json()["status"] != "completed":
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            assert len(client.get("/asset").json()) == 1
+
+    def test_async_post_validates_first(self):
+        """Test invalid batches are rejected before queueing"""
+        with TestClient(app) as client:
+            payload = [{**self.PAYLOAD[0], "nominal_value": -1}]
+            response = client.post("/asset?mode=async", json=payload)
+            assert response.status_code == 400
+
+    def test_async_post_queue_full(self, mocker):
+        """Test 429 with Retry-After when the queue is full"""
+        mocker.patch(
+            "backend.src.routes.enqueue_assets",
+            side_effect=IngestQueueFull("Ingestion queue is full"),
+        )
+        with TestClient(app) as client:
+            response = client.post("/asset?mode=async", json=self.PAYLOAD)
+            assert response.status_code == 429
+            assert response.headers["retry-after"] == "1"
+
+    def test_unknown_job(self):
+        """Test unknown job ids return 404"""
+        with TestClient(app) as client:
+            assert client.get("/jobs/missing").status_code == 404
@@ -0,0 +1,98 @@
+"""Tests for live insight updates over WebSocket"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.src import storage
+from backend.src.live import live_insights
+from backend.src.metrics import get_counter, reset_metrics
+
+
+def _post(client: TestClient, asset_id: str, nominal_value: float) -> None:
+    payload = [
+        {
+            "id": asset_id,
+            "nominal_value": nominal_value,
+            "due_date": "2099-01-01",
+            "interest_rate": 0.1,
+        }
+    ]
+    assert client.post("/asset", json=payload).status_code == 200
+
+
+def _values(message: dict) -> dict[str, float]:
+    return {insight["name"]: insight["value"] for insight in message["insights"]}
+
+
+@pytest.fixture
+def client():
+    """Run the app's lifespan, so every connection shares one event loop"""
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def push_interval(monkeypatch):
+    """Set the minimum time between pushes"""
+    reset_metrics()
+
+    def apply(seconds: float) -> None:
+        monkeypatch.setattr(live_insights, "interval", seconds)
+
+    yield apply
+    reset_metrics()
+
+
+class TestLiveInsights:
+    """Test /ws/insights"""
+
+    def test_snapshot_then_delta(self, client, push_interval):
+        """Test subscribers get the current insights, then changes"""
+        push_interval(0)
+        _post(client, "id-1", 100)
+        with client.websocket_connect("/ws/insights") as ws:
+            snapshot = ws.receive_json()
+            assert snapshot["type"] == "snapshot"
+            assert _values(snapshot)["total_nominal_value"] == 100
+
+            _post(client, "id-2", 50)
+            delta = ws.receive_json()
+            assert delta["type"] == "delta"
+            assert _values(delta)["total_nominal_value"] == 150
+            assert delta["changes"]["total_nominal_value"] == 50
+            assert delta["changes"]["average_interest_rate"] == pytest.approx(0)
+
+    def test_bursts_coalesced(self, client, push_interval):
+        """Test writes within the push interval are sent as one update"""
+        push_interval(0.3)
+        with client.websocket_connect("/ws/insights") as ws:
+            ws.receive_json()
+            _post(client, "id-0", 1)
+            assert _values(ws.receive_json())["total_nominal_value"] == 1
+            for i in range(1, 5):
+                _post(client, f"id-{i}", 1)
+            delta = ws.receive_json()
+            assert _values(delta)["total_nominal_value"] == 5
+            assert delta["changes"]["total_nominal_value"] == 4
+        assert get_counter("live.pushes") == 2
+
+    def test_one_message_for_all_subscribers(self, client, push_interval):
+        """Test every subscriber receives the same update"""
+        push_interval(0)
+        with client.websocket_connect("/ws/insights") as first:
+            with client.websocket_connect("/ws/insights") as second:
+                first.receive_json()
+                second.receive_json()
+                assert live_insights.subscribers == 2
+                _post(client, "id-1", 10)
+                assert first.receive_text() == second.receive_text()
+        assert get_counter("live.pushes") == 1
+
+    def test_listener_removed_without_subscribers(self, client, push_interval):
+        """Test writes are not tracked once every subscriber has left"""
+        push_interval(0)
+        with client.websocket_connect("/ws/insights") as ws:
+            ws.receive_json()
+        assert live_insights.subscribers == 0
+        assert storage._change_listeners == []
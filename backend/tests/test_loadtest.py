@@ -0,0 +1,91 @@
+"""Tests for the load testing generator and driver"""
+
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+
+from backend.loadtest.driver import EndpointStats, parse_mix, preload, run_load
+from backend.loadtest.generator import generate_assets, generate_batches
+from backend.main import app
+from backend.src.models import AssetInput
+from backend.src.service import validate_assets_input
+from backend.src.storage import asset_count
+
+
+class TestGenerator:
+    """Test the synthetic portfolio generator"""
+
+    def test_seeded_output_is_deterministic(self):
+        """Test the same seed produces the same records"""
+        as_of = date(2026, 1, 1)
+        first = list(generate_assets(100, seed=7, as_of=as_of))
+        second = list(generate_assets(100, seed=7, as_of=as_of))
+        assert first == second
+        assert first != list(generate_assets(100, seed=8, as_of=as_of))
+
+    def test_records_are_valid_assets(self):
+        """Test generated records pass POST /asset validation"""
+        assets = [AssetInput(**record) for record in generate_assets(1000)]
+        validate_assets_input(assets)
+
+    def test_distributions(self):
+        """Test rough shape of the generated distributions"""
+        as_of = date(2026, 1, 1)
+        records = list(generate_assets(5000, seed=1, as_of=as_of))
+        past_due = sum(r["due_date"] < as_of.isoformat() for r in records)
+        assert 0.05 < past_due / len(records) < 0.15
+        mean_rate = sum(r["interest_rate"] for r in records) / len(records)
+        assert 0.04 < mean_rate < 0.09
+        assert all(r["nominal_value"] > 0 for r in records)
+
+    def test_batches(self):
+        """Test batches cover the same records as one stream"""
+        batches = list(generate_batches(250, 100, seed=3))
+        assert [len(batch) for batch in batches] == [100, 100, 50]
+        flat = [record for batch in batches for record in batch]
+        assert flat == list(generate_assets(250, seed=3))
+
+
+class TestDriver:
+    """Test the async load driver"""
+
+    def test_parse_mix(self):
+        """Test parsing endpoint weights"""
+        assert parse_mix("post_asset=1,get_insights=3") == {
+            "post_asset": 1.0,
+            "get_insights": 3.0,
+        }
+        with pytest.raises(ValueError, match="Unknown endpoint"):
+            parse_mix("delete_all=1")
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        stats = EndpointStats(latencies=[i / 1000 for i in range(1, 101)])
+        assert stats.percentile(50) == pytest.approx(50)
+        assert stats.percentile(99) == pytest.approx(99)
+
+    def test_run_load_in_process(self):
+        """Test a short mixed run against the app"""
+
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                await preload(client, 200, 100, seed=0)
+                return await run_load(
+                    client,
+                    parse_mix("post_asset=1,get_asset=1,get_insights=1"),
+                    concurrency=2,
+                    duration=0.2,
+                    batch_size=10,
+                    next_id=200,
+                )
+
+        stats, elapsed = asyncio.run(run())
+        assert elapsed > 0
+        assert sum(endpoint.requests for endpoint in stats.values()) > 0
+        assert all(endpoint.errors == 0 for endpoint in stats.values())
+        assert asset_count() >= 200
@@ -0,0 +1,119 @@
+"""Tests for structured, queue-based logging"""
+
+import io
+import json
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.config import setup_logging
+from backend.main import app
+from backend.src.logs import (
+    JsonFormatter,
+    RequestIdFilter,
+    SamplingFilter,
+    enable_queue_logging,
+    request_id_var,
+    stop_queue_logging,
+)
+
+client = TestClient(app)
+
+
+def _record(level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.makeLogRecord(
+        {"name": "test", "levelno": level, "levelname": logging.getLevelName(level)}
+    )
+    record.msg, record.args = msg, args
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter:
+    """Test JSON record formatting"""
+
+    def test_fields_and_extras(self):
+        """Test message is rendered lazily and extras are included"""
+        entry = json.loads(JsonFormatter().format(_record(asset_count=3)))
+        assert entry["message"] == "hello world"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "test"
+        assert entry["asset_count"] == 3
+
+
+class TestFilters:
+    """Test request id and sampling filters"""
+
+    def test_request_id_from_context(self):
+        """Test the current request id is attached"""
+        token = request_id_var.set("req-1")
+        try:
+            record = _record()
+            RequestIdFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+        assert record.request_id == "req-1"
+
+    def test_sampling_drops_info(self):
+        """Test INFO records are dropped at rate 0"""
+        assert SamplingFilter(0.0).filter(_record()) is False
+
+    def test_sampling_keeps_warnings(self):
+        """Test warnings are never sampled"""
+        assert SamplingFilter(0.0).filter(_record(level=logging.WARNING)) is True
+
+    def test_no_sampling_by_default(self):
+        """Test rate 1 keeps everything"""
+        assert SamplingFilter().filter(_record()) is True
+
+
+class TestQueueLogging:
+    """Test handlers are moved behind a queue"""
+
+    @pytest.fixture
+    def root_handler(self):
+        """Replace root handlers with an in-memory handler for the test"""
+        root = logging.getLogger()
+        stop_queue_logging()
+        saved = root.handlers[:]
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        root.handlers = [handler]
+        yield stream
+        stop_queue_logging()
+        root.handlers = saved
+        setup_logging()
+
+    def test_records_flow_through_queue(self, root_handler):
+        """Test records reach the original handler via the listener"""
+        enable_queue_logging([RequestIdFilter()])
+        root = logging.getLogger()
+        assert isinstance(root.handlers[0], QueueHandler)
+
+        token = request_id_var.set("req-2")
+        try:
+            logging.getLogger("backend.test").warning("queued %d", 1)
+        finally:
+            request_id_var.reset(token)
+        stop_queue_logging()
+
+        entry = json.loads(root_handler.getvalue().strip())
+        assert entry["message"] == "queued 1"
+        assert entry["request_id"] == "req-2"
+
+
+class TestRequestIdMiddleware:
+    """Test request ids on HTTP responses"""
+
+    def test_generates_request_id(self):
+        """Test a request id is generated when none is sent"""
+        response = client.get("/health")
+        assert len(response.headers["x-request-id"]) == 32
+
+    def test_propagates_request_id(self):
+        """Test an incoming X-Request-ID is echoed back"""
+        response = client.get("/health", headers={"X-Request-ID": "abc-123"})
+        assert response.headers["x-request-id"] == "abc-123"
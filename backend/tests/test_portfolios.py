@@ -0,0 +1,142 @@
+"""Tests for per-tenant portfolios"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.src import portfolios
+from backend.src.models import AssetData
+from backend.src.portfolios import Portfolio, get_portfolio, portfolio_count
+from backend.src.storage import PutResult, asset_count
+
+client = TestClient(app)
+
+
+def _asset(asset_id, nominal_value=100.0, interest_rate=0.1, due_date="2099-01-01"):
+    return {
+        "id": asset_id,
+        "nominal_value": nominal_value,
+        "due_date": due_date,
+        "interest_rate": interest_rate,
+    }
+
+
+class TestPortfolioAggregates:
+    """Test running aggregates are kept in step with the rows"""
+
+    def test_insert_update_remove(self):
+        """Test sums follow inserts, updates and deletes"""
+        portfolio = Portfolio()
+        portfolio.put(AssetData(**_asset("a", 100, 0.1)))
+        portfolio.put(AssetData(**_asset("b", 50, 0.3)))
+        assert portfolio.summary() == pytest.approx((150, 0.4, 2))
+        portfolio.put(AssetData(**_asset("a", 10, 0.2)))
+        assert portfolio.summary() == pytest.approx((60, 0.5, 2))
+        assert portfolio.remove("b")
+        assert not portfolio.remove("b")
+        assert portfolio.summary() == pytest.approx((10, 0.2, 1))
+
+    def test_empty_resets_sums(self):
+        """Test sums return to exactly zero when the book empties"""
+        portfolio = Portfolio()
+        portfolio.put(AssetData(**_asset("a", 0.1, 0.7)))
+        portfolio.put(AssetData(**_asset("a", 0.2, 0.3)))
+        portfolio.remove("a")
+        assert portfolio.summary() == (0.0, 0.0, 0)
+
+    def test_drift_corrected_periodically(self, monkeypatch):
+        """Test the sums are recomputed exactly after enough writes"""
+        monkeypatch.setattr(portfolios, "RESUM_WRITES", 4)
+        portfolio = Portfolio()
+        portfolio.put(AssetData(**_asset("big", 1e16, 0.1)))
+        portfolio.put(AssetData(**_asset("a", 1.0, 0.1)))
+        portfolio.put(AssetData(**_asset("b", 1.0, 0.1)))
+        # Each 1.0 was absorbed by the large sum
+        assert portfolio.summary()[0] == 1e16
+        portfolio.put(AssetData(**_asset("c", 1.0, 0.1)))
+        assert portfolio.summary() == (1e16 + 4.0, 0.4, 4)
+
+    def test_cancellation_resums(self):
+        """Test removing a value that dominates the sum recomputes it at once"""
+        portfolio = Portfolio()
+        portfolio.put(AssetData(**_asset("big", 1e17, 0.1)))
+        portfolio.put(AssetData(**_asset("a", 1.5, 0.1)))
+        portfolio.put(AssetData(**_asset("b", 3.25, 0.1)))
+        portfolio.remove("big")
+        assert portfolio.summary() == (4.75, 0.2, 2)
+        portfolio.put(AssetData(**_asset("a", 1e17, 0.1)))
+        portfolio.put(AssetData(**_asset("a", 1.5, 0.1)))
+        assert portfolio.summary() == (4.75, 0.2, 2)
+
+    def test_unchanged_put_is_not_a_write(self):
+        """Test re-putting identical data leaves the version and sums alone"""
+        portfolio = Portfolio()
+        assert portfolio.put(AssetData(**_asset("a"))) is PutResult.INSERTED
+        assert portfolio.put(AssetData(**_asset("a"))) is PutResult.UNCHANGED
+        assert portfolio._writes == 1
+        assert portfolio.summary() == pytest.approx((100, 0.1, 1))
+
+
+class TestPortfolioRoutes:
+    """Test /portfolios/{pid} endpoints"""
+
+    def test_portfolios_are_isolated(self):
+        """Test portfolios and the main store do not see each other's assets"""
+        client.post("/portfolios/p1/asset", json=[_asset("a", 100, 0.1)])
+        client.post(
+            "/portfolios/p2/asset",
+            json=[_asset("a", 10, 0.3), _asset("b", 20, 0.5)],
+        )
+        assert portfolio_count() == 2
+        assert asset_count() == 0
+        assert [a["id"] for a in client.get("/portfolios/p1/asset").json()] == ["a"]
+        assert len(client.get("/portfolios/p2/asset").json()) == 2
+        assert client.get("/portfolios/p1/asset/b").status_code == 404
+        assert client.get("/portfolios/p2/asset/b").json()["nominal_value"] == 20
+
+    def test_insights(self):
+        """Test insights come from the portfolio's own aggregates"""
+        client.post(
+            "/portfolios/p1/asset",
+            json=[_asset("a", 100, 0.1), _asset("b", 300, 0.3)],
+        )
+        insights = {
+            i["name"]: i["value"] for i in client.get("/portfolios/p1/insights").json()
+        }
+        assert insights["total_nominal_value"] == 400
+        assert insights["average_interest_rate"] == pytest.approx(0.2)
+
+    def test_status_filter(self):
+        """Test listing by status"""
+        client.post(
+            "/portfolios/p1/asset",
+            json=[_asset("old", due_date="2020-01-01"), _asset("new")],
+        )
+        response = client.get("/portfolios/p1/asset?status=defaulted")
+        assert [a["id"] for a in response.json()] == ["old"]
+
+    def test_unknown_portfolio(self):
+        """Test reads of a missing portfolio return 404"""
+        assert client.get("/portfolios/nope/asset").status_code == 404
+        assert client.get("/portfolios/nope/insights").status_code == 404
+        assert client.delete("/portfolios/nope").status_code == 404
+
+    def test_delete(self):
+        """Test deleting an asset and a whole portfolio"""
+        client.post("/portfolios/p1/asset", json=[_asset("a"), _asset("b")])
+        assert client.delete("/portfolios/p1/asset/a").status_code == 200
+        assert client.delete("/portfolios/p1/asset/a").status_code == 404
+        assert get_portfolio("p1").summary()[2] == 1
+        assert client.delete("/portfolios/p1").status_code == 200
+        assert get_portfolio("p1") is None
+
+    def test_validated_with_portfolio_rules(self):
+        """Test the portfolio id selects the validation rules"""
+        client.put("/rules/p1", json={"max_nominal_value": 50})
+        response = client.post("/portfolios/p1/asset", json=[_asset("a", 100)])
+        assert response.status_code == 400
+        assert "exceeds 50" in response.json()["detail"]
+        assert get_portfolio("p1") is None
+        assert (
+            client.post("/portfolios/p2/asset", json=[_asset("a")]).status_code == 200
+        )
@@ -0,0 +1,51 @@
+"""Tests for readiness tracking and startup warmup"""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.src.readiness import is_ready, reset_readiness, warmup, warmup_seconds
+
+client = TestClient(app)
+
+
+class TestReadiness:
+    """Test /ready and the warmup lifecycle"""
+
+    def test_not_ready_before_warmup(self):
+        """Test /ready returns 503 until warmup has run"""
+        reset_readiness()
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+
+    def test_health_independent_of_readiness(self):
+        """Test /health reports liveness while not ready"""
+        reset_readiness()
+        assert client.get("/health").status_code == 200
+
+    def test_ready_after_warmup(self):
+        """Test warmup marks the app ready"""
+        reset_readiness()
+        warmup(app)
+        assert is_ready()
+        assert warmup_seconds() is not None
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    def test_lifespan_runs_warmup(self):
+        """Test app startup runs warmup in the background"""
+        reset_readiness()
+        with TestClient(app) as lifespan_client:
+            deadline = time.monotonic() + 5
+            while lifespan_client.get("/ready").status_code != 200:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+        assert is_ready()
+
+    def test_openapi_includes_asset_input(self):
+        """Test the deferred AssetInput schema is added to OpenAPI"""
+        schema = client.get("/openapi.json").json()
+        assert "AssetInput" in schema["components"]["schemas"]
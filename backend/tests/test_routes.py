@@ -53,6 +53,30 @@ class TestCreateAssets:
         response = client.post("/asset", json=payload)
         assert response.status_code == 200
 
+    def test_create_reports_counts(self):
+        """Test re-posting reports inserted, updated and unchanged rows"""
+        payload = [
+            {
+                "id": "id-1",
+                "nominal_value": 100,
+                "due_date": "2025-12-04",
+                "interest_rate": 0.03,
+            },
+            {
+                "id": "id-2",
+                "nominal_value": 10,
+                "due_date": "2026-01-04",
+                "interest_rate": 0.1,
+            },
+        ]
+        response = client.post("/asset", json=payload)
+        assert response.json()["inserted"] == 2
+
+        payload[1]["nominal_value"] = 20
+        payload.append(dict(payload[0], id="id-3"))
+        body = client.post("/asset", json=payload).json()
+        assert (body["inserted"], body["updated"], body["unchanged"]) == (1, 1, 1)
+
     def test_create_asset_with_negative_nominal_value(self):
         """Test creating asset with negative nominal value"""
         payload = [
@@ -251,6 +275,36 @@ class TestGetAssets:
         assert "due_date" in asset
         assert asset["nominal_value"] == 100.5
 
+    def test_get_assets_filtered_by_status(self):
+        """Test filtering assets by status query parameter"""
+        future_date = (datetime.now(UTC) + timedelta(days=365)).strftime("%Y-%m-%d")
+        past_date = (datetime.now(UTC) - timedelta(days=10)).strftime("%Y-%m-%d")
+        payload = [
+            {
+                "id": "id-1",
+                "nominal_value": 100,
+                "due_date": future_date,
+                "interest_rate": 0.03,
+            },
+            {
+                "id": "id-2",
+                "nominal_value": 50,
+                "due_date": past_date,
+                "interest_rate": 0.05,
+            },
+        ]
+        client.post("/asset", json=payload)
+
+        response = client.get("/asset", params={"status": "defaulted"})
+        assert response.status_code == 200
+        assets = response.json()
+        assert [asset["id"] for asset in assets] == ["id-2"]
+
+    def test_get_assets_invalid_status_filter(self):
+        """Test invalid status filter is rejected"""
+        response = client.get("/asset", params={"status": "unknown"})
+        assert response.status_code == 422
+
 
 class TestGetInsights:
     """Test GET /insights endpoint"""
@@ -319,6 +373,188 @@ class TestGetInsights:
         assert abs(insights_dict["average_interest_rate"] - 0.06) < 1e-9
 
 
+class TestDashboard:
+    """Test GET /dashboard endpoint"""
+
+    def _post(self, count):
+        past = (datetime.now(UTC) - timedelta(days=10)).strftime("%Y-%m-%d")
+        future = (datetime.now(UTC) + timedelta(days=10)).strftime("%Y-%m-%d")
+        client.post(
+            "/asset",
+            json=[
+                {
+                    "id": f"id-{i:02d}",
+                    "nominal_value": 10,
+                    "due_date": past if i % 3 == 0 else future,
+                    "interest_rate": 0.05,
+                }
+                for i in range(count)
+            ],
+        )
+
+    def test_dashboard(self):
+        """Test first page, insights and status counts in one response"""
+        self._post(20)
+        response = client.get("/dashboard?limit=5")
+        assert response.status_code == 200
+        data = response.json()
+        assert [asset["id"] for asset in data["assets"]] == [
+            f"id-{i:02d}" for i in range(5)
+        ]
+        assert data["assets"][0]["status"] == "defaulted"
+        assert data["status_counts"] == {"active": 13, "defaulted": 7}
+        assert data["total"] == 20
+        insights = {i["name"]: i["value"] for i in data["insights"]}
+        assert insights["total_nominal_value"] == 200
+
+    def test_dashboard_empty(self):
+        """Test the dashboard for an empty store"""
+        data = client.get("/dashboard").json()
+        assert data == {
+            "assets": [],
+            "insights": [],
+            "status_counts": {"active": 0, "defaulted": 0},
+            "total": 0,
+        }
+
+    def test_dashboard_conditional_get(self):
+        """Test the dashboard supports ETag revalidation"""
+        self._post(3)
+        etag = client.get("/dashboard").headers["etag"]
+        response = client.get("/dashboard", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_invalid_limit(self):
+        """Test out-of-range page sizes are rejected"""
+        assert client.get("/dashboard?limit=0").status_code == 400
+
+
+class TestScenarioInsights:
+    """Test POST /insights/scenario endpoint"""
+
+    def test_scenarios(self):
+        """Test a batch of scenarios returns insights per scenario"""
+        client.post(
+            "/asset",
+            json=[
+                {
+                    "id": "id-1",
+                    "nominal_value": 100,
+                    "due_date": "2025-12-04",
+                    "interest_rate": 0.03,
+                }
+            ],
+        )
+        response = client.post(
+            "/insights/scenario",
+            json={
+                "scenarios": [
+                    {"id": "up", "shocks": [{"rate_shift": 0.005}]},
+                    {"id": "cut", "shocks": [{"haircut": 0.25}]},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        results = {
+            result["id"]: {i["name"]: i["value"] for i in result["insights"]}
+            for result in response.json()
+        }
+        assert results["up"]["average_interest_rate"] == pytest.approx(0.035)
+        assert results["cut"]["total_nominal_value"] == 75
+        assert client.get("/insights").json()[0]["value"] == 100
+
+    def test_invalid_scenario(self):
+        """Test validation errors return 400"""
+        response = client.post(
+            "/insights/scenario",
+            json={"scenarios": [{"id": "bad", "shocks": [{"haircut": 2}]}]},
+        )
+        assert response.status_code == 400
+        assert "haircut" in response.json()["detail"]
+
+
+class TestSingleAsset:
+    """Test GET/PATCH/DELETE /asset/{id} and POST /asset/lookup"""
+
+    def _create(self):
+        payload = [
+            {
+                "id": "id-1",
+                "nominal_value": 100,
+                "due_date": "2025-12-04",
+                "interest_rate": 0.03,
+            },
+            {
+                "id": "id-2",
+                "nominal_value": 10,
+                "due_date": "2026-01-04",
+                "interest_rate": 0.1,
+            },
+        ]
+        client.post("/asset", json=payload)
+
+    def test_get_asset_by_id(self):
+        """Test retrieving a single asset"""
+        self._create()
+        response = client.get("/asset/id-1")
+        assert response.status_code == 200
+        assert response.json()["id"] == "id-1"
+        assert response.json()["nominal_value"] == 100
+
+    def test_get_asset_not_found(self):
+        """Test retrieving a missing asset"""
+        response = client.get("/asset/missing")
+        assert response.status_code == 404
+
+    def test_patch_asset(self):
+        """Test partially updating an asset"""
+        self._create()
+        response = client.patch("/asset/id-1", json={"nominal_value": 250})
+        assert response.status_code == 200
+        assert response.json()["nominal_value"] == 250
+        assert response.json()["due_date"] == "2025-12-04"
+
+        insights = {i["name"]: i["value"] for i in client.get("/insights").json()}
+        assert insights["total_nominal_value"] == 260
+
+    def test_patch_asset_invalid(self):
+        """Test partial update is validated"""
+        self._create()
+        response = client.patch("/asset/id-1", json={"interest_rate": 2})
+        assert response.status_code == 400
+        assert "invalid interest_rate" in response.json()["detail"]
+
+    def test_patch_asset_not_found(self):
+        """Test updating a missing asset"""
+        response = client.patch("/asset/missing", json={"nominal_value": 1})
+        assert response.status_code == 404
+
+    def test_delete_asset(self):
+        """Test deleting an asset updates listings and insights"""
+        self._create()
+        response = client.delete("/asset/id-1")
+        assert response.status_code == 200
+        assert client.get("/asset/id-1").status_code == 404
+        assert [a["id"] for a in client.get("/asset").json()] == ["id-2"]
+
+        insights = {i["name"]: i["value"] for i in client.get("/insights").json()}
+        assert insights["total_nominal_value"] == 10
+
+    def test_delete_asset_not_found(self):
+        """Test deleting a missing asset"""
+        response = client.delete("/asset/missing")
+        assert response.status_code == 404
+
+    def test_lookup_assets(self):
+        """Test batch lookup reports found and missing ids"""
+        self._create()
+        response = client.post("/asset/lookup", json={"ids": ["id-2", "id-9"]})
+        assert response.status_code == 200
+        result = response.json()
+        assert [a["id"] for a in result["assets"]] == ["id-2"]
+        assert result["missing"] == ["id-9"]
+
+
 class TestHealthCheck:
     """Test health check endpoint"""
 
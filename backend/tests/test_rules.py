@@ -0,0 +1,167 @@
+"""Tests for the validation rules engine"""
+
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.src import rules
+from backend.src.models import AssetInput, RuleSet
+from backend.src.rules import batch_columns, compile_rules, get_checker, set_rules
+from backend.src.service import validate_assets_input
+
+client = TestClient(app)
+
+
+def _asset(asset_id="id-1", nominal_value=100, due_date=None, interest_rate=0.05):
+    if due_date is None:
+        due_date = (datetime.now(UTC).date() + timedelta(days=30)).isoformat()
+    return AssetInput(
+        id=asset_id,
+        nominal_value=nominal_value,
+        due_date=due_date,
+        interest_rate=interest_rate,
+    )
+
+
+def _check(rules: RuleSet, assets: list[AssetInput]) -> list[str]:
+    return compile_rules(rules).check(batch_columns(assets))
+
+
+class TestBaseRules:
+    """Test the checks every tenant gets"""
+
+    def test_valid_batch(self):
+        """Test a valid batch has no violations"""
+        assets = [_asset(f"id-{i}") for i in range(100)]
+        assert _check(RuleSet(), assets) == []
+
+    def test_reports_every_violation_per_row(self):
+        """Test all violations are reported, ordered by row"""
+        assets = [
+            _asset("id-1", nominal_value=-1, interest_rate=2, due_date="bad"),
+            _asset("id-2"),
+            _asset("id-1", interest_rate=-0.1),
+        ]
+        assert _check(RuleSet(), assets) == [
+            "Asset id-1 has negative nominal_value",
+            "Asset id-1 has invalid interest_rate (must be 0-1)",
+            "Invalid date format: bad. Use YYYY-MM-DD.",
+            "Asset id-1 has invalid interest_rate (must be 0-1)",
+            "Duplicate asset id: id-1",
+        ]
+
+    def test_validate_joins_messages(self):
+        """Test validate_assets_input reports all violations in one error"""
+        with pytest.raises(ValueError) as excinfo:
+            validate_assets_input([_asset(nominal_value=-1), _asset()])
+        assert str(excinfo.value) == (
+            "Asset id-1 has negative nominal_value; Duplicate asset id: id-1"
+        )
+
+
+class TestTenantRules:
+    """Test configurable rules"""
+
+    def test_value_cap(self):
+        """Test nominal values above the cap are rejected"""
+        rules = RuleSet(max_nominal_value=1000)
+        assert _check(rules, [_asset(nominal_value=1000)]) == []
+        assert _check(rules, [_asset(nominal_value=1001)]) == [
+            "Asset id-1 nominal_value exceeds 1000"
+        ]
+
+    def test_maturity_range(self):
+        """Test due dates outside the allowed range are rejected"""
+        today = datetime.now(UTC).date()
+        rules = RuleSet(min_maturity_days=0, max_maturity_days=365)
+        assets = [
+            _asset("past", due_date=(today - timedelta(days=1)).isoformat()),
+            _asset("today", due_date=today.isoformat()),
+            _asset("far", due_date=(today + timedelta(days=366)).isoformat()),
+            _asset("bad", due_date="2025-13-01"),
+        ]
+        assert _check(rules, assets) == [
+            "Asset past maturity outside allowed range (0..365 days)",
+            "Asset far maturity outside allowed range (0..365 days)",
+            "Invalid date format: 2025-13-01. Use YYYY-MM-DD.",
+        ]
+
+    def test_id_glob(self):
+        """Test the whole id must match the glob, case-sensitively"""
+        rules = RuleSet(id_glob="[A-Z][A-Z]-?*")
+        assets = [_asset("AB-1"), _asset("AB-"), _asset("ab-2")]
+        assert _check(rules, assets) == [
+            "Asset AB- id does not match [A-Z][A-Z]-?*",
+            "Asset ab-2 id does not match [A-Z][A-Z]-?*",
+        ]
+
+    def test_id_glob_matches_in_linear_time(self):
+        """Test a backtracking-prone glob stays fast on long ids"""
+        rules = RuleSet(id_glob="*a*a*a*a*a*a*a*a*b")
+        start = time.perf_counter()
+        assert len(_check(rules, [_asset("a" * 5000)])) == 1
+        assert time.perf_counter() - start < 1
+
+    def test_invalid_rules_rejected(self):
+        """Test rule sets that cannot be compiled"""
+        with pytest.raises(ValueError, match="min_maturity_days"):
+            compile_rules(RuleSet(min_maturity_days=10, max_maturity_days=1))
+
+    def test_tenants_fall_back_to_default(self):
+        """Test tenants without rules use the default tenant's rules"""
+        set_rules("default", RuleSet(max_nominal_value=10))
+        set_rules("tenant-a", RuleSet())
+        assert validate_assets_input([_asset()], "tenant-a") is None
+        with pytest.raises(ValueError, match="exceeds 10"):
+            validate_assets_input([_asset()], "tenant-b")
+
+    def test_checker_recompiled_on_change(self):
+        """Test changing rules replaces the cached checker"""
+        checker = get_checker("tenant-a")
+        set_rules("tenant-a", RuleSet(max_nominal_value=1))
+        assert get_checker("tenant-a") is not checker
+
+    def test_checkers_cached_per_rule_owner(self):
+        """Test tenants without rules share the default checker"""
+        checkers = {get_checker(f"unknown-{i}") for i in range(100)}
+        assert checkers == {get_checker()}
+        assert len(rules._checkers) == 1
+        set_rules("default", RuleSet(max_nominal_value=10))
+        assert get_checker("unknown-1") is get_checker()
+        assert get_checker("unknown-1") not in checkers
+
+
+class TestRulesRoutes:
+    """Test rule configuration over HTTP"""
+
+    def test_put_and_get(self):
+        """Test rules are stored per tenant"""
+        response = client.put("/rules/tenant-a", json={"max_nominal_value": 50})
+        assert response.status_code == 200
+        assert client.get("/rules/tenant-a").json()["max_nominal_value"] == 50
+        assert client.get("/rules/tenant-b").json()["max_nominal_value"] is None
+
+    def test_invalid_rules(self):
+        """Test unknown keys and over-long globs are rejected"""
+        response = client.put("/rules/tenant-a", json={"max_rate": 0.5})
+        assert response.status_code == 422
+        response = client.put("/rules/tenant-a", json={"id_glob": "*" * 257})
+        assert response.status_code == 422
+        response = client.put(
+            "/rules/tenant-a", json={"min_maturity_days": 2, "max_maturity_days": 1}
+        )
+        assert response.status_code == 400
+
+    def test_post_uses_tenant_header(self):
+        """Test POST /asset applies the X-Tenant-ID tenant's rules"""
+        client.put("/rules/tenant-a", json={"max_nominal_value": 50})
+        payload = [_asset().model_dump()]
+        response = client.post(
+            "/asset", json=payload, headers={"X-Tenant-ID": "tenant-a"}
+        )
+        assert response.status_code == 400
+        assert "nominal_value exceeds 50" in response.json()["detail"]
+        assert client.post("/asset", json=payload).status_code == 200
@@ -0,0 +1,129 @@
+"""Tests for asset id search"""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.src import storage
+from backend.src.models import AssetData
+from backend.src.search import IdIndex
+from backend.src.storage import (
+    begin_id_index_build,
+    build_id_index,
+    clear_assets,
+    delete_asset,
+    finish_id_index_build,
+    search_ids,
+    store_asset,
+)
+
+client = TestClient(app)
+
+
+def _store(*asset_ids):
+    for asset_id in asset_ids:
+        store_asset(
+            asset_id,
+            AssetData(
+                id=asset_id,
+                nominal_value=100,
+                due_date="2099-01-01",
+                interest_rate=0.05,
+            ),
+        )
+
+
+class TestIdIndex:
+    """Test the trigram index"""
+
+    def test_substring_matches_ranked(self):
+        """Test prefix matches come first, then shorter ids"""
+        index = IdIndex(["bond-123", "x-bond-1", "bond-1", "loan-7", "bond-12"])
+        assert index.search("bond-1", 10) == [
+            "bond-1",
+            "bond-12",
+            "bond-123",
+            "x-bond-1",
+        ]
+        assert index.search("bond-1", 2) == ["bond-1", "bond-12"]
+
+    def test_short_queries_match_prefixes(self):
+        """Test 2-character queries only match the start of ids"""
+        index = IdIndex(["ab-1", "xab-2", "ab"])
+        assert index.search("ab", 10) == ["ab", "ab-1"]
+        assert index.search("a", 10) == []
+
+    def test_all_trigrams_must_match(self):
+        """Test candidates are checked for the whole fragment"""
+        index = IdIndex(["abcXbcd", "abcd"])
+        assert index.search("abcd", 10) == ["abcd"]
+        assert index.search("zzz", 10) == []
+
+    def test_remove_and_compact(self):
+        """Test removed ids are not returned, also after compaction"""
+        index = IdIndex(f"id-{i}" for i in range(2000))
+        for i in range(1500):
+            index.remove(f"id-{i}")
+        assert len(index) == 500
+        assert index.search("id-1", 3) == ["id-1500", "id-1501", "id-1502"]
+        index.add("id-1")
+        assert index.search("id-1", 1) == ["id-1"]
+
+
+class TestStoreSearch:
+    """Test the index is kept current by storage writes"""
+
+    def test_index_follows_writes(self):
+        """Test inserts and deletes after the index is built are visible"""
+        _store("asset-1", "asset-2")
+        build_id_index()
+        assert storage._id_index is not None
+        assert search_ids("asset", 10) == ["asset-1", "asset-2"]
+        _store("asset-3", "asset-1")
+        delete_asset("asset-2")
+        assert search_ids("asset", 10) == ["asset-1", "asset-3"]
+
+    def test_writes_during_build_replayed(self):
+        """Test searches scan during a build and writes made meanwhile are kept"""
+        _store("asset-1", "asset-2")
+        generation, ids = begin_id_index_build()
+        _store("asset-3")
+        delete_asset("asset-1")
+        assert search_ids("asset", 10) == ["asset-2", "asset-3"]
+        finish_id_index_build(generation, IdIndex(ids))
+        assert storage._id_index is not None
+        assert search_ids("asset", 10) == ["asset-2", "asset-3"]
+
+    def test_build_abandoned_by_clear(self):
+        """Test a build finishing after the store was cleared is discarded"""
+        _store("asset-1")
+        generation, ids = begin_id_index_build()
+        clear_assets()
+        finish_id_index_build(generation, IdIndex(ids))
+        assert storage._id_index is None
+        assert search_ids("asset", 10) == []
+
+    def test_index_built_in_background(self):
+        """Test startup builds the index off the loop while searches are served"""
+        _store("bond-1", "bond-2")
+        with TestClient(app) as lifespan_client:
+            response = lifespan_client.get("/asset/search?q=bond")
+            assert [asset["id"] for asset in response.json()] == ["bond-1", "bond-2"]
+            deadline = time.monotonic() + 5
+            while storage._id_index is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert storage._id_index is not None
+
+    def test_endpoint(self):
+        """Test GET /asset/search returns matching assets"""
+        _store("bond-1", "bond-2", "loan-1")
+        response = client.get("/asset/search?q=nd-&limit=1")
+        assert response.status_code == 200
+        assert [asset["id"] for asset in response.json()] == ["bond-1"]
+        assert response.json()[0]["status"] == "active"
+
+    def test_endpoint_validation(self):
+        """Test short queries and bad limits return 400"""
+        assert client.get("/asset/search?q=b").status_code == 400
+        assert client.get("/asset/search?q=bond&limit=0").status_code == 400
@@ -4,14 +4,28 @@ from datetime import UTC, datetime, timedelta
 
 import pytest
 
-from backend.src.models import AssetData, AssetInput
+from backend.src.models import (
+    AssetData,
+    AssetInput,
+    AssetStatus,
+    AssetUpdate,
+    Scenario,
+    ScenarioShock,
+)
 from backend.src.service import (
     calculate_insights,
     determine_asset_status,
+    list_assets,
+    lookup_assets,
     prepare_asset_output,
+    run_scenarios,
+    scenarios_snapshot,
+    set_aggregation_workers,
+    update_asset,
     validate_assets_input,
+    validate_scenarios,
 )
-from backend.src.storage import clear_assets, store_asset
+from backend.src.storage import clear_assets, get_asset, store_asset
 
 
 class TestAssetStatus:
@@ -127,6 +141,47 @@ class TestPrepareAssetOutput:
         assert output.nominal_value == 100
 
 
+class TestUpdateAndLookup:
+    """Test partial updates and batch lookups"""
+
+    def _store(self):
+        store_asset(
+            "id-1",
+            AssetData(
+                id="id-1",
+                nominal_value=100,
+                due_date="2025-12-04",
+                interest_rate=0.05,
+            ),
+        )
+
+    def test_update_asset_merges_fields(self):
+        """Test only provided fields are changed"""
+        self._store()
+        updated = update_asset("id-1", AssetUpdate(interest_rate=0.07))
+        assert updated.interest_rate == 0.07
+        assert updated.nominal_value == 100
+        assert get_asset("id-1").interest_rate == 0.07
+
+    def test_update_missing_asset(self):
+        """Test updating a missing asset returns None"""
+        assert update_asset("missing", AssetUpdate(nominal_value=1)) is None
+
+    def test_update_asset_validates(self):
+        """Test merged asset is validated"""
+        self._store()
+        with pytest.raises(ValueError, match="negative nominal_value"):
+            update_asset("id-1", AssetUpdate(nominal_value=-1))
+        assert get_asset("id-1").nominal_value == 100
+
+    def test_lookup_assets(self):
+        """Test lookup splits found and missing ids"""
+        self._store()
+        result = lookup_assets(["id-1", "id-2"])
+        assert [a.id for a in result.assets] == ["id-1"]
+        assert result.missing == ["id-2"]
+
+
 class TestInsightsCalculation:
     """Test insights calculation"""
 
@@ -193,3 +248,151 @@ class TestInsightsCalculation:
         assert insights_dict["total_nominal_value"] == 140
         # Average: (0.03 + 0.1 + 0.05) / 3 = 0.06
         assert abs(insights_dict["average_interest_rate"] - 0.06) < 1e-9
+
+
+class TestShardedAggregation:
+    """Test per-shard aggregation and merging"""
+
+    def _store_many(self, count):
+        future_date = (datetime.now(UTC) + timedelta(days=365)).strftime("%Y-%m-%d")
+        past_date = (datetime.now(UTC) - timedelta(days=10)).strftime("%Y-%m-%d")
+        for i in range(count):
+            store_asset(
+                f"id-{i}",
+                AssetData(
+                    id=f"id-{i}",
+                    nominal_value=10,
+                    due_date=past_date if i % 2 else future_date,
+                    interest_rate=0.05,
+                ),
+            )
+
+    def test_list_assets_filtered_by_status(self):
+        """Test listing assets filtered by status"""
+        self._store_many(20)
+        assert len(list_assets()) == 20
+        defaulted = list_assets(AssetStatus.DEFAULTED)
+        assert len(defaulted) == 10
+        assert all(a.status == AssetStatus.DEFAULTED for a in defaulted)
+
+    def test_insights_with_process_pool(self):
+        """Test process pool aggregation matches in-process aggregation"""
+        self._store_many(20)
+        expected = {i.name: i.value for i in calculate_insights()}
+        set_aggregation_workers(2)
+        try:
+            pooled = {i.name: i.value for i in calculate_insights()}
+            assert len(list_assets(AssetStatus.ACTIVE)) == 10
+        finally:
+            set_aggregation_workers(0)
+        assert pooled["total_nominal_value"] == expected["total_nominal_value"] == 200
+        assert abs(pooled["average_interest_rate"] - 0.05) < 1e-9
+
+
+class TestScenarios:
+    """Test what-if scenario insights"""
+
+    @staticmethod
+    def _date(days):
+        return (datetime.now(UTC) + timedelta(days=days)).strftime("%Y-%m-%d")
+
+    def _store(self):
+        for asset_id, nominal, days, rate in (
+            ("id-1", 100, 10, 0.02),
+            ("id-2", 50, 365, 0.04),
+            ("id-3", 30, -5, 0.06),
+        ):
+            store_asset(
+                asset_id,
+                AssetData(
+                    id=asset_id,
+                    nominal_value=nominal,
+                    due_date=self._date(days),
+                    interest_rate=rate,
+                ),
+            )
+
+    @staticmethod
+    def _values(result):
+        return {insight.name: insight.value for insight in result.insights}
+
+    def test_empty_shocks_match_insights(self):
+        """Test a scenario without shocks reproduces the current insights"""
+        self._store()
+        (result,) = run_scenarios([Scenario(id="base", shocks=[])])
+        expected = {i.name: i.value for i in calculate_insights()}
+        assert result.id == "base"
+        assert self._values(result) == expected
+
+    def test_rate_shift(self):
+        """Test a rate shift moves the average rate"""
+        self._store()
+        (result,) = run_scenarios(
+            [Scenario(id="up", shocks=[ScenarioShock(rate_shift=0.005)])]
+        )
+        assert self._values(result)["average_interest_rate"] == pytest.approx(0.045)
+
+    def test_filtered_haircut(self):
+        """Test a haircut only applies to assets due within the window"""
+        self._store()
+        shock = ScenarioShock(haircut=1.0, due_within_days=30)
+        (result,) = run_scenarios([Scenario(id="default", shocks=[shock])])
+        assert self._values(result)["total_nominal_value"] == 80
+
+    def test_status_filter_after_date_shift(self):
+        """Test later shocks see due dates shifted by earlier shocks"""
+        self._store()
+        shocks = [
+            ScenarioShock(due_date_shift_days=-30),
+            ScenarioShock(status=AssetStatus.DEFAULTED, haircut=0.5),
+        ]
+        (result,) = run_scenarios([Scenario(id="late", shocks=shocks)])
+        assert self._values(result)["total_nominal_value"] == 50 + 50 + 15
+
+    def test_many_scenarios_do_not_mutate_store(self):
+        """Test scenarios are independent and leave stored assets unchanged"""
+        self._store()
+        before = calculate_insights()
+        results = run_scenarios(
+            [
+                Scenario(id="cut", shocks=[ScenarioShock(haircut=0.1)]),
+                Scenario(id="base", shocks=[]),
+            ]
+        )
+        assert self._values(results[0])["total_nominal_value"] == pytest.approx(162)
+        assert self._values(results[1])["total_nominal_value"] == 180
+        assert calculate_insights() == before
+        assert get_asset("id-1").nominal_value == 100
+
+    def test_snapshot_taken_when_called(self):
+        """Test deferred evaluation sees the store as it was when snapshotted"""
+        self._store()
+        evaluate = scenarios_snapshot([Scenario(id="base", shocks=[])])
+        clear_assets()
+        (result,) = evaluate()
+        assert self._values(result)["total_nominal_value"] == 180
+
+    def test_scenarios_with_process_pool(self):
+        """Test pooled scenario evaluation matches in-process evaluation"""
+        self._store()
+        scenarios = [Scenario(id="cut", shocks=[ScenarioShock(haircut=0.5)])]
+        expected = run_scenarios(scenarios)
+        set_aggregation_workers(2)
+        try:
+            assert run_scenarios(scenarios) == expected
+        finally:
+            set_aggregation_workers(0)
+
+    def test_no_assets(self):
+        """Test scenarios on an empty store have no insights"""
+        (result,) = run_scenarios([Scenario(id="base", shocks=[])])
+        assert result.insights == []
+
+    def test_validation(self):
+        """Test invalid scenario batches are rejected"""
+        with pytest.raises(ValueError, match="cannot be empty"):
+            validate_scenarios([])
+        with pytest.raises(ValueError, match="Duplicate scenario id"):
+            validate_scenarios([Scenario(id="a", shocks=[])] * 2)
+        with pytest.raises(ValueError, match="invalid haircut"):
+            validate_scenarios([Scenario(id="a", shocks=[ScenarioShock(haircut=1.5)])])
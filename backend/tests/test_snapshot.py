@@ -0,0 +1,205 @@
+"""Tests for snapshot files and read-only serving"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.main import app
+from backend.src import routes, storage
+from backend.src.models import AssetData
+from backend.src.service import calculate_insights, list_assets
+from backend.src.snapshot import dump_snapshot, open_snapshot
+from backend.src.storage import (
+    ReadOnlyStoreError,
+    asset_count,
+    get_asset,
+    get_shard_columns,
+    is_read_only,
+    load_snapshot,
+    scan_prefix,
+    shards,
+    store_asset,
+    unload_snapshot,
+)
+
+client = TestClient(app)
+
+
+def _store(count):
+    for i in range(count):
+        store_asset(
+            f"id-{i}",
+            AssetData(
+                id=f"id-{i}",
+                nominal_value=10 * i,
+                due_date="2020-01-05" if i % 2 else "2099-12-31",
+                interest_rate=i / 100,
+            ),
+        )
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    """Dump 20 assets to a snapshot file"""
+    _store(20)
+    path = str(tmp_path / "assets.snapshot")
+    dump_snapshot(path, get_shard_columns())
+    return path
+
+
+@pytest.fixture
+def read_only(snapshot_path):
+    """Serve the snapshot in read-only mode for the test"""
+    expected = (list_assets(), calculate_insights())
+    load_snapshot(snapshot_path)
+    yield expected
+    unload_snapshot()
+
+
+class TestSnapshotFile:
+    """Test the snapshot file format"""
+
+    def test_round_trip(self, snapshot_path):
+        """Test mapped shards hold the dumped rows, sorted by id"""
+        mapped = open_snapshot(snapshot_path)
+        assert len(mapped) == len(shards)
+        for shard, original in zip(mapped, shards):
+            assert shard.ids == sorted(original.ids)
+            assert sorted(shard.snapshot().nominal_values) == sorted(
+                original.nominal_values
+            )
+
+    def test_binary_search_lookup(self, snapshot_path):
+        """Test ids are found by binary search in the mapped ids"""
+        mapped = open_snapshot(snapshot_path)
+        shard = next(shard for shard in mapped if "id-7" in shard)
+        asset = shard.get("id-7")
+        assert asset.nominal_value == 70
+        assert asset.due_date == "2020-01-05"
+        assert shard.get("id-70") is None
+
+    def test_not_a_snapshot(self, tmp_path):
+        """Test other files are rejected"""
+        path = tmp_path / "other"
+        path.write_bytes(b"not a snapshot file")
+        with pytest.raises(ValueError, match="Not a snapshot file"):
+            open_snapshot(str(path))
+
+    def test_concurrent_dumps(self, tmp_path):
+        """Test concurrent dumps to one path all succeed and leave no temp files"""
+        _store(20)
+        path = str(tmp_path / "assets.snapshot")
+        columns = get_shard_columns()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            sizes = list(executor.map(lambda _: dump_snapshot(path, columns), range(8)))
+        assert len(set(sizes)) == 1
+        assert sum(len(shard) for shard in open_snapshot(path)) == 20
+        assert os.listdir(tmp_path) == ["assets.snapshot"]
+
+    def test_mapped_shard_rejects_writes(self, snapshot_path):
+        """Test mapped shards cannot be modified"""
+        shard = open_snapshot(snapshot_path)[0]
+        with pytest.raises(ReadOnlyStoreError):
+            shard.remove("id-1")
+
+
+class TestReadOnlyStore:
+    """Test serving reads from a mapped snapshot"""
+
+    def test_reads_match_original_store(self, read_only):
+        """Test listings, insights and lookups are served from the snapshot"""
+        expected_assets, expected_insights = read_only
+        assert is_read_only()
+        assert asset_count() == 20
+        by_id = {asset.id: asset for asset in expected_assets}
+        assert {asset.id: asset for asset in list_assets()} == by_id
+        assert calculate_insights() == expected_insights
+        assert get_asset("id-3").interest_rate == 0.03
+        assert scan_prefix("id-1", limit=3) == ["id-1", "id-10", "id-11"]
+
+    def test_store_writes_rejected(self, read_only):
+        """Test storage writes raise while read-only"""
+        with pytest.raises(ReadOnlyStoreError):
+            _store(1)
+
+    def test_http_reads(self, read_only):
+        """Test GET endpoints serve the snapshot"""
+        assert len(client.get("/asset").json()) == 20
+        assert client.get("/asset/id-4").json()["nominal_value"] == 40
+        assert len(client.get("/insights").json()) == 2
+
+    def test_http_writes_rejected(self, read_only):
+        """Test write endpoints return 403"""
+        payload = [
+            {
+                "id": "id-1",
+                "nominal_value": 1,
+                "due_date": "2099-01-01",
+                "interest_rate": 0.01,
+            }
+        ]
+        assert client.post("/asset", json=payload).status_code == 403
+        assert client.delete("/asset/id-1").status_code == 403
+        assert client.patch("/asset/id-1", json={}).status_code == 403
+        assert client.post("/snapshot").status_code == 403
+
+    def test_etag_identifies_dump(self, snapshot_path, tmp_path):
+        """Test replicas of one dump agree on ETags and a new dump changes them"""
+        load_snapshot(snapshot_path)
+        etag = client.get("/asset").headers["etag"]
+        unload_snapshot()
+        load_snapshot(snapshot_path)
+        assert client.get("/asset").headers["etag"] == etag
+
+        unload_snapshot()
+        _store(21)
+        other_path = str(tmp_path / "other.snapshot")
+        dump_snapshot(other_path, get_shard_columns())
+        load_snapshot(other_path)
+        response = client.get("/asset", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        unload_snapshot()
+
+    def test_unload(self, snapshot_path):
+        """Test the store becomes writable and empty again"""
+        load_snapshot(snapshot_path)
+        unload_snapshot()
+        assert not is_read_only()
+        assert asset_count() == 0
+
+    def test_startup_leaves_search_index_to_first_search(
+        self, snapshot_path, monkeypatch
+    ):
+        """Test a replica does not build the search index until it is used"""
+        monkeypatch.setattr(main, "READ_ONLY", True)
+        monkeypatch.setattr(main, "SNAPSHOT_PATH", snapshot_path)
+        try:
+            with TestClient(app) as lifespan_client:
+                assert storage._id_index is None
+                assert storage._id_index_log is None
+                response = lifespan_client.get("/asset/search?q=id-1")
+                assert response.json()[0]["id"] == "id-1"
+                deadline = time.monotonic() + 5
+                while storage._id_index is None and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            assert storage._id_index is not None
+        finally:
+            unload_snapshot()
+
+
+class TestSnapshotEndpoint:
+    """Test POST /snapshot"""
+
+    def test_dump(self, tmp_path, monkeypatch):
+        """Test the store is written to SNAPSHOT_PATH"""
+        path = str(tmp_path / "dump.snapshot")
+        monkeypatch.setattr(routes, "SNAPSHOT_PATH", path)
+        _store(5)
+        response = client.post("/snapshot")
+        assert response.status_code == 200
+        assert response.json()["asset_count"] == 5
+        assert sum(len(shard) for shard in open_snapshot(path)) == 5
@@ -4,10 +4,20 @@ import pytest
 
 from backend.src.models import AssetData
 from backend.src.storage import (
+    PutResult,
+    add_change_listener,
     asset_count,
     clear_assets,
+    delete_asset,
     get_all_assets,
     get_asset,
+    get_assets_by_id,
+    get_shard_columns,
+    remove_change_listener,
+    scan_prefix,
+    shard_index,
+    shards,
+    storage_version,
     store_asset,
 )
 
@@ -98,3 +108,187 @@ class TestStorage:
 
         store_asset("id-1", data2)
         assert get_asset("id-1").nominal_value == 200
+
+    def test_put_results(self):
+        """Test inserts, updates and no-op upserts are told apart"""
+        data = AssetData(
+            id="id-1", nominal_value=100, due_date="2025-12-04", interest_rate=0.05
+        )
+        assert store_asset("id-1", data) is PutResult.INSERTED
+        assert store_asset("id-1", data.model_copy()) is PutResult.UNCHANGED
+        changed = data.model_copy(update={"due_date": "2025-12-05"})
+        assert store_asset("id-1", changed) is PutResult.UPDATED
+
+    def test_unchanged_upsert_is_not_a_write(self):
+        """Test a no-op upsert keeps the version and notifies no listeners"""
+        data = AssetData(
+            id="id-1", nominal_value=100, due_date="2025-12-04", interest_rate=0.05
+        )
+        store_asset("id-1", data)
+        version = storage_version()
+        calls = []
+
+        def listener():
+            calls.append(1)
+
+        add_change_listener(listener)
+        try:
+            store_asset("id-1", data)
+            assert storage_version() == version
+            assert calls == []
+            store_asset("id-1", data.model_copy(update={"interest_rate": 0.06}))
+            assert storage_version() == version + 1
+            assert calls == [1]
+        finally:
+            remove_change_listener(listener)
+
+    def test_delete_asset(self):
+        """Test deleting an asset"""
+        store_asset(
+            "id-1",
+            AssetData(
+                id="id-1", nominal_value=100, due_date="2025-12-04", interest_rate=0.05
+            ),
+        )
+        version = storage_version()
+        assert delete_asset("id-1") is True
+        assert get_asset("id-1") is None
+        assert asset_count() == 0
+        assert storage_version() > version
+
+    def test_delete_missing_asset(self):
+        """Test deleting a non-existent asset does not change the version"""
+        version = storage_version()
+        assert delete_asset("non-existent") is False
+        assert storage_version() == version
+
+    def test_get_assets_by_id(self):
+        """Test batch retrieval keeps order and maps missing ids to None"""
+        data = AssetData(
+            id="id-1", nominal_value=100, due_date="2025-12-04", interest_rate=0.05
+        )
+        store_asset("id-1", data)
+        assert get_assets_by_id(["missing", "id-1"]) == [None, data]
+
+
+class TestSharding:
+    """Test shard partitioning of the store"""
+
+    def test_shard_index_is_stable(self):
+        """Test the same id always maps to the same shard"""
+        assert shard_index("id-1") == shard_index("id-1")
+        assert 0 <= shard_index("id-1") < len(shards)
+
+    def test_asset_stored_in_its_shard(self):
+        """Test an asset is written only to its own shard"""
+        data = AssetData(
+            id="id-1", nominal_value=100, due_date="2025-12-04", interest_rate=0.05
+        )
+        store_asset("id-1", data)
+        for index, shard in enumerate(shards):
+            assert ("id-1" in shard) == (index == shard_index("id-1"))
+
+    def test_get_shard_columns(self):
+        """Test shard snapshot contains every asset exactly once"""
+        for i in range(50):
+            store_asset(
+                f"id-{i}",
+                AssetData(
+                    id=f"id-{i}",
+                    nominal_value=i,
+                    due_date="2025-12-04",
+                    interest_rate=0.05,
+                ),
+            )
+        grouped = get_shard_columns()
+        assert len(grouped) == len(shards)
+        assert sorted(i for columns in grouped for i in columns.ids) == sorted(
+            f"id-{i}" for i in range(50)
+        )
+
+    def test_snapshot_is_isolated_from_writes(self):
+        """Test later writes do not change an existing snapshot"""
+        data = AssetData(
+            id="id-1", nominal_value=100, due_date="2025-12-04", interest_rate=0.05
+        )
+        store_asset("id-1", data)
+        columns = get_shard_columns()[shard_index("id-1")]
+        store_asset("id-1", data.model_copy(update={"nominal_value": 1}))
+        assert list(columns.nominal_values) == [100]
+
+
+class TestColumnarLayout:
+    """Test the compact id index and columnar rows"""
+
+    def _store(self, asset_id, nominal_value=100, due_date="2025-12-04"):
+        store_asset(
+            asset_id,
+            AssetData(
+                id=asset_id,
+                nominal_value=nominal_value,
+                due_date=due_date,
+                interest_rate=0.05,
+            ),
+        )
+
+    def test_id_stored_once(self):
+        """Test the index key and the ids column share one string object"""
+        self._store("id-1")
+        shard = shards[shard_index("id-1")]
+        key = next(k for k in shard.index if k == "id-1")
+        assert key is shard.ids[shard.index["id-1"]]
+
+    def test_dates_are_shared(self):
+        """Test rows with the same due date share one string"""
+        self._store("a1", due_date="2030-01-01")
+        self._store("a2", due_date="2030-01-01")
+        first, second = get_asset("a1"), get_asset("a2")
+        assert first.due_date is second.due_date
+
+    def test_delete_keeps_rows_dense(self):
+        """Test swap-remove keeps the index consistent"""
+        for i in range(200):
+            self._store(f"id-{i}", nominal_value=i)
+        for i in range(0, 200, 3):
+            assert delete_asset(f"id-{i}")
+        for i in range(200):
+            asset = get_asset(f"id-{i}")
+            if i % 3 == 0:
+                assert asset is None
+            else:
+                assert asset.nominal_value == i
+        for shard in shards:
+            assert len(shard.index) == len(shard.ids) == len(shard.nominal_values)
+
+    def test_invalid_date_rejected(self):
+        """Test storing an invalid date raises ValueError"""
+        with pytest.raises(ValueError, match="Invalid date format"):
+            self._store("id-1", due_date="2025/12/04")
+        assert asset_count() == 0
+
+    def test_scan_prefix(self):
+        """Test prefix range scans return sorted matching ids"""
+        for asset_id in ("asset-10", "asset-2", "asset-1", "bond-1", "asset"):
+            self._store(asset_id)
+        assert scan_prefix("asset-1") == ["asset-1", "asset-10"]
+        assert scan_prefix("asset", limit=2) == ["asset", "asset-1"]
+        assert scan_prefix("zzz") == []
+
+    def test_scan_prefix_sees_writes(self):
+        """Test writes since the last scan are merged into the sorted ids"""
+        for i in range(5):
+            self._store(f"asset-{i}")
+        assert scan_prefix("asset") == [f"asset-{i}" for i in range(5)]
+        self._store("asset-9")
+        delete_asset("asset-1")
+        delete_asset("asset-2")
+        self._store("asset-2")
+        self._store("asset-7")
+        delete_asset("asset-7")
+        assert scan_prefix("asset") == [
+            "asset-0",
+            "asset-2",
+            "asset-3",
+            "asset-4",
+            "asset-9",
+        ]
@@ -0,0 +1,153 @@
+"""Tests for binary wire formats"""
+
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.src import wire
+
+client = TestClient(app)
+
+PAYLOAD = [
+    {
+        "id": "id-1",
+        "nominal_value": 100,
+        "due_date": "2025-12-04",
+        "interest_rate": 0.03,
+    },
+    {
+        "id": "id-2",
+        "nominal_value": 10,
+        "due_date": "2026-01-04",
+        "interest_rate": 0.1,
+    },
+]
+
+
+class TestNegotiation:
+    """Test wire format negotiation"""
+
+    def test_default_json(self):
+        """Test JSON is used without an Accept header"""
+        assert wire.negotiate_format(None) == wire.JSON
+        assert wire.negotiate_format("*/*") == wire.JSON
+
+    def test_msgpack_accept(self):
+        """Test MessagePack is selected via Accept"""
+        assert wire.negotiate_format("application/msgpack") == wire.MSGPACK
+        assert wire.negotiate_format("application/x-msgpack") == wire.MSGPACK
+
+    def test_q_values(self):
+        """Test the highest weighted supported format wins"""
+        accept = "application/msgpack;q=0.5, application/json"
+        assert wire.negotiate_format(accept) == wire.JSON
+
+    def test_unsupported_content_type(self):
+        """Test unsupported request bodies are rejected"""
+        with pytest.raises(ValueError, match="Unsupported content type"):
+            wire.request_format("text/csv")
+
+
+class TestDecodeRows:
+    """Test decoding binary bodies"""
+
+    def test_columnar_body(self):
+        """Test a map of columns is decoded into rows"""
+        body = msgpack.packb({"id": ["a", "b"], "nominal_value": [1.0, 2.0]})
+        rows = wire.decode_rows(body, wire.MSGPACK)
+        assert rows == [
+            {"id": "a", "nominal_value": 1.0},
+            {"id": "b", "nominal_value": 2.0},
+        ]
+
+    def test_row_body(self):
+        """Test a list of row maps is passed through"""
+        rows = wire.decode_rows(msgpack.packb(PAYLOAD), wire.MSGPACK)
+        assert rows == PAYLOAD
+
+    def test_uneven_columns(self):
+        """Test columns of different length are rejected"""
+        body = msgpack.packb({"id": ["a", "b"], "nominal_value": [1.0]})
+        with pytest.raises(ValueError, match="equal length"):
+            wire.decode_rows(body, wire.MSGPACK)
+
+    def test_invalid_body(self):
+        """Test malformed MessagePack is rejected"""
+        with pytest.raises(ValueError, match="Invalid MessagePack"):
+            wire.decode_rows(b"\xc1", wire.MSGPACK)
+
+
+class TestMsgpackEndpoints:
+    """Test MessagePack on POST and GET /asset"""
+
+    def test_post_msgpack_rows(self):
+        """Test posting assets as MessagePack rows"""
+        response = client.post(
+            "/asset",
+            content=msgpack.packb(PAYLOAD),
+            headers={"Content-Type": wire.MSGPACK},
+        )
+        assert response.status_code == 200
+        assert len(client.get("/asset").json()) == 2
+
+    def test_post_msgpack_columns(self):
+        """Test posting assets as MessagePack columns"""
+        columns = {name: [row[name] for row in PAYLOAD] for name in PAYLOAD[0]}
+        response = client.post(
+            "/asset",
+            content=msgpack.packb(columns),
+            headers={"Content-Type": wire.MSGPACK},
+        )
+        assert response.status_code == 200
+        assert len(client.get("/asset").json()) == 2
+
+    def test_post_msgpack_missing_field(self):
+        """Test schema errors in binary bodies return 422"""
+        response = client.post(
+            "/asset",
+            content=msgpack.packb([{"id": "id-1"}]),
+            headers={"Content-Type": wire.MSGPACK},
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][0] == "body"
+
+    def test_post_unsupported_media_type(self):
+        """Test unsupported content types return 415"""
+        response = client.post(
+            "/asset", content=b"id,value", headers={"Content-Type": "text/csv"}
+        )
+        assert response.status_code == 415
+
+    def test_get_msgpack(self):
+        """Test GET /asset returns columnar MessagePack"""
+        client.post("/asset", json=PAYLOAD)
+        response = client.get("/asset", headers={"Accept": wire.MSGPACK})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == wire.MSGPACK
+        columns = msgpack.unpackb(response.content)
+        assert sorted(columns["id"]) == ["id-1", "id-2"]
+        assert set(columns) == {"id", "nominal_value", "status", "due_date"}
+
+    def test_get_msgpack_etag_differs_from_json(self):
+        """Test binary and JSON bodies have different ETags"""
+        client.post("/asset", json=PAYLOAD)
+        json_etag = client.get("/asset").headers["etag"]
+        msgpack_etag = client.get("/asset", headers={"Accept": wire.MSGPACK}).headers[
+            "etag"
+        ]
+        assert json_etag != msgpack_etag
+
+
+class TestArrow:
+    """Test Arrow IPC when pyarrow is installed"""
+
+    def test_arrow_roundtrip(self):
+        """Test encoding and decoding an Arrow IPC stream"""
+        pytest.importorskip("pyarrow")
+        columns = {"id": ["a", "b"], "nominal_value": [1.0, 2.0]}
+        body = wire.encode_columns(columns, wire.ARROW)
+        assert wire.decode_rows(body, wire.ARROW) == [
+            {"id": "a", "nominal_value": 1.0},
+            {"id": "b", "nominal_value": 2.0},
+        ]
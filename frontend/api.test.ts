@@ -73,6 +73,118 @@ describe("API Module", () => {
     });
   });
 
+  describe("getDashboard", () => {
+    it("fetches the dashboard successfully", async () => {
+      const mockDashboard = {
+        assets: [
+          {
+            id: "id-1",
+            nominal_value: 100,
+            status: AssetStatus.ACTIVE,
+            due_date: "2025-12-04",
+          },
+        ],
+        insights: [{ id: "insight-1", name: "total_nominal_value", value: 100 }],
+        status_counts: { active: 1, defaulted: 0 },
+        total: 1,
+      };
+
+      vi.mocked(fetch).mockResolvedValue({
+        ok: true,
+        json: async () => mockDashboard,
+      } as Response);
+
+      const result = await api.getDashboard(10);
+
+      expect(result).toEqual(mockDashboard);
+      expect(fetch).toHaveBeenCalledWith(
+        "http://localhost:8000/dashboard?limit=10"
+      );
+    });
+
+    it("throws error on fetch failure", async () => {
+      vi.mocked(fetch).mockResolvedValue({
+        ok: false,
+        statusText: "Server Error",
+      } as Response);
+
+      await expect(api.getDashboard()).rejects.toThrow(
+        "Failed to fetch dashboard: Server Error"
+      );
+    });
+  });
+
+  describe("searchAssets", () => {
+    it("searches assets by id fragment", async () => {
+      const mockAssets = [
+        {
+          id: "bond-1",
+          nominal_value: 100,
+          status: AssetStatus.ACTIVE,
+          due_date: "2025-12-04",
+        },
+      ];
+
+      vi.mocked(fetch).mockResolvedValue({
+        ok: true,
+        json: async () => mockAssets,
+      } as Response);
+
+      const result = await api.searchAssets("bond 1", 5);
+
+      expect(result).toEqual(mockAssets);
+      expect(fetch).toHaveBeenCalledWith(
+        "http://localhost:8000/asset/search?q=bond+1&limit=5"
+      );
+    });
+
+    it("throws error on fetch failure", async () => {
+      vi.mocked(fetch).mockResolvedValue({
+        ok: false,
+        statusText: "Bad Request",
+      } as Response);
+
+      await expect(api.searchAssets("b")).rejects.toThrow(
+        "Failed to search assets: Bad Request"
+      );
+    });
+  });
+
+  describe("subscribeInsights", () => {
+    it("forwards insight updates and closes on unsubscribe", () => {
+      const sockets: Array<{
+        url: string;
+        onmessage: ((event: { data: string }) => void) | null;
+        close: ReturnType<typeof vi.fn>;
+      }> = [];
+      vi.stubGlobal(
+        "WebSocket",
+        vi.fn(function (this: any, url: string) {
+          this.url = url;
+          this.onmessage = null;
+          this.close = vi.fn();
+          sockets.push(this);
+        })
+      );
+      const update = {
+        type: "delta",
+        version: 3,
+        insights: [{ id: "insight-1", name: "total_nominal_value", value: 150 }],
+        changes: { total_nominal_value: 50 },
+      };
+      const onUpdate = vi.fn();
+
+      const unsubscribe = api.subscribeInsights(onUpdate);
+      sockets[0].onmessage?.({ data: JSON.stringify(update) });
+      unsubscribe();
+
+      expect(sockets[0].url).toBe("ws://localhost:8000/ws/insights");
+      expect(onUpdate).toHaveBeenCalledWith(update);
+      expect(sockets[0].close).toHaveBeenCalled();
+      vi.unstubAllGlobals();
+    });
+  });
+
   describe("createAssets", () => {
     it("creates assets successfully", async () => {
       const newAssets = [
@@ -16,6 +16,21 @@ export interface Insight {
   value: number;
 }
 
+export interface DashboardData {
+  assets: Asset[];
+  insights: Insight[];
+  status_counts: Record<AssetStatus, number>;
+  total: number;
+}
+
+export interface InsightsUpdate {
+  type: "snapshot" | "delta";
+  version: number;
+  insights: Insight[];
+  // Difference from the previous update, per insight name (deltas only)
+  changes?: Record<string, number>;
+}
+
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
 export async function getAssets(): Promise<Asset[]> {
@@ -34,6 +49,32 @@ export async function getInsights(): Promise<Insight[]> {
   return response.json();
 }
 
+// Receive the insights now and after every change; returns an unsubscribe function
+export function subscribeInsights(
+  onUpdate: (update: InsightsUpdate) => void
+): () => void {
+  const socket = new WebSocket(`${API_BASE_URL.replace(/^http/, "ws")}/ws/insights`);
+  socket.onmessage = (event) => onUpdate(JSON.parse(event.data));
+  return () => socket.close();
+}
+
+export async function getDashboard(limit = 50): Promise<DashboardData> {
+  const response = await fetch(`${API_BASE_URL}/dashboard?limit=${limit}`);
+  if (!response.ok) {
+    throw new Error(`Failed to fetch dashboard: ${response.statusText}`);
+  }
+  return response.json();
+}
+
+export async function searchAssets(query: string, limit = 20): Promise<Asset[]> {
+  const params = new URLSearchParams({ q: query, limit: String(limit) });
+  const response = await fetch(`${API_BASE_URL}/asset/search?${params}`);
+  if (!response.ok) {
+    throw new Error(`Failed to search assets: ${response.statusText}`);
+  }
+  return response.json();
+}
+
 export async function createAssets(assets: Array<{
   id: string;
   nominal_value: number;
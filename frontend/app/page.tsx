@@ -1,5 +1,5 @@
 import type { Metadata } from "next";
-import { InsightsDisplay } from "@/components/insights-display";
+import { Dashboard } from "@/components/dashboard";
 
 export const metadata: Metadata = {
   title: "Insights | Dashboard",
@@ -11,7 +11,7 @@ export default function InsightsPage() {
     <div>
       <h2>Portfolio Insights</h2>
       <p>Key metrics for your investment portfolio:</p>
-      <InsightsDisplay />
+      <Dashboard />
     </div>
   );
 }
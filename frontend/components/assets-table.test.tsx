@@ -227,4 +227,37 @@ describe("AssetsTable Component", () => {
       expect(defaultedStatus).toBeTruthy();
     });
   });
+
+  it("searches assets by id on the server", async () => {
+    const user = userEvent.setup();
+    vi.mocked(api.getAssets).mockResolvedValue([
+      {
+        id: "id-1",
+        nominal_value: 100,
+        status: AssetStatus.ACTIVE,
+        due_date: "2025-12-04",
+      },
+    ]);
+    vi.mocked(api.searchAssets).mockResolvedValue([
+      {
+        id: "bond-12",
+        nominal_value: 75,
+        status: AssetStatus.ACTIVE,
+        due_date: "2026-01-04",
+      },
+    ]);
+
+    render(<AssetsTable />);
+    await waitFor(() => {
+      expect(screen.getByText("id-1")).toBeTruthy();
+    });
+
+    await user.type(screen.getByLabelText("Search by ID:"), "bond-12");
+
+    await waitFor(() => {
+      expect(screen.getByText("bond-12")).toBeTruthy();
+      expect(screen.queryByText("id-1")).toBeNull();
+    });
+    expect(api.searchAssets).toHaveBeenLastCalledWith("bond-12", 100);
+  });
 });
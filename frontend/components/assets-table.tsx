@@ -1,31 +1,46 @@
 "use client";
 
 import React, { useEffect, useState, useCallback, useMemo } from "react";
-import { Asset, getAssets } from "@/api";
+import { Asset, getAssets, searchAssets } from "@/api";
 import styles from "./assets-table.module.css";
 
 type SortColumn = "id" | "nominal_value" | "due_date" | "status";
 type SortDirection = "asc" | "desc";
 
+// Shorter queries are not searched (the server needs at least 2 characters)
+const MIN_SEARCH_LENGTH = 2;
+const SEARCH_DELAY_MS = 200;
+
 interface TableState {
   sortColumn: SortColumn;
   sortDirection: SortDirection;
   filterStatus: string;
 }
 
-export function AssetsTable() {
-  const [assets, setAssets] = useState<Asset[]>([]);
-  const [loading, setLoading] = useState(true);
+interface AssetsTableProps {
+  // Assets already loaded by the parent; fetched from the API when omitted
+  assets?: Asset[];
+}
+
+export function AssetsTable({ assets: initialAssets }: AssetsTableProps) {
+  const [assets, setAssets] = useState<Asset[]>(initialAssets ?? []);
+  const [loading, setLoading] = useState(initialAssets === undefined);
   const [error, setError] = useState<string | null>(null);
   const [tableState, setTableState] = useState<TableState>({
     sortColumn: "id",
     sortDirection: "asc",
     filterStatus: "all",
   });
+  const [query, setQuery] = useState("");
+  const [searchResults, setSearchResults] = useState<Asset[] | null>(null);
 
   useEffect(() => {
-    fetchAssets();
-  }, []);
+    if (initialAssets === undefined) {
+      fetchAssets();
+    } else {
+      setAssets(initialAssets);
+    }
+  }, [initialAssets]);
 
   const fetchAssets = useCallback(async () => {
     try {
@@ -40,6 +55,33 @@ export function AssetsTable() {
     }
   }, []);
 
+  useEffect(() => {
+    if (query.length < MIN_SEARCH_LENGTH) {
+      setSearchResults(null);
+      return;
+    }
+    // Wait for typing to pause, and ignore responses for outdated queries
+    let current = true;
+    const timer = setTimeout(() => {
+      searchAssets(query, 100)
+        .then((results) => {
+          if (current) {
+            setSearchResults(results);
+            setError(null);
+          }
+        })
+        .catch((err) => {
+          if (current) {
+            setError(err instanceof Error ? err.message : "Failed to search assets");
+          }
+        });
+    }, SEARCH_DELAY_MS);
+    return () => {
+      current = false;
+      clearTimeout(timer);
+    };
+  }, [query]);
+
   const handleSort = useCallback((column: SortColumn) => {
     setTableState((prev) => ({
       ...prev,
@@ -58,12 +100,16 @@ export function AssetsTable() {
     }));
   }, []);
 
+  const handleQueryChange = useCallback((e: React.ChangeEvent<HTMLInputElement>) => {
+    setQuery(e.target.value.trim());
+  }, []);
+
   const filteredAssets = useMemo(() => {
-    return assets.filter(
+    return (searchResults ?? assets).filter(
       (asset) =>
         tableState.filterStatus === "all" || asset.status === tableState.filterStatus
     );
-  }, [assets, tableState.filterStatus]);
+  }, [assets, searchResults, tableState.filterStatus]);
 
   const sortedAssets = useMemo(() => {
     return [...filteredAssets].sort((a, b) => {
@@ -102,6 +148,13 @@ export function AssetsTable() {
           <option value="active">Active</option>
           <option value="defaulted">Defaulted</option>
         </select>
+        <label htmlFor="id-search">Search by ID:</label>
+        <input
+          id="id-search"
+          type="search"
+          placeholder="e.g. bond-12"
+          onChange={handleQueryChange}
+        />
       </div>
 
       <table className={styles.table}>
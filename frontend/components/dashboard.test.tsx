@@ -0,0 +1,67 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
+import { render, screen, waitFor } from "@testing-library/react";
+import { Dashboard } from "@/components/dashboard";
+import * as api from "@/api";
+import { AssetStatus } from "@/api";
+
+// Mock the API module
+vi.mock("@/api");
+
+describe("Dashboard Component", () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+    vi.mocked(api.subscribeInsights).mockReturnValue(() => {});
+  });
+
+  afterEach(() => {
+    vi.resetAllMocks();
+  });
+
+  it("renders loading state initially", () => {
+    vi.mocked(api.getDashboard).mockImplementation(
+      () => new Promise(() => {}) // Never resolves
+    );
+
+    render(<Dashboard />);
+    expect(screen.getByText("Loading dashboard...")).toBeTruthy();
+  });
+
+  it("renders error state when API fails", async () => {
+    const errorMessage = "Failed to fetch dashboard";
+    vi.mocked(api.getDashboard).mockRejectedValue(new Error(errorMessage));
+
+    render(<Dashboard />);
+
+    await waitFor(() => {
+      expect(screen.getByText(new RegExp(errorMessage))).toBeTruthy();
+    });
+  });
+
+  it("renders insights, counts and assets from one request", async () => {
+    vi.mocked(api.getDashboard).mockResolvedValue({
+      assets: [
+        {
+          id: "id-1",
+          nominal_value: 100,
+          status: AssetStatus.ACTIVE,
+          due_date: "2025-12-04",
+        },
+      ],
+      insights: [{ id: "insight-1", name: "total_nominal_value", value: 140 }],
+      status_counts: { active: 2, defaulted: 1 },
+      total: 3,
+    });
+
+    render(<Dashboard />);
+
+    await waitFor(() => {
+      expect(screen.getByText("Total Nominal Value")).toBeTruthy();
+      expect(screen.getByText("id-1")).toBeTruthy();
+      expect(screen.getByText(/3 assets: 2 active/)).toBeTruthy();
+      expect(screen.getByText(/View all assets/)).toBeTruthy();
+    });
+    expect(api.getDashboard).toHaveBeenCalledTimes(1);
+    expect(api.getInsights).not.toHaveBeenCalled();
+    expect(api.getAssets).not.toHaveBeenCalled();
+  });
+});
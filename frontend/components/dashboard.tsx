@@ -0,0 +1,63 @@
+"use client";
+
+import React, { useEffect, useState, useCallback } from "react";
+import { DashboardData, getDashboard } from "@/api";
+import { AssetsTable } from "@/components/assets-table";
+import { InsightsDisplay } from "@/components/insights-display";
+import styles from "./dashboard.module.css";
+
+// Number of assets shown on the dashboard
+const PAGE_SIZE = 50;
+
+export function Dashboard() {
+  const [dashboard, setDashboard] = useState<DashboardData | null>(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState<string | null>(null);
+
+  const fetchDashboard = useCallback(async () => {
+    try {
+      setLoading(true);
+      const data = await getDashboard(PAGE_SIZE);
+      setDashboard(data);
+      setError(null);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : "Failed to fetch dashboard");
+    } finally {
+      setLoading(false);
+    }
+  }, []);
+
+  useEffect(() => {
+    fetchDashboard();
+  }, []);
+
+  if (loading) {
+    return <div className={styles.container}>Loading dashboard...</div>;
+  }
+
+  if (error || !dashboard) {
+    return <div className={styles.error}>Error: {error}</div>;
+  }
+
+  return (
+    <div className={styles.container}>
+      <InsightsDisplay insights={dashboard.insights} />
+
+      <div className={styles.counts}>
+        {dashboard.total} assets: {dashboard.status_counts.active} active,{" "}
+        {dashboard.status_counts.defaulted} defaulted
+      </div>
+
+      {dashboard.total > 0 && (
+        <>
+          <AssetsTable assets={dashboard.assets} />
+          {dashboard.total > dashboard.assets.length && (
+            <a className={styles.more} href="/assets">
+              Showing the first {dashboard.assets.length} assets. View all assets
+            </a>
+          )}
+        </>
+      )}
+    </div>
+  );
+}
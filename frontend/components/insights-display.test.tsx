@@ -9,6 +9,7 @@ vi.mock("@/api");
 describe("InsightsDisplay Component", () => {
   beforeEach(() => {
     vi.clearAllMocks();
+    vi.mocked(api.subscribeInsights).mockReturnValue(() => {});
   });
 
   afterEach(() => {
@@ -124,4 +125,24 @@ describe("InsightsDisplay Component", () => {
       expect(screen.getByText("$100.00")).toBeTruthy();
     });
   });
+
+  it("shows live insight updates", async () => {
+    let push: (update: api.InsightsUpdate) => void = () => {};
+    vi.mocked(api.subscribeInsights).mockImplementation((onUpdate) => {
+      push = onUpdate;
+      return () => {};
+    });
+
+    render(<InsightsDisplay insights={[]} />);
+    push({
+      type: "delta",
+      version: 2,
+      insights: [{ id: "insight-1", name: "total_nominal_value", value: 150 }],
+      changes: { total_nominal_value: 150 },
+    });
+
+    await waitFor(() => {
+      expect(screen.getByText("$150.00")).toBeTruthy();
+    });
+  });
 });
@@ -1,12 +1,17 @@
 "use client";
 
 import React, { useEffect, useState, useCallback, useMemo } from "react";
-import { Insight, getInsights } from "@/api";
+import { Insight, getInsights, subscribeInsights } from "@/api";
 import styles from "./insights-display.module.css";
 
-export function InsightsDisplay() {
-  const [insights, setInsights] = useState<Insight[]>([]);
-  const [loading, setLoading] = useState(true);
+interface InsightsDisplayProps {
+  // Insights already loaded by the parent; fetched from the API when omitted
+  insights?: Insight[];
+}
+
+export function InsightsDisplay({ insights: initialInsights }: InsightsDisplayProps) {
+  const [insights, setInsights] = useState<Insight[]>(initialInsights ?? []);
+  const [loading, setLoading] = useState(initialInsights === undefined);
   const [error, setError] = useState<string | null>(null);
 
   const fetchInsights = useCallback(async () => {
@@ -23,7 +28,20 @@ export function InsightsDisplay() {
   }, []);
 
   useEffect(() => {
-    fetchInsights();
+    if (initialInsights === undefined) {
+      fetchInsights();
+    } else {
+      setInsights(initialInsights);
+    }
+  }, [initialInsights]);
+
+  // Live updates replace the loaded insights whenever stored assets change
+  useEffect(() => {
+    return subscribeInsights((update) => {
+      setInsights(update.insights);
+      setLoading(false);
+      setError(null);
+    });
   }, []);
 
   const insightsByName = useMemo(() => {